@@ -0,0 +1,288 @@
+"""Benchmarks de Fast-Engine con umbrales de regresion.
+
+Uso::
+
+    python -m benchmarks.run --sizes 10,1000,50000 --output bench.json \
+        --thresholds benchmarks/thresholds.json [--baseline previous.json]
+
+Cada caso se mide ``--repeat`` veces y se reporta el minimo. El resultado es
+JSON; el proceso termina con codigo 1 si algun caso supera su limite en
+``thresholds.json`` (``max_seconds``) o es mas lento que el ``--baseline``
+por mas de ``tolerance`` (fraccion, p.ej. 0.5 = 50%).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SIZES = (10, 1000, 50000)
+DEFAULT_THRESHOLDS = Path(__file__).resolve().parent / "thresholds.json"
+TEMPLATE_NAME = "synthetic"
+FILES_PER_DIR = 100
+
+CASES = (
+    "template_load_cold",
+    "template_load_warm",
+    "template_load_bundle",
+    "render_project",
+    "cli_init",
+    "write_project",
+)
+
+
+def make_template(root: Path, size: int) -> Path:
+    """Template sintetico con ``size`` archivos: mitad ``.j2`` y mitad estaticos"""
+    template_dir = root / "templates" / TEMPLATE_NAME
+    template_dir.mkdir(parents=True)
+    (template_dir / "template.yml").write_text(
+        f"name: {TEMPLATE_NAME}\ndescription: Synthetic benchmark template\nversion: 1.0.0\n"
+    )
+    for i in range(size):
+        directory = template_dir / f"pkg{i // FILES_PER_DIR:04d}"
+        if i % FILES_PER_DIR == 0:
+            directory.mkdir()
+        if i % 2:
+            (directory / f"static{i}.txt").write_text(f"static file {i}\n" * 4)
+        else:
+            (directory / f"module{i}.py.j2").write_text(
+                '"""{{ project_name }} module ' + str(i) + '"""\n'
+                "{% for entity in entities %}\n"
+                "class {{ entity }}" + str(i) + ":\n"
+                "    app = \"{{ app_name }}\"\n"
+                "{% endfor %}\n"
+            )
+    return template_dir
+
+
+def _context(name: str) -> Dict[str, Any]:
+    from fast_engine.templates import build_context
+
+    return build_context(name, entities=["User", "Project", "Task"])
+
+
+def _measure(func: Callable[[], Any], repeat: int, setup: Optional[Callable[[], Any]] = None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _reset_memory_caches():
+    from fast_engine import registry
+    from fast_engine.rendering import clear_environment_cache
+
+    clear_environment_cache()
+    registry._registries.clear()
+
+
+def bench_size(size: int, workdir: Path, repeat: int, cases: List[str]) -> List[Dict[str, Any]]:
+    from fast_engine import cli
+    from fast_engine.bundle import pack_template
+    from fast_engine.core import FastEngine
+    from fast_engine.registry import TemplateEntry, TemplateRegistry
+    from fast_engine.rendering import compile_directory
+    from fast_engine.templates import TemplateEngine
+
+    root = workdir / f"size-{size}"
+    template_dir = make_template(root, size)
+    templates_root = template_dir.parent
+    cache = root / "cache"
+    results: List[Dict[str, Any]] = []
+
+    def record(case: str, seconds: float):
+        results.append({
+            "name": f"{case}[{size}]",
+            "case": case,
+            "size": size,
+            "seconds": seconds,
+            "files_per_second": size / seconds if seconds else None,
+        })
+
+    def load(cache_dir: Path):
+        entry = TemplateRegistry(templates_root, cache_dir / "registry").get(TEMPLATE_NAME)
+        compile_directory(entry.path, entry.files, cache_dir / "jinja")
+
+    def cold_setup():
+        _reset_memory_caches()
+        shutil.rmtree(cache, ignore_errors=True)
+
+    if "template_load_cold" in cases:
+        record("template_load_cold", _measure(lambda: load(cache), repeat, cold_setup))
+    if "template_load_warm" in cases:
+        load(cache)
+        # Proceso nuevo: sin caches en memoria pero con indice y bytecode en disco
+        record("template_load_warm", _measure(lambda: load(cache), repeat, _reset_memory_caches))
+    if "template_load_bundle" in cases:
+        bundle = pack_template(template_dir, root / f"{TEMPLATE_NAME}.feb")
+
+        def load_bundle():
+            entry = TemplateEntry.from_bundle(bundle)
+            compile_directory(bundle, entry.files, cache / "jinja")
+
+        # Mismo estado que template_load_warm: bytecode en disco, nada en memoria
+        load_bundle()
+        record("template_load_bundle", _measure(load_bundle, repeat, _reset_memory_caches))
+
+    engine = TemplateEngine(str(templates_root), cache / "jinja")
+    context = _context("bench")
+    if "render_project" in cases:
+        engine.render_project(TEMPLATE_NAME, context)
+        record("render_project", _measure(lambda: engine.render_project(TEMPLATE_NAME, context), repeat))
+
+    if "cli_init" in cases:
+        home = root / "home"
+        saved = cli.FAST_ENGINE_HOME, cli.get_templates_dir
+        cli.FAST_ENGINE_HOME = home
+        cli.get_templates_dir = lambda: templates_root
+
+        def clean_home():
+            shutil.rmtree(home / "bench", ignore_errors=True)
+
+        def init():
+            cli.init(
+                name="bench", template=TEMPLATE_NAME, incremental=False, copy_mode="auto", jobs=None,
+                output=None, archive_format=None, dry_run=False, profile=False, profile_output=None,
+            )
+
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                # La primera corrida construye indice y bytecode en el home
+                init()
+                clean_home()
+                record("cli_init", _measure(init, repeat, clean_home))
+        finally:
+            cli.FAST_ENGINE_HOME, cli.get_templates_dir = saved
+
+    if "write_project" in cases:
+        files = engine.render_project(TEMPLATE_NAME, context)
+        out = root / "write"
+        out.mkdir()
+        previous = os.getcwd()
+        os.chdir(out)
+        try:
+            fast_engine = FastEngine(str(out / "fast-engine.json"))
+
+            def clean_out():
+                shutil.rmtree(out / "bench", ignore_errors=True)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                record("write_project", _measure(
+                    lambda: fast_engine._write_project("bench", files, incremental=False), repeat, clean_out
+                ))
+        finally:
+            os.chdir(previous)
+
+    shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def bench_cli_startup(repeat: int) -> Dict[str, Any]:
+    """Arranque en frio de ``fast-engine version`` en un proceso nuevo (por el entry point, ``client``)"""
+    env = dict(os.environ, PYTHONPATH=str(ROOT) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    command = [sys.executable, "-m", "fast_engine.client", "version"]
+    seconds = _measure(
+        lambda: subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL),
+        repeat,
+    )
+    return {"name": "cli_startup", "case": "cli_startup", "size": None, "seconds": seconds, "files_per_second": None}
+
+
+def check(results: List[Dict[str, Any]], thresholds: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> List[str]:
+    """Mensajes de los casos que superan su umbral o regresaron respecto al baseline"""
+    failures = []
+    limits = thresholds.get("max_seconds", {})
+    tolerance = float(thresholds.get("tolerance", 0.5))
+    previous = {r["name"]: r["seconds"] for r in (baseline or {}).get("results", [])}
+    for result in results:
+        name, seconds = result["name"], result["seconds"]
+        limit = limits.get(name)
+        if limit is not None and seconds > limit:
+            failures.append(f"{name}: {seconds:.3f}s supera el limite de {limit:.3f}s")
+        if name in previous and seconds > previous[name] * (1 + tolerance):
+            failures.append(
+                f"{name}: {seconds:.3f}s es {seconds / previous[name] - 1:.0%} mas lento que el baseline "
+                f"({previous[name]:.3f}s, tolerancia {tolerance:.0%})"
+            )
+    return failures
+
+
+def run(sizes=DEFAULT_SIZES, repeat: int = 3, cases=CASES + ("cli_startup",), workdir: Optional[Path] = None) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="fast-engine-bench-", dir=workdir) as tmp:
+        tmp_path = Path(tmp)
+        saved_home = os.environ.get("FAST_ENGINE_HOME")
+        os.environ["FAST_ENGINE_HOME"] = str(tmp_path / "home")
+        try:
+            for size in sizes:
+                # Los casos grandes tardan segundos: una sola medicion alcanza
+                results.extend(bench_size(size, tmp_path, repeat if size < 10000 else 1, list(cases)))
+            if "cli_startup" in cases:
+                results.append(bench_cli_startup(max(repeat, 5)))
+        finally:
+            if saved_home is None:
+                os.environ.pop("FAST_ENGINE_HOME", None)
+            else:
+                os.environ["FAST_ENGINE_HOME"] = saved_home
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.time(),
+            "sizes": list(sizes),
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de Fast-Engine")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Cantidad de archivos por template")
+    parser.add_argument("--cases", default=",".join(CASES + ("cli_startup",)), help="Casos a correr")
+    parser.add_argument("--repeat", type=int, default=3, help="Mediciones por caso (se usa el minimo)")
+    parser.add_argument("--output", type=Path, help="Archivo JSON de resultados (por defecto stdout)")
+    parser.add_argument("--thresholds", type=Path, default=DEFAULT_THRESHOLDS, help="Limites por caso")
+    parser.add_argument("--baseline", type=Path, help="Resultados anteriores para detectar regresiones")
+    parser.add_argument("--workdir", type=Path, help="Directorio para los archivos temporales")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    cases = [c for c in args.cases.split(",") if c]
+    report = run(sizes, args.repeat, cases, args.workdir)
+
+    thresholds = json.loads(args.thresholds.read_text()) if args.thresholds and args.thresholds.exists() else {}
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    failures = check(report["results"], thresholds, baseline)
+    report["failures"] = failures
+
+    for result in report["results"]:
+        rate = f"  {result['files_per_second']:,.0f} archivos/s" if result["files_per_second"] else ""
+        print(f"{result['name']:<28} {result['seconds'] * 1000:10.1f} ms{rate}", file=sys.stderr)
+    for failure in failures:
+        print(f"REGRESION: {failure}", file=sys.stderr)
+
+    data = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(data + "\n")
+    else:
+        print(data)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
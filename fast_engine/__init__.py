@@ -28,28 +28,42 @@ def get_templates_path():
 TEMPLATES_PATH = get_templates_path()
 
 
-from .core import FastEngine, Engine, create_app
-from .config import Config
-from .templates import Template
-from .deploy import deploy
+# Los submodulos se importan bajo demanda: ``import fast_engine`` (y por lo tanto
+# ``fast-engine version``) no debe cargar typer, rich ni Jinja2.
+_LAZY_ATTRIBUTES = {
+    "FastEngine": (".core", "FastEngine"),
+    "Engine": (".core", "Engine"),
+    "create_app": (".app", "create_app"),
+    "Config": (".config", "Config"),
+    "Template": (".templates", "Template"),
+    "deploy": (".deploy", "deploy"),
+    "cli_app": (".cli", "app"),
+}
+
+# Dependencias opcionales: si no estan instaladas el atributo vale None
+_OPTIONAL_ATTRIBUTES = {"create_app", "cli_app"}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY_ATTRIBUTES[name]
+    try:
+        from importlib import import_module
+
+        value = getattr(import_module(module_name, __name__), attr)
+    except Exception:
+        if name not in _OPTIONAL_ATTRIBUTES:
+            raise
+        value = None  # pragma: no cover - optional dependency
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
 
 
-try:
-    from .app import create_app  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    create_app = None
-
-try:
-    from .cli import app as cli_app  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    cli_app = None  # fallback when rich/typer are not installed
-
-
-try:
-    from .cli import app as cli_app
-except Exception:  # pragma: no cover - optional dependency may be missing
-    cli_app = None
-
 def main() -> str:
     """Entry point used in tests."""
     return "fast-engine works"
@@ -64,5 +78,3 @@ __all__ = [
     "main",
     "deploy",
 ]
-
-
@@ -1,14 +1,264 @@
+"""Servicio HTTP (ASGI) de generacion con cola de trabajos.
 
-"""Minimal application entry point for Fast-Engine."""
+``create_app()`` devuelve una aplicacion ASGI sin dependencias extra (se
+puede servir con ``uvicorn --factory fast_engine.app:create_app``):
 
+- ``GET /health``: estado del servicio y de la cola (nunca espera a un trabajo)
+- ``POST /jobs``: encola una generacion ``{"name", "template", "description",
+  "use_cache", "archive"}`` y responde 202 con el id; 429 si la cola esta llena
+- ``GET /jobs/{id}``: estado del trabajo
+- ``GET /jobs/{id}/result``: resultado (409 mientras no termina)
+- ``GET /jobs/{id}/archive``: el proyecto como tar, tar.gz o zip si el
+  trabajo pidio ``"archive"`` (se arma en memoria, sin escribir a disco)
 
-def create_app():
-    """Return a placeholder application object.
+El tenant sale del header ``X-Tenant`` (o ``"default"``) y cada tenant escribe
+sus proyectos en su propio directorio, ``output_path/<tenant>/<name>``.
+Workers, tamano de cola y trabajos simultaneos por tenant se configuran en
+``Config``.
+"""
 
-    The real project would normally return a FastAPI ``FastAPI`` instance
-    here, but the test suite only requires the function to exist, so we
-    simply return a string placeholder.
+import io
+import json
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from .config import Config
+from .jobs import DONE, FAILED, Job, JobQueue, QueueFull
+from .sinks import ARCHIVE_FORMATS, CONTENT_TYPES, ArchiveSink
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .core import FastEngine
+
+# Tamano maximo del body de un request
+MAX_BODY_BYTES = 64 * 1024
+# Nombre de proyecto (y de tenant): un unico segmento de ruta
+_PROJECT_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+_JOB_PATH = re.compile(r"^/jobs/([0-9a-f]{32})(?:/(result|archive))?$")
+
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Iterable[Tuple[str, str]] = ()):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = list(headers)
+
+
+class Download:
+    """Respuesta binaria (en lugar de JSON)"""
+
+    def __init__(self, data: bytes, content_type: str):
+        self.data = data
+        self.content_type = content_type
+
+
+async def _respond(send: Send, status: int, body: Any, headers: Iterable[Tuple[str, str]] = ()):
+    if isinstance(body, Download):
+        payload, content_type = body.data, body.content_type
+    else:
+        payload, content_type = json.dumps(body).encode("utf-8"), "application/json"
+    raw_headers = [(b"content-type", content_type.encode()), (b"content-length", str(len(payload)).encode())]
+    raw_headers += [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def _read_json(receive: Receive) -> Dict[str, Any]:
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HTTPError(400, "Cliente desconectado")
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY_BYTES:
+            raise HTTPError(413, f"Body mayor a {MAX_BODY_BYTES} bytes")
+        if not message.get("more_body"):
+            break
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError as e:
+        raise HTTPError(400, f"JSON invalido: {e}")
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Se esperaba un objeto JSON")
+    return data
+
+
+def _header(scope: Dict[str, Any], name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+def parse_tenant(scope: Dict[str, Any]) -> str:
+    """Tenant del header ``X-Tenant``; es un directorio de la salida"""
+    tenant = _header(scope, b"x-tenant") or "default"
+    if not _PROJECT_NAME.match(tenant):
+        raise HTTPError(400, "'X-Tenant' debe ser un nombre de tenant valido")
+    return tenant
+
+
+def parse_job_request(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validar el body de ``POST /jobs``"""
+    name = data.get("name")
+    if not isinstance(name, str) or not _PROJECT_NAME.match(name) or name in (".", ".."):
+        raise HTTPError(400, "'name' debe ser un nombre de proyecto valido")
+    template = data.get("template", "saas-basic")
+    description = data.get("description", "")
+    if not isinstance(template, str) or not isinstance(description, str):
+        raise HTTPError(400, "'template' y 'description' deben ser texto")
+    archive = data.get("archive")
+    if archive is not None and archive not in ARCHIVE_FORMATS:
+        raise HTTPError(400, f"'archive' debe ser uno de: {', '.join(ARCHIVE_FORMATS)}")
+    return {
+        "name": name,
+        "template": template,
+        "description": description,
+        "use_cache": bool(data.get("use_cache", True)),
+        "archive": archive,
+    }
+
+
+class FastEngineApp:
+    """Aplicacion ASGI alrededor de un ``FastEngine``.
+
+    Las generaciones corren como trabajos de una ``JobQueue`` en el mismo
+    event loop: las llamadas LLM son async y la escritura va a un hilo, asi
+    que ``/health`` y los otros tenants siguen respondiendo mientras tanto.
     """
 
-    return "fast_engine_app"
+    def __init__(self, engine: Optional["FastEngine"] = None, config: Optional[Config] = None):
+        self._engine = engine
+        self.config = config or (engine.config if engine is not None else Config.load())
+        self.output_dir = Path(self.config.output_path)
+        self.queue = JobQueue(
+            self._run_job,
+            workers=self.config.api_workers,
+            max_queued=self.config.api_queue_size,
+            tenant_concurrency=self.config.api_tenant_concurrency,
+            retention=self.config.api_job_ttl,
+        )
+
+    @property
+    def engine(self) -> "FastEngine":
+        if self._engine is None:
+            from .core import FastEngine
+
+            self._engine = FastEngine()
+        self._engine.persistent = True
+        return self._engine
+
+    async def startup(self):
+        self.queue.start()
+
+    async def shutdown(self):
+        await self.queue.stop()
+        if self._engine is not None:
+            await self._engine.close()
+
+    def _project_dir(self, tenant: str, name: str) -> Path:
+        return self.output_dir / tenant / name
+
+    async def _run_job(self, job: Job) -> Dict[str, Any]:
+        request = job.request
+        output_dir = self.output_dir / job.tenant
+        args = (request["name"], request["template"], request["description"], request["use_cache"], output_dir)
+        if not request.get("archive"):
+            message = await self.engine.generate(*args)
+            return {"project_dir": str(self._project_dir(job.tenant, request["name"]).resolve()), "message": message}
+
+        buffer = io.BytesIO()
+        message = await self.engine.generate(*args, sink=ArchiveSink(buffer, request["archive"], request["name"]))
+        job.artifact = buffer.getvalue()
+        return {
+            "archive": f"/jobs/{job.id}/archive",
+            "format": request["archive"],
+            "size": len(job.artifact),
+            "message": message,
+        }
+
+    async def __call__(self, scope: Dict[str, Any], receive: Receive, send: Send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        # Sin lifespan (algunos servidores/tests) los workers arrancan con el primer request
+        self.queue.start()
+        try:
+            status, body, headers = await self._route(scope, receive)
+        except HTTPError as e:
+            status, body, headers = e.status, {"error": e.message}, e.headers
+        await _respond(send, status, body, headers)
+
+    async def _lifespan(self, receive: Receive, send: Send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _route(self, scope: Dict[str, Any], receive: Receive) -> Tuple[int, Any, list]:
+        method, path = scope["method"], scope["path"].rstrip("/") or "/"
+        if path == "/health":
+            if method != "GET":
+                raise HTTPError(405, "Metodo no permitido")
+            return 200, {
+                "status": "ok",
+                "queued": self.queue.queued,
+                "running": self.queue.running,
+                "workers": self.queue.workers,
+            }, []
+
+        if path == "/jobs":
+            if method != "POST":
+                raise HTTPError(405, "Metodo no permitido")
+            tenant = parse_tenant(scope)
+            request = parse_job_request(await _read_json(receive))
+            # Solo chocan los trabajos que escriben en el mismo directorio
+            project_dir = self._project_dir(tenant, request["name"])
+            for job in self.queue.jobs.values():
+                if job.pending and self._project_dir(job.tenant, job.request["name"]) == project_dir:
+                    raise HTTPError(409, f"Ya hay un trabajo en curso para '{request['name']}': {job.id}")
+            try:
+                job = await self.queue.submit(tenant, request)
+            except QueueFull as e:
+                raise HTTPError(429, str(e), [("Retry-After", "5")])
+            return 202, {"id": job.id, "status": job.status}, [("Location", f"/jobs/{job.id}")]
+
+        match = _JOB_PATH.match(path)
+        if match is None:
+            raise HTTPError(404, "No encontrado")
+        if method != "GET":
+            raise HTTPError(405, "Metodo no permitido")
+        job = self.queue.get(match.group(1))
+        if job is None:
+            raise HTTPError(404, "Trabajo no encontrado")
+        if not match.group(2):
+            return 200, job.to_dict(), []
+        if match.group(2) == "archive" and job.status == DONE:
+            if job.artifact is None:
+                raise HTTPError(404, "El trabajo no pidio 'archive'")
+            fmt = job.request["archive"]
+            suffix = "tgz" if fmt == "tar.gz" else fmt
+            return 200, Download(job.artifact, CONTENT_TYPES[fmt]), [
+                ("Content-Disposition", f'attachment; filename="{job.request["name"]}.{suffix}"')
+            ]
+        if job.status == DONE:
+            return 200, {"id": job.id, "status": job.status, "result": job.result}, []
+        if job.status == FAILED:
+            return 500, {"id": job.id, "status": job.status, "error": job.error}, []
+        return 409, {"id": job.id, "status": job.status}, []
+
 
+def create_app(engine: Optional["FastEngine"] = None, config: Optional[Config] = None) -> FastEngineApp:
+    """Aplicacion ASGI del servicio de generacion"""
+    return FastEngineApp(engine, config)
@@ -0,0 +1,171 @@
+"""Copia de archivos estaticos del template sin decodificarlos.
+
+Se intenta, en orden, clonar el archivo (reflink, copy-on-write), copiar en el
+kernel con ``copy_file_range``/``sendfile`` y por ultimo copiar por bloques en
+Python. Con ``mode="hardlink"`` el destino comparte el inodo con el template.
+"""
+
+import errno
+import hashlib
+import os
+import shutil
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Set, Tuple, Union
+
+COPY_MODES = ("auto", "reflink", "hardlink", "copy")
+
+# ioctl FICLONE de Linux (btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+
+_CHUNK_SIZE = 1 << 20
+
+# Errores que indican que el filesystem no soporta el metodo
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EPERM,
+    errno.EBADF,
+    getattr(errno, "EOPNOTSUPP", errno.EINVAL),
+    getattr(errno, "ENOTSUP", errno.EINVAL),
+    getattr(errno, "ENOTTY", errno.EINVAL),
+}
+
+# (metodo, dispositivo origen, dispositivo destino) que ya fallaron
+_unsupported: Set[Tuple[str, int, int]] = set()
+
+
+@dataclass(frozen=True)
+class StaticFile:
+    """Archivo del template que se copia tal cual.
+
+    ``digest`` es el sha256 del archivo si ya se conoce (p.ej. del registro de
+    templates); evita volver a leerlo en modo incremental.
+    """
+
+    path: Path
+    digest: Optional[str] = None
+
+    def hash(self) -> str:
+        if self.digest is not None:
+            return self.digest
+        return file_hash(self.path)
+
+
+@dataclass(frozen=True, eq=False)
+class StaticBlob:
+    """Archivo estatico de un bundle: se escribe directo desde su buffer (mmap)"""
+
+    data: memoryview
+    digest: Optional[str] = None
+
+    def hash(self) -> str:
+        if self.digest is not None:
+            return self.digest
+        return hashlib.sha256(self.data).hexdigest()
+
+
+def file_hash(path: Union[str, Path]) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reflink(src: Path, dest: Path):
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.ENOTSUP, "reflink no soportado en esta plataforma")
+    import fcntl
+
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+
+
+def _kernel_copy(src: Path, dest: Path):
+    """Copia dentro del kernel: copy_file_range y si no, sendfile"""
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        copy_file_range = getattr(os, "copy_file_range", None)
+        if copy_file_range is not None:
+            copied_total = 0
+            try:
+                while remaining > 0:
+                    copied = copy_file_range(fsrc.fileno(), fdst.fileno(), min(remaining, 1 << 30))
+                    if copied == 0:
+                        break
+                    copied_total += copied
+                    remaining -= copied
+                return
+            except OSError as e:
+                # Solo se pasa a sendfile si no se llego a copiar nada
+                if e.errno not in _UNSUPPORTED_ERRNOS or copied_total:
+                    raise
+        if not hasattr(os, "sendfile"):
+            raise OSError(errno.ENOSYS, "sendfile no disponible")
+        offset = 0
+        while remaining > 0:
+            sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, min(remaining, 1 << 30))
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+
+
+def _hardlink(src: Path, dest: Path):
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.link")
+    os.link(src, tmp)
+    os.replace(tmp, dest)
+
+
+def _python_copy(src: Path, dest: Path):
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        shutil.copyfileobj(fsrc, fdst, _CHUNK_SIZE)
+
+
+_METHODS = {
+    "reflink": _reflink,
+    "kernel": _kernel_copy,
+    "hardlink": _hardlink,
+    "copy": _python_copy,
+}
+
+_CHAINS = {
+    "auto": ("reflink", "kernel", "copy"),
+    "reflink": ("reflink",),
+    "hardlink": ("hardlink",),
+    "copy": ("copy",),
+}
+
+
+def clone_file(src: Union[str, Path], dest: Union[str, Path], mode: str = "auto", fallback: bool = True) -> str:
+    """Copiar ``src`` en ``dest`` con el metodo mas rapido disponible.
+
+    Devuelve el metodo usado. Si ``mode`` no esta soportado por el filesystem
+    y ``fallback`` es True se copia con el camino generico (``auto``); si es
+    False se propaga el error.
+    """
+    if mode not in _CHAINS:
+        raise ValueError(f"Modo de copia invalido: {mode} (opciones: {', '.join(COPY_MODES)})")
+    src, dest = Path(src), Path(dest)
+    chain = _CHAINS[mode]
+    if fallback and mode != "auto":
+        chain = chain + tuple(m for m in _CHAINS["auto"] if m not in chain)
+
+    devices = (os.stat(src).st_dev, os.stat(dest.parent).st_dev)
+    last_error: Optional[OSError] = None
+    for method in chain:
+        key = (method, devices[0], devices[1])
+        if method != "copy" and key in _unsupported:
+            continue
+        try:
+            _METHODS[method](src, dest)
+            return method
+        except OSError as e:
+            if method == "copy" or e.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            _unsupported.add(key)
+            last_error = e
+    raise last_error or OSError(errno.ENOTSUP, f"No se pudo copiar {src}")
@@ -0,0 +1,210 @@
+"""Generacion de muchos proyectos en un solo proceso a partir de un manifiesto"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .generator import generate_project
+from .plan import OUTSIDE_ROOT, outside_root
+from .registry import get_registry
+from .rendering import get_environment
+from .templates import build_context
+
+
+@dataclass
+class ProjectSpec:
+    """Un proyecto del manifiesto de batch"""
+
+    name: str
+    template: str
+    context: Dict[str, Any] = field(default_factory=dict)
+
+    def build_context(self) -> Dict[str, Any]:
+        context = build_context(self.name)
+        context.update(self.context)
+        return context
+
+
+@dataclass
+class ProjectResult:
+    """Resultado y tiempos de generar un proyecto del batch"""
+
+    name: str
+    template: str
+    ok: bool
+    elapsed: float = 0.0
+    render_time: float = 0.0
+    write_time: float = 0.0
+    written: int = 0
+    unchanged: int = 0
+    project_dir: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchSummary:
+    """Resumen de un batch completo"""
+
+    results: List[ProjectResult]
+    elapsed: float
+    jobs: int
+
+    @property
+    def failed(self) -> List[ProjectResult]:
+        return [r for r in self.results if not r.ok]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "elapsed": self.elapsed,
+            "jobs": self.jobs,
+            "projects": [r.__dict__ for r in self.results],
+        }
+
+
+def load_manifest(path: Union[str, Path]) -> List[ProjectSpec]:
+    """Leer un manifiesto YAML o JSON.
+
+    Formato::
+
+        defaults:            # opcional
+          template: saas-basic
+          context: {owner: platform}
+        projects:
+          - name: billing
+            context: {port: 8001}
+          - name: auth
+            template: other
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".json":
+        data = json.loads(text)
+    else:
+        import yaml  # type: ignore
+
+        data = yaml.safe_load(text)
+
+    if isinstance(data, list):
+        data = {"projects": data}
+    if not isinstance(data, dict) or not isinstance(data.get("projects"), list):
+        raise ValueError("El manifiesto debe contener una lista 'projects'")
+
+    defaults = data.get("defaults") or {}
+    specs: List[ProjectSpec] = []
+    for idx, item in enumerate(data["projects"], 1):
+        if not isinstance(item, dict) or not item.get("name"):
+            raise ValueError(f"Proyecto #{idx} sin 'name'")
+        # El nombre es el directorio del proyecto bajo la raiz del batch
+        if outside_root(str(item["name"])):
+            raise ValueError(f"Proyecto '{item['name']}': {OUTSIDE_ROOT}")
+        template = item.get("template", defaults.get("template"))
+        if not template:
+            raise ValueError(f"Proyecto '{item['name']}' sin 'template'")
+        context = dict(defaults.get("context") or {})
+        context.update(item.get("context") or {})
+        specs.append(ProjectSpec(name=str(item["name"]), template=str(template), context=context))
+
+    names = [spec.name for spec in specs]
+    duplicated = sorted({n for n in names if names.count(n) > 1})
+    if duplicated:
+        raise ValueError(f"Proyectos duplicados: {', '.join(duplicated)}")
+    return specs
+
+
+# Estado por proceso worker: registro y entornos compilados se cargan una vez
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(templates_dir: str, output_root: str, cache_dir: str, templates: Sequence[str], incremental: bool):
+    _worker.update(
+        templates_dir=templates_dir,
+        output_root=output_root,
+        cache_dir=cache_dir,
+        incremental=incremental,
+    )
+    registry = get_registry(templates_dir, Path(cache_dir) / "registry")
+    for name in templates:
+        entry = registry.get(name)
+        if entry is None:
+            continue
+        env = get_environment(entry.path, Path(cache_dir) / "jinja")
+        for rel in entry.files:
+            if rel.endswith(".j2"):
+                env.get_template(rel)
+
+
+def _generate(spec: ProjectSpec) -> ProjectResult:
+    start = time.perf_counter()
+    if outside_root(spec.name):
+        return ProjectResult(spec.name, spec.template, ok=False, error=OUTSIDE_ROOT)
+    cache_dir = Path(_worker["cache_dir"])
+    entry = get_registry(_worker["templates_dir"], cache_dir / "registry").get(spec.template)
+    if entry is None:
+        return ProjectResult(spec.name, spec.template, ok=False, error=f"Template '{spec.template}' no encontrado")
+    try:
+        result = generate_project(
+            entry.path,
+            Path(_worker["output_root"]) / spec.name,
+            spec.build_context(),
+            files=entry.files,
+            bytecode_dir=cache_dir / "jinja",
+            incremental=_worker["incremental"],
+        )
+    except Exception as e:
+        return ProjectResult(spec.name, spec.template, ok=False, elapsed=time.perf_counter() - start, error=str(e))
+
+    report = result.report
+    return ProjectResult(
+        name=spec.name,
+        template=spec.template,
+        ok=report.ok,
+        elapsed=time.perf_counter() - start,
+        render_time=result.render_time,
+        write_time=result.write_time,
+        written=len(report.written),
+        unchanged=len(report.unchanged),
+        project_dir=str(result.project_dir),
+        error="; ".join(f"{p}: {e}" for p, e in report.failed.items()) or None,
+    )
+
+
+def run_batch(
+    specs: Sequence[ProjectSpec],
+    templates_dir: Union[str, Path],
+    output_root: Union[str, Path],
+    cache_dir: Union[str, Path],
+    jobs: Optional[int] = None,
+    incremental: bool = True,
+) -> BatchSummary:
+    """Generar todos los proyectos, repartidos en un pool de procesos.
+
+    Cada worker carga el registro y compila los templates usados una sola vez
+    y los reutiliza para todos los proyectos que le tocan. Con ``jobs=1`` todo
+    corre en el proceso actual.
+    """
+    start = time.perf_counter()
+    # Construir/revalidar el indice una vez antes de repartir el trabajo
+    get_registry(templates_dir, Path(cache_dir) / "registry").entries()
+    jobs = jobs or os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(specs) or 1))
+    initargs = (
+        str(templates_dir),
+        str(output_root),
+        str(cache_dir),
+        sorted({spec.template for spec in specs}),
+        incremental,
+    )
+
+    if jobs == 1:
+        _init_worker(*initargs)
+        results = [_generate(spec) for spec in specs]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as pool:
+            chunksize = max(1, len(specs) // (jobs * 4))
+            results = list(pool.map(_generate, specs, chunksize=chunksize))
+
+    return BatchSummary(results=results, elapsed=time.perf_counter() - start, jobs=jobs)
@@ -0,0 +1,155 @@
+"""Bundles de templates: un solo archivo con indice y contenido, leido via mmap.
+
+Formato (``.feb``)::
+
+    MAGIC (8 bytes) | largo del header (uint64 LE) | header JSON | datos
+
+El header guarda el nombre, la metadata de ``template.yml`` y, por archivo,
+``[offset, tamano, sha256]`` con el offset relativo al inicio de los datos.
+Cargar un bundle es un ``open`` y un ``mmap``: los sources de Jinja y los
+archivos estaticos se leen de slices del buffer, sin stat/open por archivo.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+BUNDLE_SUFFIX = ".feb"
+BUNDLE_FORMAT = 1
+MAGIC = b"FEBUNDLE"
+_PREFIX = struct.Struct("<8sQ")
+
+# Bundles abiertos que se mantienen mapeados en memoria
+BUNDLE_CACHE_SIZE = 32
+
+
+class BundleError(ValueError):
+    """Archivo que no es un bundle valido"""
+
+
+def is_bundle(path: Union[str, Path]) -> bool:
+    return Path(path).suffix == BUNDLE_SUFFIX
+
+
+class TemplateBundle:
+    """Bundle mapeado en memoria.
+
+    ``read`` devuelve un ``memoryview`` sobre el mmap (sin copiar); el mapeo
+    vive mientras haya vistas o referencias al bundle.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise BundleError(f"Bundle vacio: {self.path}")
+        self._view = memoryview(self._mmap)
+        header, self._data_start = _parse_header(self._view, self.path)
+        self.name: str = header["name"]
+        self.metadata: Dict[str, Any] = header.get("metadata") or {}
+        self._index: Dict[str, Tuple[int, int, str]] = {
+            rel: (int(offset), int(size), digest) for rel, (offset, size, digest) in header["files"].items()
+        }
+        self.files: Dict[str, str] = {rel: digest for rel, (_, _, digest) in self._index.items()}
+
+    def __contains__(self, rel_path: str) -> bool:
+        return rel_path in self._index
+
+    def read(self, rel_path: str) -> memoryview:
+        offset, size, _ = self._index[rel_path]
+        start = self._data_start + offset
+        return self._view[start:start + size]
+
+    def text(self, rel_path: str) -> str:
+        return str(self.read(rel_path), "utf-8")
+
+    def close(self):
+        """Liberar el mapeo (falla si quedan vistas de ``read`` en uso)"""
+        self._view.release()
+        self._mmap.close()
+
+
+def _parse_header(view: memoryview, path: Path) -> Tuple[Dict[str, Any], int]:
+    if len(view) < _PREFIX.size:
+        raise BundleError(f"Bundle truncado: {path}")
+    magic, length = _PREFIX.unpack_from(view)
+    if magic != MAGIC:
+        raise BundleError(f"No es un bundle de Fast-Engine: {path}")
+    end = _PREFIX.size + length
+    if end > len(view):
+        raise BundleError(f"Bundle truncado: {path}")
+    try:
+        header = json.loads(str(view[_PREFIX.size:end], "utf-8"))
+    except ValueError as e:
+        raise BundleError(f"Header invalido en {path}: {e}")
+    if header.get("format") != BUNDLE_FORMAT:
+        raise BundleError(f"Formato de bundle no soportado en {path}: {header.get('format')}")
+    return header, end
+
+
+@lru_cache(maxsize=BUNDLE_CACHE_SIZE)
+def _open_cached(path: str, mtime_ns: int, size: int) -> TemplateBundle:
+    return TemplateBundle(path)
+
+
+def open_bundle(path: Union[str, Path]) -> TemplateBundle:
+    """Bundle compartido dentro del proceso; se reabre si el archivo cambio"""
+    path = Path(path).resolve()
+    stat = path.stat()
+    return _open_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def clear_bundle_cache():
+    _open_cached.cache_clear()
+
+
+def pack_template(template_dir: Union[str, Path], output: Union[str, Path], name: Optional[str] = None) -> Path:
+    """Empaquetar el directorio de un template en ``output``.
+
+    Incluye todos los archivos del template (tambien ``template.yml``, cuyo
+    hash entra en el fingerprint de compilacion). El bundle se escribe a un
+    temporal y se renombra, asi que los procesos que lo tengan mapeado siguen
+    leyendo la version anterior.
+    """
+    from .registry import TemplateEntry
+
+    template_dir = Path(template_dir)
+    output = Path(output)
+    entry = TemplateEntry.scan(template_dir)
+    files: Dict[str, list] = {}
+    offset = 0
+    for rel, digest in entry.files.items():
+        size = (template_dir / rel).stat().st_size
+        files[rel] = [offset, size, digest]
+        offset += size
+    header = json.dumps(
+        {"format": BUNDLE_FORMAT, "name": name or entry.name, "metadata": entry.metadata, "files": files},
+        default=str,
+    ).encode("utf-8")
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as out:
+            out.write(_PREFIX.pack(MAGIC, len(header)))
+            out.write(header)
+            for rel, (_, size, _) in files.items():
+                with open(template_dir / rel, "rb") as src:
+                    shutil.copyfileobj(src, out, 1 << 20)
+                if out.tell() != _PREFIX.size + len(header) + files[rel][0] + size:
+                    raise BundleError(f"{rel} cambio mientras se empaquetaba")
+        os.replace(tmp_path, output)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return output
@@ -1,42 +1,174 @@
+import contextlib
+import logging
 import os
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, Optional
 
 import typer
-try:
-    from jinja2 import Environment, FileSystemLoader
-except Exception:  # pragma: no cover - optional dependency
-    Environment = None  # type: ignore
-    FileSystemLoader = None  # type: ignore
-from rich import print as rprint
-from rich.console import Console
-from rich.table import Table
 
+# Solo lo imprescindible se importa al arrancar: rich, Jinja2 y el motor se
+# cargan dentro de los comandos que los usan para que ``version`` y
+# ``list-templates`` arranquen rapido (shell completion, pre-commit hooks).
+from .bundle import BUNDLE_SUFFIX
+from .registry import METADATA_FILE, TemplateEntry, TemplateRegistry, get_registry
 
-from .core import FastEngine
+if TYPE_CHECKING:  # pragma: no cover
+    from .plan import WritePlan
+    from .sinks import ArchiveSink
+    from .writer import WriteReport
+
+# Lo mismo que ``utils.configure_logging``, sin importar ``utils`` (y asyncio) al arrancar
+logging.basicConfig(level=logging.INFO)
 
 FAST_ENGINE_HOME = Path(os.environ.get("FAST_ENGINE_HOME", Path.home() / ".fast-engine"))
 
 def get_templates_dir() -> Path:
     """Return directory containing built-in templates."""
-    return Path(__file__).resolve().parent.parent / "templates"
+    return Path(__file__).resolve().parent / "templates"
 
 def ensure_home() -> Path:
     """Ensure FAST_ENGINE_HOME exists and return it."""
     FAST_ENGINE_HOME.mkdir(parents=True, exist_ok=True)
     return FAST_ENGINE_HOME
 
+def get_template_registry() -> TemplateRegistry:
+    """Cached index of the templates available to the CLI."""
+    return get_registry(get_templates_dir(), FAST_ENGINE_HOME / "cache" / "registry")
+
+def get_bytecode_cache_dir() -> Path:
+    """Directory where compiled Jinja2 bytecode is persisted between runs."""
+    return FAST_ENGINE_HOME / "cache" / "jinja"
+
+def rprint(*args, **kwargs):
+    """Print with rich markup; rich is imported on first use."""
+    from rich import print as rich_print
+    rich_print(*args, **kwargs)
+
+_console = None
+
+def get_console():
+    """Shared rich console, created on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+def print_change_summary(report: "WriteReport"):
+    """Print which files an incremental write added, changed or left behind."""
+    for label, color, paths in (
+        ("+", "green", report.added),
+        ("~", "yellow", report.changed),
+        ("-", "red", report.deleted),
+    ):
+        for path in paths:
+            rprint(f"[{color}]{label} {path}[/{color}]")
+    rprint(
+        f"[dim]{len(report.added)} nuevos, {len(report.changed)} modificados, "
+        f"{len(report.unchanged)} sin cambios, {len(report.deleted)} eliminados[/dim]"
+    )
+
+def print_plan(plan: "WritePlan"):
+    """Print what a write would do: directories to create, files and problems."""
+    rprint(f"[cyan]Plan para {plan.root}[/cyan]")
+    for directory in plan.missing:
+        rprint(f"[green]+ {directory}{os.sep}[/green]")
+    existing = set(plan.existing)
+    for path in plan.files:
+        if path in plan.issues:
+            continue
+        if path in existing:
+            rprint(f"[yellow]~ {path}[/yellow]")
+        else:
+            rprint(f"[green]+ {path}[/green]")
+    for path, problem in plan.issues.items():
+        rprint(f"[red]! {path}: {problem}[/red]")
+    rprint(
+        f"[dim]{len(plan.missing)} directorios a crear, {len(plan.new_files)} archivos nuevos, "
+        f"{len(existing)} existentes, {len(plan.issues)} problemas[/dim]"
+    )
+
+@contextlib.contextmanager
+def output_archive(output: str, archive_format: Optional[str], name: str) -> Iterator["ArchiveSink"]:
+    """Sink de ``--output``; con ``-`` el archivo va a stdout y los mensajes a stderr."""
+    from .sinks import open_archive
+
+    with open_archive(output, archive_format, prefix=name) as sink:
+        if output != "-":
+            yield sink
+            return
+        with contextlib.redirect_stdout(sys.stderr):
+            yield sink
+
 app = typer.Typer(help="Fast-Engine: Generador rapido de proyectos full-stack")
-console = Console()
 
 @app.command()
 def init(
     name: str = typer.Argument(..., help="Nombre del proyecto"),
-    template: Optional[str] = typer.Option(None, "--template", "-t", help="Template a usar"),
+    template: Optional[str] = typer.Option(None, "--template", "-t", help="Template (nombre o bundle .feb) a usar"),
+    incremental: bool = typer.Option(
+        True, "--incremental/--force", help="Solo reescribir archivos cuyo contenido cambio"
+    ),
+    copy_mode: str = typer.Option(
+        "auto", "--copy-mode", help="Copia de archivos estaticos: auto, reflink, hardlink o copy"
+    ),
+    jobs: Optional[int] = typer.Option(
+        None, "--jobs", "-j", help="Procesos para renderizar templates (auto por defecto, 1 sin paralelismo)"
+    ),
+    output: Optional[str] = typer.Option(
+        None, "--output", "-o", help="Archivo .tar, .tar.gz o .zip (o '-' para stdout) en lugar de un directorio"
+    ),
+    archive_format: Optional[str] = typer.Option(
+        None, "--format", help="Formato del archivo: tar, tar.gz o zip (por defecto segun la extension)"
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Mostrar los directorios y archivos que se escribirian, sin escribir nada"
+    ),
+    profile: bool = typer.Option(False, "--profile", help="Mostrar el tiempo por fase al terminar"),
+    profile_output: Optional[Path] = typer.Option(
+        None, "--profile-output", help="Guardar el perfil: .json (Chrome trace) o cProfile (otra extension)"
+    ),
 ):
     """Crear un nuevo proyecto a partir de un template"""
-    templates_dir = get_templates_dir()
-    available = [p.name for p in templates_dir.iterdir() if p.is_dir()]
+    from .tracing import profile_session
+
+    if dry_run and output is not None:
+        rprint("[red]ERROR: --dry-run solo aplica a la salida en directorio (sin --output)[/red]")
+        raise typer.Exit(1)
+    with contextlib.ExitStack() as stack:
+        sink = None
+        if output is not None:
+            try:
+                sink = stack.enter_context(output_archive(output, archive_format, name))
+            except ValueError as e:
+                rprint(f"[red]ERROR: {e}[/red]")
+                raise typer.Exit(1)
+        with profile_session(profile or profile_output is not None, profile_output, echo=print):
+            _init_project(name, template, incremental, copy_mode, sink, jobs, dry_run)
+
+def _init_project(
+    name: str,
+    template: Optional[str],
+    incremental: bool,
+    copy_mode: str,
+    sink: Optional["ArchiveSink"] = None,
+    jobs: Optional[int] = None,
+    dry_run: bool = False,
+    cwd: Optional[Path] = None,
+):
+    from .tracing import span
+
+    if template and template.endswith(BUNDLE_SUFFIX) and Path(template).is_file():
+        # Bundle suelto (p.ej. generado con ``fast-engine pack``)
+        with span("template.load", template=template):
+            entry = TemplateEntry.from_bundle(Path(template).resolve())
+        _write_project(name, entry, incremental, copy_mode, sink, jobs, dry_run, cwd)
+        return
+
+    with span("template.load"):
+        registry = get_template_registry()
+    available = registry.names()
 
     if not available:
         rprint("[red]No hay templates disponibles[/red]")
@@ -56,28 +188,290 @@ def init(
         rprint(f"[red]Template '{template}' no encontrado[/red]")
         raise typer.Exit(1)
 
-    env = Environment(loader=FileSystemLoader(str(templates_dir / template)), keep_trailing_newline=True)
-    project_dir = ensure_home() / name
-    project_dir.mkdir(parents=True, exist_ok=True)
-
-    for src in (templates_dir / template).rglob('*'):
-        if src.is_file():
-            rel = src.relative_to(templates_dir / template)
-            dest = project_dir / rel
-            if dest.suffix == '.j2':
-                dest = dest.with_suffix('')
-                template_obj = env.get_template(str(rel))
-                content = template_obj.render(project_name=name)
-            else:
-                content = src.read_text()
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            dest.write_text(content)
+    with span("template.load", template=template):
+        entry = registry.get(template)
+    _write_project(name, entry, incremental, copy_mode, sink, jobs, dry_run, cwd)
+
+def _write_project(
+    name: str,
+    entry: TemplateEntry,
+    incremental: bool,
+    copy_mode: str,
+    sink: Optional["ArchiveSink"] = None,
+    jobs: Optional[int] = None,
+    dry_run: bool = False,
+    cwd: Optional[Path] = None,
+):
+    from .config import PROJECT_CONFIG_FILE, Config, ConfigError
+    from .generator import generate_project
+    from .plan import plan_write
+    from .rendering import output_sources
+    from .templates import build_context
+    from .tracing import span
+
+    # El arbol de salida se planifica entero antes de renderizar: colisiones,
+    # conflictos con lo que hay en disco y permisos fallan sin escribir nada
+    project_dir = FAST_ENGINE_HOME / name
+    with span("write.plan"):
+        sources = output_sources(entry.files)
+        plan = plan_write(None if sink is not None else project_dir, sources, sources)
+    if dry_run:
+        print_plan(plan)
+        if not plan.ok:
+            raise typer.Exit(1)
+        return
+    if not plan.ok:
+        for path, problem in plan.issues.items():
+            rprint(f"[red]ERROR: {path}: {problem}[/red]")
+        rprint("[red]No se escribio ningun archivo[/red]")
+        raise typer.Exit(1)
+
+    try:
+        # ``cwd``: el directorio del cliente cuando el comando lo atiende el daemon
+        settings = Config.load(str(Path(cwd or ".") / PROJECT_CONFIG_FILE), overrides={"jobs": jobs})
+    except ConfigError as e:
+        rprint(f"[red]ERROR: {e}[/red]")
+        raise typer.Exit(1)
+    with span("context.build"):
+        context = build_context(name)
+    if sink is not None:
+        # El proyecto va directo al archivo, sin pasar por un directorio
+        report = generate_project(
+            entry.path, name, context, files=entry.files, bytecode_dir=get_bytecode_cache_dir(), sink=sink,
+            jobs=settings.jobs,
+        ).report
+        for file_path, error in report.failed.items():
+            rprint(f"[red]Error escribiendo {file_path}: {error}[/red]")
+        if not report.ok:
+            raise typer.Exit(1)
+        rprint(f"[green]Proyecto empaquetado ({sink.format}, {len(report.written)} archivos)[/green]")
+        return
+
+    report = generate_project(
+        entry.path,
+        project_dir,
+        context,
+        files=entry.files,
+        bytecode_dir=get_bytecode_cache_dir(),
+        incremental=incremental,
+        copy_mode=copy_mode,
+        jobs=settings.jobs,
+        writer_threads=settings.writer_threads,
+        plan=plan,
+    ).report
+    for file_path, error in report.failed.items():
+        rprint(f"[red]Error escribiendo {file_path}: {error}[/red]")
+    if not report.ok:
+        raise typer.Exit(1)
+    if incremental:
+        print_change_summary(report)
 
     rprint(f"[green]Proyecto creado en {project_dir}[/green]")
 
+@app.command()
+def watch(
+    template: str = typer.Argument(..., help="Nombre del template o ruta a su directorio"),
+    project: Path = typer.Argument(..., help="Directorio del proyecto generado"),
+    polling: bool = typer.Option(False, "--poll", help="Detectar cambios por polling en lugar de inotify"),
+):
+    """Regenerar el proyecto a medida que se edita el template"""
+    from .templates import build_context
+    from .watch import LiveProject, watch as watch_template
+
+    source = Path(template)
+    if not (source / METADATA_FILE).is_file():
+        entry = get_template_registry().get(template)
+        if entry is None or entry.is_bundle:
+            rprint(f"[red]Template '{template}' no encontrado (watch necesita un directorio)[/red]")
+            raise typer.Exit(1)
+        source = Path(entry.path)
+
+    project = project.resolve()
+    live = LiveProject(source, project, build_context(project.name), get_bytecode_cache_dir())
+    report = live.build()
+    rprint(f"[green]Proyecto generado en {project} ({len(report.written)} escritos)[/green]")
+    rprint(f"[cyan]Observando {source} (Ctrl+C para salir)[/cyan]")
+
+    def on_update(report: "WriteReport", elapsed: float):
+        for file_path, error in report.failed.items():
+            rprint(f"[red]Error en {file_path}: {error}[/red]")
+        if report.written or report.deleted:
+            print_change_summary(report)
+        rprint(f"[dim]Actualizado en {elapsed * 1000:.0f} ms[/dim]")
+
+    try:
+        watch_template(live, on_update, polling=polling)
+    except KeyboardInterrupt:
+        pass
+
+@app.command()
+def pack(
+    template: str = typer.Argument(..., help="Nombre del template o ruta a su directorio"),
+    output: Optional[Path] = typer.Option(
+        None, "--output", "-o", help="Bundle destino (por defecto <template>.feb en el directorio actual)"
+    ),
+):
+    """Empaquetar un template en un bundle de un solo archivo"""
+    from .bundle import pack_template
+
+    source = Path(template)
+    if not (source / METADATA_FILE).is_file():
+        entry = get_template_registry().get(template)
+        if entry is None or entry.is_bundle:
+            rprint(f"[red]Template '{template}' no encontrado[/red]")
+            raise typer.Exit(1)
+        source = Path(entry.path)
+    dest = output or Path.cwd() / f"{source.name}{BUNDLE_SUFFIX}"
+    try:
+        pack_template(source, dest)
+    except Exception as e:
+        rprint(f"[red]ERROR empaquetando {source}: {e}[/red]")
+        raise typer.Exit(1)
+    rprint(f"[green]Bundle creado en {dest} ({dest.stat().st_size} bytes)[/green]")
+
+@app.command()
+def generate(
+    name: str = typer.Argument(..., help="Nombre del proyecto"),
+    template: str = typer.Option("saas-basic", "--template", "-t", help="Template a usar"),
+    description: str = typer.Option("", "--description", "-d", help="Descripcion de la aplicacion"),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Reutilizar respuestas LLM de generaciones anteriores"
+    ),
+    output: Optional[str] = typer.Option(
+        None, "--output", "-o", help="Archivo .tar, .tar.gz o .zip (o '-' para stdout) en lugar de un directorio"
+    ),
+    archive_format: Optional[str] = typer.Option(
+        None, "--format", help="Formato del archivo: tar, tar.gz o zip (por defecto segun la extension)"
+    ),
+    profile: bool = typer.Option(False, "--profile", help="Mostrar el tiempo por fase al terminar"),
+    profile_output: Optional[Path] = typer.Option(
+        None, "--profile-output", help="Guardar el perfil: .json (Chrome trace) o cProfile (otra extension)"
+    ),
+):
+    """Generar un proyecto con los proveedores LLM configurados"""
+    from .core import FastEngine
+    from .tracing import profile_session
+
+    with contextlib.ExitStack() as stack:
+        try:
+            sink = None
+            if output is not None:
+                sink = stack.enter_context(output_archive(output, archive_format, name))
+            with profile_session(profile or profile_output is not None, profile_output, echo=print):
+                message = FastEngine().init_project_demo(name, template, description, use_cache=use_cache, sink=sink)
+        except Exception as e:
+            rprint(f"[red]ERROR: {e}[/red]")
+            raise typer.Exit(1)
+        rprint(f"[green]{message}[/green]")
+
+@app.command()
+def serve(
+    socket_path: Optional[Path] = typer.Option(
+        None, "--socket", help="Socket Unix (por defecto FAST_ENGINE_HOME/daemon.sock)"
+    ),
+    workers: Optional[int] = typer.Option(None, "--workers", help="Hilos para atender init en paralelo"),
+    status: bool = typer.Option(False, "--status", help="Mostrar si hay un daemon escuchando"),
+    stop: bool = typer.Option(False, "--stop", help="Detener el daemon en ejecucion"),
+):
+    """Daemon que mantiene templates y clientes LLM cargados para la CLI"""
+    import asyncio
+
+    from .client import forward, socket_path as default_socket_path
+
+    path = socket_path or default_socket_path()
+    if status or stop:
+        code = forward({"command": "shutdown" if stop else "ping", "args": {}}, path)
+        if code is None:
+            rprint(f"[yellow]No hay un daemon escuchando en {path}[/yellow]")
+            raise typer.Exit(1)
+        return
+
+    from .daemon import GenerationDaemon
+
+    daemon = GenerationDaemon(path, workers=workers)
+    rprint("[cyan]Cargando templates y proveedores...[/cyan]")
+    daemon.warm_up()
+    try:
+        asyncio.run(daemon.serve(ready=lambda: rprint(f"[green]Daemon escuchando en {path}[/green]")))
+    except RuntimeError as e:
+        rprint(f"[red]ERROR: {e}[/red]")
+        raise typer.Exit(1)
+
+@app.command()
+def batch(
+    manifest: Path = typer.Argument(..., help="Manifiesto YAML/JSON con los proyectos"),
+    jobs: Optional[int] = typer.Option(None, "--jobs", "-j", help="Procesos en paralelo (auto por defecto)"),
+    output_dir: Optional[Path] = typer.Option(None, "--output-dir", "-o", help="Directorio destino"),
+    incremental: bool = typer.Option(
+        True, "--incremental/--force", help="Solo reescribir archivos cuyo contenido cambio"
+    ),
+    summary_json: Optional[Path] = typer.Option(None, "--summary-json", help="Guardar el resumen en JSON"),
+):
+    """Generar varios proyectos a partir de un manifiesto"""
+    import json
+
+    from rich.table import Table
+
+    from .batch import load_manifest, run_batch
+    from .config import Config, ConfigError
+
+    try:
+        specs = load_manifest(manifest)
+    except Exception as e:
+        rprint(f"[red]Manifiesto invalido: {e}[/red]")
+        raise typer.Exit(1)
+    try:
+        jobs = Config.load(overrides={"jobs": jobs}).jobs
+    except ConfigError as e:
+        rprint(f"[red]ERROR: {e}[/red]")
+        raise typer.Exit(1)
+
+    output_root = output_dir or ensure_home()
+    summary = run_batch(
+        specs,
+        get_templates_dir(),
+        output_root,
+        FAST_ENGINE_HOME / "cache",
+        jobs=jobs,
+        incremental=incremental,
+    )
+
+    table = Table(title=f"Batch: {len(specs)} proyectos, {summary.jobs} procesos")
+    table.add_column("Proyecto", style="cyan")
+    table.add_column("Template")
+    table.add_column("Estado")
+    table.add_column("Escritos", justify="right")
+    table.add_column("Sin cambios", justify="right")
+    table.add_column("Render", justify="right")
+    table.add_column("Escritura", justify="right")
+    table.add_column("Total", justify="right")
+    for result in summary.results:
+        table.add_row(
+            result.name,
+            result.template,
+            "[green]OK[/green]" if result.ok else f"[red]ERROR[/red] {result.error}",
+            str(result.written),
+            str(result.unchanged),
+            f"{result.render_time:.3f}s",
+            f"{result.write_time:.3f}s",
+            f"{result.elapsed:.3f}s",
+        )
+    get_console().print(table)
+    rprint(f"[dim]Tiempo total: {summary.elapsed:.2f}s[/dim]")
+
+    if summary_json:
+        summary_json.write_text(json.dumps(summary.to_dict(), indent=2), encoding="utf-8")
+    if summary.failed:
+        raise typer.Exit(1)
+
 @app.command()
 def doctor():
     """Diagnostico del sistema"""
+    from rich.table import Table
+
+    from .config import get_home
+    from .core import FastEngine
+
     try:
         engine = FastEngine()
         status = engine.doctor()
@@ -98,14 +492,20 @@ def doctor():
         templates_count = len(status["available_templates"])
         table.add_row("Templates", templates_status, f"Available: {templates_count}")
         
-        write_status = "[CHECK] OK" if status["can_write"] else "[X] NO WRITE PERMISSION"
-        table.add_row("Write Permission", write_status, status["current_directory"])
+        for label, location in (
+            ("current_directory", status["current_directory"]),
+            ("output_path", status["output_path"]),
+            ("fast_engine_home", str(get_home())),
+        ):
+            problem = status["write_access"][label]
+            write_status = "[X] NO WRITE PERMISSION" if problem else "[CHECK] OK"
+            table.add_row(f"Write: {label}", write_status, problem or location)
         
         table.add_row("Current Directory", "[INFO]", status["current_directory"])
         table.add_row("Output Path", "[INFO]", status["output_path"])
         table.add_row("Templates Path", "[INFO]", status["templates_absolute_path"])
         
-        console.print(table)
+        get_console().print(table)
         
         if status["available_templates"]:
             rprint(f"\n[cyan]Templates disponibles:[/cyan]")
@@ -127,27 +527,28 @@ def doctor():
 def version():
     """Mostrar version"""
     from . import __version__
-    rprint(f"[cyan]Fast-Engine v{__version__}[/cyan]")
-    rprint("[dim]Generador rapido de proyectos full-stack[/dim]")
+    typer.secho(f"Fast-Engine v{__version__}", fg="cyan")
+    typer.secho("Generador rapido de proyectos full-stack", dim=True)
 
 @app.command("list-templates")
 def list_templates():
     """Listar templates disponibles"""
     try:
-        templates_dir = get_templates_dir()
-        available = [p.name for p in templates_dir.iterdir() if p.is_dir()]
+        available = get_template_registry().entries()
 
         if not available:
-            rprint("[yellow]No hay templates disponibles[/yellow]")
+            typer.secho("No hay templates disponibles", fg="yellow")
             return
 
-        table = Table(title="Templates Disponibles")
-        table.add_column("Nombre", style="cyan")
+        # Salida plana (sin tablas de rich) para mantener el arranque rapido
+        rows = [("Nombre", "Version", "Descripcion")]
+        rows += [(t, entry.version, entry.description) for t, entry in available.items()]
+        widths = [max(len(row[col]) for row in rows) for col in range(2)]
 
-        for t in available:
-            table.add_row(t)
-
-        console.print(table)
+        typer.secho("Templates Disponibles", bold=True)
+        for idx, (t, version, description) in enumerate(rows):
+            line = f"{t.ljust(widths[0])}  {version.ljust(widths[1])}  {description}"
+            typer.secho(line, bold=idx == 0, fg=None if idx == 0 else "cyan")
 
     except Exception as e:
         rprint(f"[red]ERROR: {e}[/red]")
@@ -158,19 +559,24 @@ def config(
     init: bool = typer.Option(False, "--init", help="Inicializar configuracion")
 ):
     """Gestionar configuracion"""
+    from .config import Config
+
     try:
         if init:
-            engine = FastEngine()
-            engine.config.save()
+            Config.load().save()
             rprint("[green]Configuracion inicializada en fast-engine.json[/green]")
         elif show:
-            engine = FastEngine()
+            settings = Config.load()
             config_dict = {
-                "openai_api_key": engine.config.openai_api_key or "Not set",
-                "claude_api_key": engine.config.claude_api_key or "Not set",
-                "deepseek_api_key": engine.config.deepseek_api_key or "Not set",
-                "templates_path": engine.config.templates_path,
-                "output_path": engine.config.output_path
+                "openai_api_key": settings.openai_api_key or "Not set",
+                "claude_api_key": settings.claude_api_key or "Not set",
+                "deepseek_api_key": settings.deepseek_api_key or "Not set",
+                "templates_path": settings.templates_path,
+                "output_path": settings.output_path,
+                "jobs": settings.jobs or "auto",
+                "writer_threads": settings.writer_threads or "auto",
+                "provider_concurrency": settings.provider_concurrency,
+                "llm_cache_max_mb": settings.llm_cache_max_mb,
             }
             
             rprint("[cyan]Configuracion actual:[/cyan]")
@@ -0,0 +1,143 @@
+"""Cliente liviano del daemon de generacion (``fast-engine serve``).
+
+Es el entry point de la consola: si hay un daemon escuchando y el comando se
+puede reenviar (``init`` y ``generate`` con opciones conocidas) se manda por
+el socket sin importar typer, rich ni Jinja2. En cualquier otro caso (sin
+daemon, opciones no soportadas, otra version) corre la CLI normal.
+"""
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+from . import __version__
+
+SOCKET_NAME = "daemon.sock"
+# Con esta variable seteada la CLI nunca reenvia al daemon
+NO_DAEMON_ENV = "FAST_ENGINE_NO_DAEMON"
+CONNECT_TIMEOUT = 0.5
+
+# comando -> (posicionales, opciones con valor, flags, valores por defecto)
+_COMMANDS = {
+    "init": (
+        ("name",),
+        {"-t": "template", "--template": "template", "--copy-mode": "copy_mode"},
+        {"--incremental": ("incremental", True), "--force": ("incremental", False)},
+        {"template": None, "incremental": True, "copy_mode": "auto"},
+    ),
+    "generate": (
+        ("name",),
+        {"-t": "template", "--template": "template", "-d": "description", "--description": "description"},
+        {"--cache": ("use_cache", True), "--no-cache": ("use_cache", False)},
+        {"template": "saas-basic", "description": "", "use_cache": True},
+    ),
+}
+
+
+def socket_path() -> Path:
+    """Socket del daemon: ``FAST_ENGINE_SOCKET`` o ``FAST_ENGINE_HOME/daemon.sock``"""
+    explicit = os.environ.get("FAST_ENGINE_SOCKET")
+    if explicit:
+        return Path(explicit)
+    return Path(os.environ.get("FAST_ENGINE_HOME", Path.home() / ".fast-engine")) / SOCKET_NAME
+
+
+def parse_command(argv: List[str]) -> Optional[Dict[str, Any]]:
+    """Request para el daemon a partir de ``argv``, o None si no se puede reenviar.
+
+    Solo se aceptan las opciones que el daemon sabe ejecutar; ``--help``,
+    ``--profile``, opciones desconocidas o un ``init`` sin ``--template``
+    (que pregunta de forma interactiva) se corren en el proceso local.
+    """
+    if not argv or argv[0] not in _COMMANDS:
+        return None
+    positional, options, flags, defaults = _COMMANDS[argv[0]]
+    args: Dict[str, Any] = dict(defaults)
+    values: List[str] = []
+    rest = argv[1:]
+    i = 0
+    while i < len(rest):
+        token = rest[i]
+        if token.startswith("-"):
+            key, eq, value = token.partition("=")
+            if key in options:
+                if not eq:
+                    i += 1
+                    if i >= len(rest):
+                        return None
+                    value = rest[i]
+                args[options[key]] = value
+            elif key in flags and not eq:
+                name, flag_value = flags[key]
+                args[name] = flag_value
+            else:
+                return None
+        else:
+            values.append(token)
+        i += 1
+    if len(values) != len(positional) or args.get("template") is None:
+        return None
+    args.update(zip(positional, values))
+    return {"command": argv[0], "args": args}
+
+
+def forward(request: Dict[str, Any], path: Optional[Path] = None, out: Optional[TextIO] = None) -> Optional[int]:
+    """Ejecutar ``request`` en el daemon y devolver su codigo de salida.
+
+    Devuelve None si no hay daemon (o no acepta el request), en cuyo caso el
+    comando se debe correr localmente. La salida del comando se copia a
+    ``out`` a medida que llega.
+    """
+    path = path or socket_path()
+    out = out or sys.stdout
+    if not hasattr(socket, "AF_UNIX") or not path.exists():
+        return None
+    payload = dict(request, version=__version__, cwd=os.getcwd())
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    started = False
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(str(path))
+        sock.settimeout(None)
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("r", encoding="utf-8") as stream:
+            for line in stream:
+                message = json.loads(line)
+                if "output" in message:
+                    started = True
+                    out.write(message["output"])
+                    out.flush()
+                elif "exit_code" in message:
+                    return int(message["exit_code"])
+                elif message.get("retry_local"):
+                    return None
+    except (OSError, ValueError):
+        if not started:
+            return None
+    finally:
+        sock.close()
+    # El daemon corto la conexion a mitad del comando: no repetirlo localmente
+    out.write("Conexion con el daemon interrumpida\n")
+    return 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point de ``fast-engine``"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not os.environ.get(NO_DAEMON_ENV):
+        request = parse_command(argv)
+        if request is not None:
+            code = forward(request)
+            if code is not None:
+                return code
+    from .cli import app
+
+    app(argv)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,41 @@
+"""Configuracion de Fast-Engine en capas.
+
+De menor a mayor prioridad: valores por defecto, archivo de usuario
+(``FAST_ENGINE_HOME/config.json``), archivo del proyecto (``fast-engine.json``),
+variables de entorno (``FAST_ENGINE_<CAMPO>`` y las API keys de siempre) y
+``overrides`` (flags de la CLI). Los valores se validan una vez al cargar y el
+resultado se memoiza por proceso: mientras los archivos (mtime y tamano) y las
+variables de entorno no cambien, ``Config.load`` no vuelve a leer nada.
+"""
+
 import os
 import json
+import threading
 from pathlib import Path
-from typing import Optional
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+from dataclasses import asdict, dataclass, field, replace
+
+from . import TEMPLATES_PATH
+
+USER_CONFIG_FILE = "config.json"
+PROJECT_CONFIG_FILE = "fast-engine.json"
+ENV_PREFIX = "FAST_ENGINE_"
+# Variables de entorno historicas de las API keys (tienen prioridad sobre FAST_ENGINE_*)
+_ENV_ALIASES = {
+    "openai_api_key": "OPENAI_API_KEY",
+    "claude_api_key": "CLAUDE_API_KEY",
+    "deepseek_api_key": "DEEPSEEK_API_KEY",
+}
+
+
+def get_home() -> Path:
+    """Directorio base de Fast-Engine (``FAST_ENGINE_HOME``)"""
+    return Path(os.environ.get("FAST_ENGINE_HOME", Path.home() / ".fast-engine"))
+
+
+class ConfigError(ValueError):
+    """Valor de configuracion invalido (indica de que capa viene)"""
+
 
 @dataclass
 class Config:
@@ -10,47 +43,209 @@ class Config:
     openai_api_key: Optional[str] = None
     claude_api_key: Optional[str] = None
     deepseek_api_key: Optional[str] = None
-    templates_path: str = None
+    templates_path: str = TEMPLATES_PATH
     output_path: str = "."
-    
-    def __post_init__(self):
-        if self.templates_path is None:
-            from . import TEMPLATES_PATH
-            self.templates_path = TEMPLATES_PATH
-    
+    # Clientes LLM: requests simultaneas y timeout total por proveedor
+    provider_concurrency: int = 8
+    provider_timeout: float = 120.0
+    # Cache de respuestas LLM: tamano maximo (MB) y vida de cada entrada (segundos)
+    llm_cache_max_mb: int = 256
+    llm_cache_ttl: float = 7 * 24 * 3600.0
+    # Limites por proveedor, p.ej. {"openai": {"requests_per_minute": 500,
+    # "tokens_per_minute": 200000, "max_concurrency": 4}}
+    rate_limits: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Tokens maximos por proyecto generado (None = sin limite)
+    token_budget: Optional[int] = None
+    # Servicio HTTP (fast_engine.app): generaciones simultaneas, trabajos en
+    # cola antes de responder 429, trabajos simultaneos por tenant y segundos
+    # que se conserva el resultado de un trabajo terminado
+    api_workers: int = 4
+    api_queue_size: int = 100
+    api_tenant_concurrency: Optional[int] = 2
+    api_job_ttl: float = 3600.0
+    # Procesos de render de ``init`` y de ``batch`` (None = automatico) e
+    # hilos de escritura por proyecto (None = segun los CPUs)
+    jobs: Optional[int] = None
+    writer_threads: Optional[int] = None
+
     @classmethod
-    def load(cls, config_path: str = "fast-engine.json") -> "Config":
-        """Cargar configuracion desde archivo o variables de entorno"""
-        config_data = {}
-        
-        if Path(config_path).exists():
-            try:
-                with open(config_path, encoding='utf-8') as f:
-                    config_data = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                pass
-        
-        return cls(
-            openai_api_key=os.getenv("OPENAI_API_KEY", config_data.get("openai_api_key")),
-            claude_api_key=os.getenv("CLAUDE_API_KEY", config_data.get("claude_api_key")),
-            deepseek_api_key=os.getenv("DEEPSEEK_API_KEY", config_data.get("deepseek_api_key")),
-            templates_path=config_data.get("templates_path"),
-            output_path=config_data.get("output_path", ".")
-        )
-    
+    def load(
+        cls, config_path: str = PROJECT_CONFIG_FILE, overrides: Optional[Mapping[str, Any]] = None
+    ) -> "Config":
+        """Configuracion efectiva: capas combinadas y validadas.
+
+        ``overrides`` es la capa de mayor prioridad (flags de la CLI); sus
+        valores None se ignoran. Devuelve una copia: modificarla no afecta a
+        las siguientes cargas.
+        """
+        user_path = get_home() / USER_CONFIG_FILE
+        project_path = Path(os.path.abspath(config_path))
+        env = {name: os.environ[name] for name in _ENV_NAMES if name in os.environ}
+        stamp = (_stat(user_path), _stat(project_path), tuple(sorted(env.items())))
+        key = (str(user_path), str(project_path))
+
+        with _cache_lock:
+            cached = _cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            config = cached[1]
+        else:
+            values: Dict[str, Any] = {}
+            _apply(values, _read_file(user_path), str(user_path))
+            _apply(values, _read_file(project_path), str(project_path))
+            _apply(values, _env_layer(env), "entorno")
+            config = cls(**values)
+            with _cache_lock:
+                _cache[key] = (stamp, config)
+
+        if overrides:
+            values = {}
+            _apply(values, {k: v for k, v in overrides.items() if v is not None}, "flags")
+            return replace(config, **values)._copy()
+        return config._copy()
+
+    def _copy(self) -> "Config":
+        return replace(self, rate_limits={name: dict(limits) for name, limits in self.rate_limits.items()})
+
     def validate(self) -> bool:
         """Validar que las API keys estan configuradas"""
         return bool(self.openai_api_key and self.claude_api_key and self.deepseek_api_key)
 
-    def save(self, config_path: str = "fast-engine.json"):
+    def save(self, config_path: str = PROJECT_CONFIG_FILE):
         """Guardar configuracion a archivo"""
-        config_dict = {
-            "openai_api_key": self.openai_api_key,
-            "claude_api_key": self.claude_api_key, 
-            "deepseek_api_key": self.deepseek_api_key,
-            "templates_path": self.templates_path,
-            "output_path": self.output_path
-        }
-        
         with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config_dict, f, indent=2)
+            json.dump(asdict(self), f, indent=2)
+
+
+def clear_config_cache():
+    """Olvidar las configuraciones cargadas (la proxima carga relee todo)"""
+    with _cache_lock:
+        _cache.clear()
+
+
+# (usuario, proyecto) -> (stat de los archivos + entorno, Config validada)
+_cache: Dict[Tuple[str, str], Tuple[Any, Config]] = {}
+_cache_lock = threading.Lock()
+
+
+def _stat(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_file(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        raise ConfigError(f"{path}: no se pudo leer la configuracion ({e})")
+    if not isinstance(data, dict):
+        raise ConfigError(f"{path}: se esperaba un objeto JSON")
+    return data
+
+
+def _env_layer(env: Mapping[str, str]) -> Dict[str, Any]:
+    values: Dict[str, Any] = {}
+    for name in _VALIDATORS:
+        variable = ENV_PREFIX + name.upper()
+        if variable in env:
+            values[name] = env[variable]
+    for name, variable in _ENV_ALIASES.items():
+        if variable in env:
+            values[name] = env[variable]
+    return values
+
+
+def _apply(values: Dict[str, Any], layer: Mapping[str, Any], source: str):
+    """Validar ``layer`` y pisar con ella lo acumulado en ``values``"""
+    for name, raw in layer.items():
+        validator = _VALIDATORS.get(name)
+        if validator is None:
+            # Claves desconocidas (o de versiones futuras) se ignoran
+            continue
+        if raw is None and not getattr(validator, "optional", False):
+            # ``null`` en un archivo equivale a no definir el campo
+            continue
+        try:
+            values[name] = validator(raw)
+        except (TypeError, ValueError) as e:
+            raise ConfigError(f"{source}: '{name}' invalido ({raw!r}): {e}")
+
+
+def _optional(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def validator(value: Any) -> Any:
+        if value is None or (isinstance(value, str) and value.strip().lower() in ("", "none", "null")):
+            return None
+        return convert(value)
+    validator.optional = True  # type: ignore[attr-defined]
+    return validator
+
+
+def _positive(kind: type) -> Callable[[Any], Any]:
+    def validator(value: Any) -> Any:
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise TypeError(f"se esperaba un numero, no {type(value).__name__}")
+        if kind is int and isinstance(value, float) and not value.is_integer():
+            raise ValueError("debe ser un entero")
+        number = kind(value)
+        if number <= 0:
+            raise ValueError("debe ser mayor a 0")
+        return number
+    return validator
+
+
+def _text(value: Any) -> str:
+    if not isinstance(value, str):
+        raise TypeError(f"se esperaba texto, no {type(value).__name__}")
+    return value
+
+
+_RATE_LIMITS: Dict[str, Callable[[Any], Any]] = {
+    "requests_per_minute": _optional(_positive(float)),
+    "tokens_per_minute": _optional(_positive(float)),
+    "max_concurrency": _optional(_positive(int)),
+}
+
+
+def _rate_limits(value: Any) -> Dict[str, Dict[str, Any]]:
+    if isinstance(value, str):
+        value = json.loads(value)
+    if not isinstance(value, dict) or not all(isinstance(v, dict) for v in value.values()):
+        raise TypeError("se esperaba un objeto {proveedor: {limite: valor}}")
+    result = {}
+    for name, limits in value.items():
+        result[str(name)] = {}
+        for key, raw in limits.items():
+            if key not in _RATE_LIMITS:
+                raise ValueError(f"{name}.{key}: limite desconocido (validos: {', '.join(_RATE_LIMITS)})")
+            try:
+                result[str(name)][key] = _RATE_LIMITS[key](raw)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{name}.{key}: {e}") from None
+    return result
+
+
+_VALIDATORS: Dict[str, Callable[[Any], Any]] = {
+    "openai_api_key": _optional(_text),
+    "claude_api_key": _optional(_text),
+    "deepseek_api_key": _optional(_text),
+    "templates_path": _text,
+    "output_path": _text,
+    "provider_concurrency": _positive(int),
+    "provider_timeout": _positive(float),
+    "llm_cache_max_mb": _positive(int),
+    "llm_cache_ttl": _positive(float),
+    "rate_limits": _rate_limits,
+    "token_budget": _optional(_positive(int)),
+    "api_workers": _positive(int),
+    "api_queue_size": _positive(int),
+    "api_tenant_concurrency": _optional(_positive(int)),
+    "api_job_ttl": _positive(float),
+    "jobs": _optional(_positive(int)),
+    "writer_threads": _optional(_positive(int)),
+}
+_ENV_NAMES = frozenset([ENV_PREFIX + name.upper() for name in _VALIDATORS] + list(_ENV_ALIASES.values()))
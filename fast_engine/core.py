@@ -1,11 +1,20 @@
+import asyncio
+import contextvars
 import json
-import time
-import os
 from pathlib import Path
-from typing import Dict, Any, Optional
-from .config import Config
-from .templates import TemplateEngine
-from .utils import ensure_directory, logger
+from typing import Dict, Any, List, Optional, Tuple, Union
+from .config import Config, get_home
+from .plan import check_writable
+from .orchestrator import OrchestrationResult, Stage, StageOrchestrator
+from .llm_cache import CachedProvider, ResponseCache
+from .providers import DEMO_ARCHITECTURE, ProviderPool
+from .scheduler import RequestScheduler, ScheduledProvider, TokenBudget
+from .sinks import OutputSink
+from .streaming import FILE_FORMAT_INSTRUCTIONS, FileChannel, stream_files, write_channel
+from .tracing import span
+from .templates import TemplateEngine, build_context
+from .utils import logger
+from .writer import FileItems, ProjectWriter, WriteReport, print_progress
 
 # Import the real application factory and keep an internal alias so we can
 # re-export it at module level without triggering a NameError during import
@@ -13,105 +22,307 @@ from .app import create_app as _create_app
 
 class FastEngine:
     """Orquestador principal de Fast-Engine"""
+
+    # Latencia de cada llamada LLM simulada (proveedores sin API key, segundos)
+    simulated_latency: float = 1.0
+    # Con True (daemon) las sesiones HTTP se mantienen abiertas entre
+    # generaciones y se cierran recien con ``close()``
+    persistent: bool = False
     
     def __init__(self, config_path: str = "fast-engine.json"):
         self.config = Config.load(config_path)
         self.template_engine = TemplateEngine(self.config.templates_path)
+        self._providers: Optional[ProviderPool] = None
+        self._response_cache: Optional[ResponseCache] = None
+        # Rate limits y colas compartidos por todas las generaciones de la instancia
+        self.scheduler = RequestScheduler.from_config(self.config)
+
+    @property
+    def providers(self) -> ProviderPool:
+        """Clientes LLM compartidos entre todas las generaciones de esta instancia"""
+        if self._providers is None:
+            self._providers = ProviderPool.from_config(self.config, self.simulated_latency)
+        return self._providers
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        """Cache en disco de respuestas LLM (``FAST_ENGINE_HOME/cache/llm``)"""
+        if self._response_cache is None:
+            self._response_cache = ResponseCache(
+                max_bytes=self.config.llm_cache_max_mb * 1024 * 1024,
+                ttl=self.config.llm_cache_ttl,
+            )
+        return self._response_cache
 
     def create_app(self):
-        """Return a basic application instance."""
-        return _create_app()
+        """Aplicacion ASGI con cola de trabajos que usa esta instancia"""
+        return _create_app(engine=self)
     
-    def init_project_demo(self, name: str, template: str = "saas-basic", description: str = "") -> str:
-        """Demo de generacion de proyecto (sin APIs reales)"""
+    def init_project_demo(
+        self,
+        name: str,
+        template: str = "saas-basic",
+        description: str = "",
+        use_cache: bool = True,
+        output_dir: Optional[Path] = None,
+        sink: Optional[OutputSink] = None,
+    ) -> str:
+        """Generar un proyecto (proveedores simulados si faltan API keys).
+
+        Con ``use_cache`` las respuestas LLM se reutilizan si proveedor, modelo,
+        prompt y version del template coinciden con una generacion anterior.
+        """
+        return asyncio.run(self.generate(name, template, description, use_cache, output_dir, sink))
+
+    async def generate(
+        self,
+        name: str,
+        template: str = "saas-basic",
+        description: str = "",
+        use_cache: bool = True,
+        output_dir: Optional[Path] = None,
+        sink: Optional[OutputSink] = None,
+        config: Optional[Config] = None,
+    ) -> str:
+        """Version async de ``init_project_demo`` para un event loop ya corriendo.
+
+        El proyecto se escribe en ``output_dir / name`` (por defecto el
+        directorio actual) o, con ``sink``, en ese destino (p.ej. un
+        ``ArchiveSink`` que arma un tar.gz sin pasar por disco). ``config``
+        reemplaza en esta generacion los ajustes del proyecto (presupuesto de
+        tokens, hilos de escritura); proveedores y rate limits son los de la
+        instancia.
+        """
+        config = config or self.config
         logger.info(f"[ROCKET] Iniciando generacion de proyecto: {name}")
 
-        template_meta = self.template_engine.load_template_config(template)
+        with span("template.load", template=template):
+            template_meta = self.template_engine.load_template_config(template)
         logger.info(
             f"Usando template {template_meta.name} v{template_meta.version} por {template_meta.author}"
         )
         
-        print(f"[BRAIN] Simulando llamada a Claude para arquitectura...")
-        time.sleep(1)
-        
-        print(f"[GEAR] Simulando llamada a OpenAI para backend...")
-        time.sleep(1)
-        
-        print(f"[ART] Simulando llamada a DeepSeek para frontend...")
-        time.sleep(1)
-        
-        # Simular contexto de generacion
-        context = {
-            "app_name": name,
-            "app_description": description or f"Aplicacion SaaS: {name}",
-            "template_version": template_meta.version,
-            "template_author": template_meta.author,
-            "architecture": {
-                "entities": ["User", "Project", "Task"],
-                "features": ["authentication", "project_management", "task_tracking"]
-            },
-            "generated_backend": "# FastAPI backend code generated...",
-            "generated_frontend": "// Next.js frontend code generated..."
-        }
-        
-        # Renderizar templates
-        print(f"[DOCUMENT] Renderizando templates...")
-        project_files = self.template_engine.render_project(template, context)
-        
-        print(f"[FLOPPY] Escribiendo archivos del proyecto...")
-        print(f"[FOLDER] Archivos a crear: {len(project_files)}")
-        
-        # Debug: mostrar que archivos se van a crear
-        for file_path in project_files.keys():
-            print(f"  - {file_path}")
-        
-        # Escribir archivos con debugging
-        self._write_project(name, project_files)
+        with span("context.build"):
+            context = build_context(name, description, template_meta)
+
+        # Los templates se renderizan apenas esta la arquitectura y los archivos
+        # generados se escriben a medida que se cierran en el stream del LLM
+        writer = sink if sink is not None else self._project_writer(name, output_dir=output_dir, config=config)
+        with span("generation"):
+            generation, report = await self._run_generation(
+                name, template, context, writer, template_meta.version, use_cache, config
+            )
+        self._report_timings(generation)
+        self._report_write(report, writer.incremental)
         
-        return f"[CHECK] Proyecto {name} creado exitosamente en ./{name}/"
+        if sink is not None:
+            return f"[CHECK] Proyecto {name} generado ({len(report.written)} archivos)"
+        return f"[CHECK] Proyecto {name} creado exitosamente en {writer.root}/"
+    
+    async def _run_generation(
+        self,
+        name: str,
+        template: str,
+        context: Dict[str, Any],
+        writer: Union[ProjectWriter, OutputSink],
+        template_version: str = "",
+        use_cache: bool = True,
+        config: Optional[Config] = None,
+    ) -> Tuple[OrchestrationResult, WriteReport]:
+        """Correr las etapas escribiendo en paralelo y cerrar las sesiones HTTP al final"""
+        budget = TokenBudget((config or self.config).token_budget)
+        providers = self._stage_providers(template_version, use_cache, budget)
+        hits, misses = self.response_cache.hits, self.response_cache.misses
+        channel = FileChannel()
+        # Las salidas del template tienen prioridad sobre los archivos de los LLM,
+        # que corren en paralelo con el render
+        channel.reserve(self.template_engine.output_names(template))
+        writing = asyncio.ensure_future(write_channel(writer, channel))
+        try:
+            stages = self._generation_stages(name, providers, channel)
+            stages.append(
+                Stage("render", self._render_stage(template, context, channel), depends_on=("architecture",), max_retries=1)
+            )
+            generation = await StageOrchestrator(stages).run()
+        finally:
+            channel.close()
+            report = await writing
+            if not self.persistent:
+                await providers.close()
+            self._report_scheduler(budget)
+            if use_cache:
+                print(
+                    f"[CACHE] Respuestas desde cache: {self.response_cache.hits - hits}, "
+                    f"llamadas: {self.response_cache.misses - misses}"
+                )
+        return generation, report
+
+    def _render_stage(self, template: str, context: Dict[str, Any], channel: FileChannel):
+        async def render(deps: Dict[str, Any]) -> int:
+            print(f"[DOCUMENT] Renderizando templates...")
+
+            def produce() -> int:
+                count = 0
+                for rel_path, content in self.template_engine.iter_render_project(
+                    template, dict(context, architecture=deps["architecture"])
+                ):
+                    channel.put(rel_path, content)
+                    count += 1
+                return count
+
+            # Leer y compilar el template bloquea: en un hilo, como ``write_channel``,
+            # para no frenar el event loop (p.ej. /health en el servicio HTTP)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, contextvars.copy_context().run, produce)
+
+        return render
+
+    def _stage_providers(
+        self, template_version: str, use_cache: bool, budget: Optional[TokenBudget] = None
+    ) -> ProviderPool:
+        """Proveedores de una generacion: cache -> scheduler -> cliente.
+
+        Los hits de cache no pasan por el scheduler ni consumen presupuesto.
+        """
+        providers = {}
+        for name, provider in self.providers.providers.items():
+            provider = ScheduledProvider(provider, self.scheduler, budget)
+            if use_cache:
+                provider = CachedProvider(provider, self.response_cache, template_version)
+            providers[name] = provider
+        return ProviderPool(providers)
+
+    def _report_scheduler(self, budget: TokenBudget):
+        for provider, stats in self.scheduler.stats.items():
+            print(
+                f"[QUEUE] {provider}: {stats.requests} requests, ~{stats.tokens} tokens, "
+                f"espera media {stats.mean_wait:.2f}s (max {stats.max_wait:.2f}s), "
+                f"cola maxima {stats.max_queue_depth}"
+            )
+        if budget.limit is not None:
+            print(f"[QUEUE] Presupuesto: {budget.used}/{budget.limit} tokens")
+
+    def _generation_stages(
+        self, name: str, providers: Optional[ProviderPool] = None, channel: Optional[FileChannel] = None
+    ) -> List[Stage]:
+        """Etapas LLM: backend y frontend corren en paralelo tras la arquitectura.
+
+        Backend y frontend consumen la respuesta en streaming y mandan cada
+        archivo a ``channel`` apenas se completa; devuelven las rutas generadas.
+        """
+        providers = providers or self.providers
+
+        async def emit(provider, prompt: str, prefix: str) -> List[str]:
+            paths = []
+            async for rel_path, content in stream_files(provider.stream(prompt), prefix):
+                if channel is not None:
+                    rel_path = channel.put_generated(rel_path, content)
+                paths.append(rel_path)
+            return paths
+
+        async def architecture(_: Dict[str, Any]) -> Dict[str, Any]:
+            claude = providers.get("claude")
+            print(f"[BRAIN] Llamando a {claude.label} para arquitectura...")
+            reply = await claude.complete(
+                f"Disena la arquitectura de la aplicacion SaaS '{name}'. "
+                'Responde solo JSON con las claves "entities" y "features".'
+            )
+            try:
+                data = json.loads(reply)
+            except ValueError:
+                logger.warning("Respuesta de arquitectura no es JSON, usando la arquitectura por defecto")
+                return dict(DEMO_ARCHITECTURE)
+            return data if isinstance(data, dict) else dict(DEMO_ARCHITECTURE)
+
+        async def backend(deps: Dict[str, Any]) -> List[str]:
+            openai = providers.get("openai")
+            print(f"[GEAR] Llamando a {openai.label} para backend...")
+            prompt = (
+                f"Genera el backend FastAPI para '{name}' con esta arquitectura: "
+                f"{json.dumps(deps['architecture'])}. {FILE_FORMAT_INSTRUCTIONS}"
+            )
+            return await emit(openai, prompt, "backend/")
+
+        async def frontend(deps: Dict[str, Any]) -> List[str]:
+            deepseek = providers.get("deepseek")
+            print(f"[ART] Llamando a {deepseek.label} para frontend...")
+            prompt = (
+                f"Genera el frontend Next.js para '{name}' con esta arquitectura: "
+                f"{json.dumps(deps['architecture'])}. {FILE_FORMAT_INSTRUCTIONS}"
+            )
+            return await emit(deepseek, prompt, "frontend/")
+
+        # Los proveedores ya reintentan con backoff; no repetir en el orquestador
+        return [
+            Stage("architecture", architecture, max_retries=1),
+            Stage("backend", backend, depends_on=("architecture",), max_retries=1),
+            Stage("frontend", frontend, depends_on=("architecture",), max_retries=1),
+        ]
+
+    def _report_timings(self, generation: OrchestrationResult):
+        """Mostrar tiempos por etapa y camino critico"""
+        for stage_name in generation.timings:
+            timing = generation.timings[stage_name]
+            print(f"[CLOCK] {stage_name}: {timing.duration:.2f}s (+{timing.start:.2f}s)")
+        print(
+            f"[CLOCK] Total: {generation.wall_time:.2f}s "
+            f"(secuencial: {generation.total_stage_time:.2f}s, "
+            f"camino critico: {' -> '.join(generation.critical_path())})"
+        )
     
-    def _write_project(self, name: str, files: Dict[str, str]):
-        """Escribir archivos del proyecto al filesystem"""
+    async def close(self):
+        """Cerrar las sesiones HTTP de los proveedores"""
+        if self._providers is not None:
+            await self._providers.close()
+
+    def _project_writer(
+        self, name: str, incremental: bool = True, output_dir: Optional[Path] = None, config: Optional[Config] = None
+    ) -> ProjectWriter:
         # Usar path absoluto del directorio actual
-        current_dir = Path.cwd()
+        current_dir = Path(output_dir) if output_dir is not None else Path.cwd()
         project_path = current_dir / name
         
         print(f"[FOLDER] Directorio base: {current_dir}")
         print(f"[FOLDER] Directorio del proyecto: {project_path}")
-        
-        # Crear directorio del proyecto
+        return ProjectWriter(
+            project_path, jobs=(config or self.config).writer_threads, progress=print_progress, incremental=incremental
+        )
+
+    def _write_project(self, name: str, files: FileItems, incremental: bool = True):
+        """Escribir archivos del proyecto al filesystem.
+
+        En modo incremental solo se reescriben los archivos cuyo contenido cambio
+        respecto al manifiesto de la generacion anterior.
+        """
+        writer = self._project_writer(name, incremental)
         try:
-            project_path.mkdir(exist_ok=True)
-            print(f"[CHECK] Directorio creado: {project_path}")
+            report = writer.write_all(files)
         except Exception as e:
-            print(f"[X] Error creando directorio: {e}")
+            print(f"[X] Error creando directorios: {e}")
             return
+        self._report_write(report, incremental)
+
+    def _report_write(self, report: WriteReport, incremental: bool):
+        for file_path, error in report.failed.items():
+            print(f"[X] Error creando {file_path}: {error}")
         
-        # Escribir cada archivo
-        files_created = 0
-        for file_path, content in files.items():
-            full_path = project_path / file_path
-            
-            try:
-                # Crear directorios padre si no existen
-                ensure_directory(full_path.parent)
-                
-                # Escribir archivo
-                with open(full_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                
-                print(f"[CHECK] Creado: {file_path}")
-                files_created += 1
-                
-            except Exception as e:
-                print(f"[X] Error creando {file_path}: {e}")
-        
-        print(f"[CHART] Total archivos creados: {files_created}/{len(files)}")
+        print(f"[CHART] Total archivos escritos: {len(report.written)}/{report.total} en {report.elapsed:.2f}s")
+        if incremental:
+            print(
+                f"[CHART] Nuevos: {len(report.added)}, modificados: {len(report.changed)}, "
+                f"sin cambios: {len(report.unchanged)}, eliminados: {len(report.deleted)}"
+            )
     
     def doctor(self) -> Dict[str, Any]:
         """Diagnostico del sistema"""
         current_path = Path.cwd()
         templates_path = Path(self.config.templates_path)
+        # Donde se escriben proyectos y caches: problema de escritura o None
+        write_access = {
+            "current_directory": check_writable(current_path),
+            "output_path": check_writable(self.config.output_path),
+            "fast_engine_home": check_writable(get_home()),
+        }
         
         status = {
             "config_valid": self.config.validate(),
@@ -125,7 +336,8 @@ class FastEngine:
             "current_directory": str(current_path),
             "output_path": self.config.output_path,
             "templates_absolute_path": str(templates_path.absolute()),
-            "can_write": current_path.is_dir() and os.access(current_path, os.W_OK)
+            "can_write": not any(write_access.values()),
+            "write_access": write_access,
         }
         return status
         
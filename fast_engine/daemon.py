@@ -0,0 +1,229 @@
+"""Daemon de generacion (``fast-engine serve``).
+
+Mantiene en memoria un ``FastEngine`` con los templates indexados y
+compilados y los clientes LLM con sus conexiones abiertas, y atiende los
+comandos que la CLI le reenvia por un socket Unix (ver ``fast_engine.client``).
+
+Protocolo: el cliente manda una linea JSON ``{"command", "args", "version",
+"cwd"}`` y recibe lineas JSON ``{"output": ...}`` con la salida del comando a
+medida que se produce y al final ``{"exit_code": n}``. Si la version no
+coincide responde ``{"retry_local": true}`` y el cliente corre el comando.
+"""
+
+import asyncio
+import contextvars
+import io
+import json
+import os
+import signal
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TextIO
+
+from . import __version__
+from .config import PROJECT_CONFIG_FILE, Config
+from .core import FastEngine
+from .utils import logger
+
+# Destino de la salida del request que se esta atendiendo en este contexto
+_sink: contextvars.ContextVar = contextvars.ContextVar("fast_engine_daemon_output", default=None)
+
+
+class _OutputRouter(io.TextIOBase):
+    """``sys.stdout`` del daemon: lo que escribe cada request va a su cliente"""
+
+    def __init__(self, fallback: TextIO):
+        self.fallback = fallback
+
+    @property
+    def encoding(self):
+        return "utf-8"
+
+    def write(self, text: str) -> int:
+        sink = _sink.get()
+        if sink is None:
+            return self.fallback.write(text)
+        sink(text)
+        return len(text)
+
+    def flush(self):
+        if _sink.get() is None:
+            self.fallback.flush()
+
+    def isatty(self) -> bool:
+        return _sink.get() is None and self.fallback.isatty()
+
+
+def _prepare_socket(path: Path):
+    """Borrar un socket viejo; fallar si ya hay un daemon escuchando en el"""
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.settimeout(0.5)
+        probe.connect(str(path))
+    except OSError:
+        path.unlink()
+    else:
+        raise RuntimeError(f"Ya hay un daemon escuchando en {path}")
+    finally:
+        probe.close()
+
+
+def _run_init(args: Dict[str, Any], cwd: str) -> int:
+    from . import cli
+
+    try:
+        # Sin pool de procesos: hacer fork desde los hilos del daemon no es seguro.
+        # La configuracion del proyecto es la del directorio del cliente
+        cli._init_project(
+            args["name"], args["template"], bool(args["incremental"]), args["copy_mode"], jobs=1, cwd=Path(cwd)
+        )
+    except cli.typer.Exit as e:
+        return int(getattr(e, "exit_code", getattr(e, "code", 1)))
+    return 0
+
+
+class GenerationDaemon:
+    """Servidor de comandos con un ``FastEngine`` caliente.
+
+    ``init`` corre en un pool de hilos (render y escritura son sincronicos);
+    ``generate`` corre en el event loop del daemon para reutilizar las
+    sesiones HTTP de los proveedores entre requests.
+    """
+
+    def __init__(self, path: Path, engine: Optional[FastEngine] = None, workers: Optional[int] = None):
+        self.path = Path(path)
+        self.engine = engine
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fast-engine-daemon")
+        self.requests = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._active: set = set()
+
+    def warm_up(self):
+        """Pagar una sola vez lo que cada invocacion de la CLI pagaria: imports,
+        indice de templates, compilacion y clientes LLM."""
+        from . import cli
+        from .rendering import compile_directory
+
+        for entry in cli.get_template_registry().entries().values():
+            compile_directory(entry.path, entry.files, cli.get_bytecode_cache_dir())
+        if self.engine is None:
+            self.engine = FastEngine()
+        self.engine.persistent = True
+        self.engine.template_engine.list_templates()
+        self.engine.providers
+        try:
+            import rich  # noqa: F401  (usado por la salida de los comandos)
+        except ImportError:  # pragma: no cover - optional dependency
+            pass
+
+    async def serve(self, ready: Optional[Callable[[], None]] = None):
+        """Atender comandos hasta recibir SIGINT/SIGTERM, ``shutdown`` o ``stop()``"""
+        if self.engine is None:
+            self.warm_up()
+        self.engine.persistent = True
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        _prepare_socket(self.path)
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+        finally:
+            os.umask(umask)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(sig, self._stopping.set)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Fuera del hilo principal (tests) no hay handlers de senales
+                pass
+        stdout, sys.stdout = sys.stdout, _OutputRouter(sys.stdout)
+        try:
+            if ready is not None:
+                ready()
+            await self._stopping.wait()
+        finally:
+            server.close()
+            # Los comandos en curso terminan antes de cerrar los proveedores
+            if self._active:
+                await asyncio.gather(*self._active, return_exceptions=True)
+            await server.wait_closed()
+            sys.stdout = stdout
+            await self.engine.close()
+            self.executor.shutdown(wait=True)
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+    def stop(self):
+        """Pedir que el daemon termine (se puede llamar desde otro hilo)"""
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        def send(message: Dict[str, Any]):
+            if not writer.is_closing():
+                writer.write(json.dumps(message).encode("utf-8") + b"\n")
+
+        task = asyncio.current_task()
+        self._active.add(task)
+        command = None
+        try:
+            try:
+                request = json.loads(await reader.readline())
+                command = request["command"]
+            except (ValueError, KeyError, TypeError):
+                send({"output": "Request invalido\n"})
+                send({"exit_code": 2})
+                return
+            if request.get("version") != __version__:
+                send({"retry_local": True, "error": f"daemon v{__version__}, cliente v{request.get('version')}"})
+                return
+
+            loop = asyncio.get_running_loop()
+            _sink.set(lambda text: loop.call_soon_threadsafe(send, {"output": text}))
+            self.requests += 1
+            try:
+                code = await self._run(command, request.get("args") or {}, request.get("cwd") or os.getcwd())
+            except Exception as e:
+                logger.exception(f"Error atendiendo {command}")
+                print(f"ERROR: {e}")
+                code = 1
+            # La salida pendiente de los hilos se encola antes que el resultado
+            await asyncio.sleep(0)
+            send({"exit_code": code})
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            self._active.discard(task)
+            if command == "shutdown":
+                self._stopping.set()
+
+    async def _run(self, command: str, args: Dict[str, Any], cwd: str) -> int:
+        if command == "ping":
+            print(f"Fast-Engine daemon v{__version__} (pid {os.getpid()}, {self.requests} requests) en {self.path}")
+            return 0
+        if command == "shutdown":
+            print("Deteniendo daemon")
+            return 0
+        if command == "init":
+            context = contextvars.copy_context()
+            return await self._loop.run_in_executor(self.executor, context.run, _run_init, args, cwd)
+        if command == "generate":
+            # Como ``init``: la configuracion del proyecto es la del directorio del cliente
+            settings = Config.load(str(Path(cwd) / PROJECT_CONFIG_FILE))
+            message = await self.engine.generate(
+                args["name"], args["template"], args.get("description", ""), bool(args.get("use_cache", True)), Path(cwd),
+                config=settings,
+            )
+            print(message)
+            return 0
+        print(f"Comando no soportado por el daemon: {command}")
+        return 2
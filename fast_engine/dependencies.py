@@ -0,0 +1,164 @@
+"""Indice de dependencias template -> archivo generado para re-renderizar solo lo necesario"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple, Union
+
+try:
+    from jinja2 import meta
+except Exception:  # pragma: no cover - optional dependency
+    meta = None  # type: ignore
+
+from .manifest import Manifest, content_hash
+
+# Dependencias ya analizadas, por hash del source
+_analysis_cache: Dict[str, Tuple[Set[str], Set[str], bool]] = {}
+
+
+def context_hash(context: Mapping[str, Any], keys: List[str]) -> str:
+    """Hash de los valores de contexto que lee un template"""
+    values = {key: context.get(key) for key in keys}
+    return content_hash(json.dumps(values, sort_keys=True, default=str))
+
+
+@dataclass
+class DependencyRecord:
+    """Entradas de las que depende un archivo generado"""
+
+    template: str
+    sources: Dict[str, str] = field(default_factory=dict)
+    context_keys: List[str] = field(default_factory=list)
+    context_hash: str = ""
+    dynamic: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "DependencyRecord":
+        return cls(
+            template=data["template"],
+            sources=dict(data.get("sources", {})),
+            context_keys=list(data.get("context_keys", [])),
+            context_hash=data.get("context_hash", ""),
+            dynamic=bool(data.get("dynamic", False)),
+        )
+
+
+class SourceHasher:
+    """Lee y hashea sources de templates una sola vez por generacion"""
+
+    def __init__(self, env):
+        self.env = env
+        self._sources: Dict[str, Optional[Tuple[str, str]]] = {}
+
+    def source(self, name: str) -> Optional[Tuple[str, str]]:
+        """Devolver (source, hash) de un template o None si ya no existe"""
+        if name not in self._sources:
+            try:
+                source, _, _ = self.env.loader.get_source(self.env, name)
+            except Exception:
+                self._sources[name] = None
+            else:
+                self._sources[name] = (source, content_hash(source))
+        return self._sources[name]
+
+    def digest(self, name: str) -> Optional[str]:
+        entry = self.source(name)
+        return entry[1] if entry else None
+
+
+class DependencyIndex:
+    """Registro por archivo generado de templates, includes y claves de contexto usadas"""
+
+    def __init__(self, records: Optional[Dict[str, DependencyRecord]] = None):
+        self.records: Dict[str, DependencyRecord] = records or {}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "DependencyIndex":
+        try:
+            return cls({out: DependencyRecord.from_dict(rec) for out, rec in data.items()})
+        except (KeyError, TypeError, AttributeError):
+            return cls()
+
+    @classmethod
+    def load(cls, project_dir: Union[str, Path]) -> "DependencyIndex":
+        """Cargar el indice de un proyecto generado.
+
+        Solo se conservan los registros cuyos archivos siguen en el manifiesto
+        y en disco, de modo que un archivo borrado a mano se vuelve a generar.
+        """
+        manifest = Manifest.load(project_dir)
+        index = cls.from_dict(manifest.dependencies)
+        index.records = {
+            out: rec
+            for out, rec in index.records.items()
+            if out in manifest.files and (Path(project_dir) / out).is_file()
+        }
+        return index
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Sin ``asdict``: copia en profundidad y es lo mas caro de guardar el manifiesto
+        return {
+            out: {
+                "template": rec.template,
+                "sources": dict(rec.sources),
+                "context_keys": list(rec.context_keys),
+                "context_hash": rec.context_hash,
+                "dynamic": rec.dynamic,
+            }
+            for out, rec in sorted(self.records.items())
+        }
+
+    def is_fresh(self, output: str, hasher: SourceHasher, context: Mapping[str, Any]) -> bool:
+        """True si ninguna entrada de ``output`` cambio desde la ultima generacion"""
+        record = self.records.get(output)
+        if record is None or record.dynamic:
+            return False
+        for name, digest in record.sources.items():
+            if hasher.digest(name) != digest:
+                return False
+        return record.context_hash == context_hash(context, record.context_keys)
+
+    def record_template(self, output: str, template: str, hasher: SourceHasher, context: Mapping[str, Any]):
+        """Analizar un template (y sus include/extends/import) y registrar sus entradas"""
+        sources: Dict[str, str] = {}
+        keys: Set[str] = set()
+        dynamic = False
+        pending = [template]
+        while pending:
+            name = pending.pop()
+            if name in sources:
+                continue
+            entry = hasher.source(name)
+            if entry is None:
+                dynamic = True
+                continue
+            source, digest = entry
+            sources[name] = digest
+            refs, variables, has_dynamic = _analyze(hasher.env, name, source, digest)
+            keys |= variables
+            dynamic = dynamic or has_dynamic
+            pending.extend(refs)
+
+        context_keys = sorted(keys)
+        self.records[output] = DependencyRecord(
+            template=template,
+            sources=sources,
+            context_keys=context_keys,
+            context_hash=context_hash(context, context_keys),
+            dynamic=dynamic,
+        )
+
+
+def _analyze(env, name: str, source: str, digest: str) -> Tuple[Set[str], Set[str], bool]:
+    """Templates referenciados, variables libres y si hay referencias dinamicas"""
+    if digest not in _analysis_cache:
+        ast = env.parse(source, name)
+        refs: Set[str] = set()
+        has_dynamic = False
+        for ref in meta.find_referenced_templates(ast):
+            if ref is None:
+                has_dynamic = True
+            else:
+                refs.add(ref)
+        _analysis_cache[digest] = (refs, set(meta.find_undeclared_variables(ast)), has_dynamic)
+    return _analysis_cache[digest]
@@ -0,0 +1,79 @@
+"""Pipeline de generacion de un proyecto: render del template + escritura"""
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional, Union
+
+from .dependencies import DependencyIndex
+from .plan import WritePlan
+from .rendering import RenderResult, render_directory
+from .sinks import OutputSink
+from .tracing import span
+from .writer import ProjectWriter, WriteReport
+
+
+@dataclass
+class GenerationResult:
+    """Resultado de generar un proyecto"""
+
+    project_dir: Path
+    render: RenderResult
+    report: WriteReport
+    render_time: float = 0.0
+    write_time: float = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return self.render_time + self.write_time
+
+
+def generate_project(
+    template_dir: Union[str, Path],
+    project_dir: Union[str, Path],
+    context: Mapping[str, Any],
+    files: Optional[Iterable[str]] = None,
+    bytecode_dir: Optional[Union[str, Path]] = None,
+    incremental: bool = True,
+    copy_mode: str = "auto",
+    sink: Optional[OutputSink] = None,
+    jobs: Optional[int] = 1,
+    writer_threads: Optional[int] = None,
+    plan: Optional[WritePlan] = None,
+) -> GenerationResult:
+    """Renderizar un template y escribir el proyecto en ``project_dir``.
+
+    Los templates se renderizan en streaming directamente a disco, asi que
+    ``render_time`` solo cubre la carga/compilacion y el render en si queda
+    contabilizado en ``write_time``. Con ``sink`` (ver ``fast_engine.sinks``)
+    los archivos van a ese destino en lugar de ``project_dir``, sin render
+    incremental. ``jobs`` son los procesos de render (None: automatico, ver
+    ``render_directory``) y ``writer_threads`` los hilos de escritura.
+    ``plan`` es el plan de escritura ya calculado (ver ``fast_engine.plan``);
+    si no se pasa, el writer arma uno.
+    """
+    project_dir = Path(project_dir)
+    start = time.perf_counter()
+    with span("dependencies.load"):
+        previous = DependencyIndex.load(project_dir) if incremental and sink is None else None
+    with span("render"):
+        render = render_directory(
+            template_dir, context, bytecode_dir, previous, files=files, stream=True,
+            track_dependencies=sink is None, jobs=jobs,
+        )
+    rendered = time.perf_counter()
+
+    with span("write", files=len(render.files)):
+        dependencies = render.dependencies.to_dict()
+        if sink is not None:
+            report = sink.write_all(render.files, keep=render.reused, dependencies=dependencies)
+        else:
+            writer = ProjectWriter(project_dir, jobs=writer_threads, incremental=incremental, copy_mode=copy_mode)
+            report = writer.write_all(render.files, keep=render.reused, dependencies=dependencies, plan=plan)
+    return GenerationResult(
+        project_dir=project_dir,
+        render=render,
+        report=report,
+        render_time=rendered - start,
+        write_time=time.perf_counter() - rendered,
+    )
@@ -0,0 +1,183 @@
+"""Cola de trabajos de generacion en proceso, con workers acotados y reparto por tenant.
+
+Los trabajos esperan en una cola por tenant; los workers toman de los tenants
+en round-robin y cada tenant tiene un maximo de trabajos corriendo a la vez,
+asi un tenant con muchos pedidos no deja sin workers a los demas. Cuando hay
+``max_queued`` trabajos esperando ``submit`` falla con ``QueueFull`` (el
+servicio HTTP lo traduce a 429).
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFull(Exception):
+    """No hay lugar en la cola para otro trabajo"""
+
+
+@dataclass
+class Job:
+    """Pedido de generacion y su estado"""
+
+    tenant: str
+    request: Dict[str, Any]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = QUEUED
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    # Salida binaria del trabajo (p.ej. el proyecto empaquetado); no va en ``to_dict``
+    artifact: Optional[bytes] = field(default=None, repr=False)
+
+    @property
+    def pending(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "tenant": self.tenant,
+            "status": self.status,
+            "request": self.request,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+        if self.status == DONE:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+Runner = Callable[[Job], Awaitable[Any]]
+
+
+class JobQueue:
+    """Cola con ``workers`` trabajos simultaneos como maximo.
+
+    ``runner`` es la coroutine que ejecuta un trabajo y devuelve su resultado.
+    Los trabajos terminados se conservan ``retention`` segundos para consultar
+    su estado y resultado.
+    """
+
+    def __init__(
+        self,
+        runner: Runner,
+        workers: int = 4,
+        max_queued: int = 100,
+        tenant_concurrency: Optional[int] = None,
+        retention: float = 3600.0,
+    ):
+        if workers < 1:
+            raise ValueError("workers debe ser al menos 1")
+        self.runner = runner
+        self.workers = workers
+        self.max_queued = max_queued
+        self.tenant_concurrency = tenant_concurrency
+        self.retention = retention
+        self.jobs: Dict[str, Job] = {}
+        self._waiting: "OrderedDict[str, Deque[Job]]" = OrderedDict()
+        self._running: Dict[str, int] = {}
+        self._queued = 0
+        self._wakeup: Optional[asyncio.Condition] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    @property
+    def running(self) -> int:
+        return sum(self._running.values())
+
+    def start(self):
+        """Lanzar los workers en el event loop actual"""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Condition()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancelar los workers (los trabajos en curso quedan como fallidos)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, tenant: str, request: Dict[str, Any]) -> Job:
+        self.prune()
+        if self._queued >= self.max_queued:
+            raise QueueFull(f"Hay {self._queued} trabajos en cola (maximo {self.max_queued})")
+        job = Job(tenant=tenant, request=request)
+        self.jobs[job.id] = job
+        self._waiting.setdefault(tenant, deque()).append(job)
+        self._queued += 1
+        async with self._wakeup:
+            self._wakeup.notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def prune(self, now: Optional[float] = None):
+        """Olvidar los trabajos terminados hace mas de ``retention`` segundos"""
+        now = time.time() if now is None else now
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished is not None and now - job.finished > self.retention
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def _take(self) -> Optional[Job]:
+        """Siguiente trabajo en round-robin entre tenants con cupo libre"""
+        for tenant in list(self._waiting):
+            if self.tenant_concurrency is not None and self._running.get(tenant, 0) >= self.tenant_concurrency:
+                continue
+            waiting = self._waiting.pop(tenant)
+            job = waiting.popleft()
+            if waiting:
+                # El tenant vuelve al final de la ronda
+                self._waiting[tenant] = waiting
+            self._queued -= 1
+            self._running[tenant] = self._running.get(tenant, 0) + 1
+            return job
+        return None
+
+    async def _worker(self):
+        while True:
+            async with self._wakeup:
+                job = self._take()
+                while job is None:
+                    await self._wakeup.wait()
+                    job = self._take()
+            job.status = RUNNING
+            job.started = time.time()
+            try:
+                job.result = await self.runner(job)
+                job.status = DONE
+            except asyncio.CancelledError:
+                job.status, job.error = FAILED, "cancelado"
+                raise
+            except Exception as e:
+                job.status, job.error = FAILED, str(e) or type(e).__name__
+            finally:
+                job.finished = time.time()
+                self._running[job.tenant] -= 1
+                if not self._running[job.tenant]:
+                    del self._running[job.tenant]
+                # Un tenant que estaba en su tope puede tener trabajos esperando
+                async with self._wakeup:
+                    self._wakeup.notify_all()
@@ -0,0 +1,170 @@
+"""Cache en disco de respuestas LLM direccionada por contenido.
+
+La clave es el sha256 de (proveedor, modelo, hash del prompt, version del
+template): la misma generacion repetida no vuelve a llamar a la API. Las
+entradas viven en ``FAST_ENGINE_HOME/cache/llm``, expiran tras ``ttl``
+segundos y cuando el total supera ``max_bytes`` se borran las usadas hace
+mas tiempo (el mtime de cada archivo se actualiza en cada hit).
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Optional, Tuple, Union
+
+from .config import get_home
+from .providers import LLMProvider
+from .utils import logger
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL = 7 * 24 * 3600.0
+
+
+def cache_key(provider: str, model: str, prompt: str, template_version: str = "") -> str:
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    payload = json.dumps([provider, model, prompt_hash, template_version])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Almacen clave -> respuesta con TTL y limite de tamano (LRU)"""
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: Optional[float] = DEFAULT_TTL,
+    ):
+        self.directory = Path(directory) if directory is not None else get_home() / "cache" / "llm"
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Tamano total en disco; se calcula una vez y luego se lleva la cuenta
+        self._usage: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+                size = os.fstat(f.fileno()).st_size
+            if self.ttl is not None and time.time() - entry["created"] > self.ttl:
+                self._remove(path)
+                if self._usage is not None:
+                    self._usage -= size
+                raise KeyError(key)
+            # Marcar como usada recientemente para la eviccion LRU
+            os.utime(path)
+            self.hits += 1
+            return entry["response"]
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: str, **meta):
+        path = self._path(key)
+        data = json.dumps({"created": time.time(), "response": response, **meta})
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            previous = path.stat().st_size if path.exists() else 0
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # La cache nunca debe romper una generacion
+            logger.warning(f"No se pudo guardar en la cache LLM: {e}")
+            return
+        if self._usage is not None:
+            self._usage += len(data.encode("utf-8")) - previous
+        if self.usage() > self.max_bytes:
+            self.evict()
+
+    def _entries(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        if not self.directory.is_dir():
+            return
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for item in os.scandir(shard.path):
+                if item.name.endswith(".json"):
+                    try:
+                        yield Path(item.path), item.stat()
+                    except OSError:
+                        continue
+
+    def usage(self) -> int:
+        """Bytes ocupados por las entradas"""
+        if self._usage is None:
+            self._usage = sum(st.st_size for _, st in self._entries())
+        return self._usage
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Borrar las entradas menos usadas hasta quedar bajo el limite"""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries(), key=lambda item: item[1].st_mtime)
+        usage = sum(st.st_size for _, st in entries)
+        removed = 0
+        for path, st in entries:
+            if usage <= limit:
+                break
+            self._remove(path)
+            usage -= st.st_size
+            removed += 1
+        self._usage = usage
+        return removed
+
+    def clear(self) -> int:
+        return self.evict(0)
+
+    @staticmethod
+    def _remove(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+class CachedProvider(LLMProvider):
+    """Proveedor que consulta la cache antes de llamar al proveedor real"""
+
+    def __init__(self, provider: LLMProvider, cache: ResponseCache, template_version: str = ""):
+        self.provider = provider
+        self.cache = cache
+        self.template_version = template_version
+        self.name = provider.name
+        self.label = provider.label
+        self.model = provider.model
+
+    async def complete(self, prompt: str, model: Optional[str] = None) -> str:
+        model = model or self.provider.model
+        key = cache_key(self.name, model, prompt, self.template_version)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info(f"Respuesta de {self.name} desde cache ({key[:12]})")
+            return cached
+        response = await self.provider.complete(prompt, model)
+        self.cache.put(key, response, provider=self.name, model=model)
+        return response
+
+    async def stream(self, prompt: str, model: Optional[str] = None) -> AsyncIterator[str]:
+        model = model or self.provider.model
+        key = cache_key(self.name, model, prompt, self.template_version)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        chunks = []
+        async for chunk in self.provider.stream(prompt, model):
+            chunks.append(chunk)
+            yield chunk
+        self.cache.put(key, "".join(chunks), provider=self.name, model=model)
+
+    async def close(self):
+        await self.provider.close()
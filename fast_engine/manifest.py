@@ -0,0 +1,63 @@
+"""Manifiesto de archivos generados, usado para regenerar de forma incremental"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Union
+
+MANIFEST_NAME = ".fast-engine-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def content_hash(data: Union[str, bytes]) -> str:
+    """Hash sha256 del contenido de un archivo"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass
+class Manifest:
+    """Hashes del contenido escrito en la ultima generacion, por ruta relativa.
+
+    ``dependencies`` guarda el indice de dependencias de cada archivo generado
+    (ver ``fast_engine.dependencies``).
+    """
+
+    files: Dict[str, str] = field(default_factory=dict)
+    dependencies: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, project_dir: Union[str, Path]) -> "Manifest":
+        """Cargar el manifiesto de un proyecto (vacio si no existe o es invalido)"""
+        path = Path(project_dir) / MANIFEST_NAME
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return cls()
+        return cls(files=dict(data.get("files", {})), dependencies=dict(data.get("dependencies", {})))
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "version": MANIFEST_VERSION,
+            "files": dict(sorted(self.files.items())),
+            "dependencies": self.dependencies,
+        }
+
+    def save(self, project_dir: Union[str, Path]) -> bool:
+        """Guardar el manifiesto; no toca el archivo si no cambio"""
+        path = Path(project_dir) / MANIFEST_NAME
+        # Sin ``indent`` json usa el encoder en C (varias veces mas rapido con
+        # miles de archivos, y el manifiesto se guarda en cada escritura)
+        data = json.dumps(self.to_dict(), separators=(",", ":")) + "\n"
+        try:
+            if path.read_text(encoding="utf-8") == data:
+                return False
+        except OSError:
+            pass
+        path.write_text(data, encoding="utf-8")
+        return True
@@ -0,0 +1,132 @@
+"""Servidor LLM local para tests y demos sin red.
+
+Responde en el formato de OpenAI (``/v1/chat/completions`` y
+``/chat/completions``) y de Anthropic (``/v1/messages``), cuenta requests y
+conexiones TCP usadas, y permite inyectar latencia y fallas.
+"""
+
+import asyncio
+import json
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+
+class MockLLMServer:
+    """Servidor aiohttp en 127.0.0.1 con puerto efimero.
+
+    ``fail_first`` hace que las primeras N requests respondan ``fail_status``,
+    util para probar los reintentos. Las requests con ``"stream": true`` se
+    responden como server-sent events de ``chunk_size`` caracteres. Se usa como context manager async::
+
+        async with MockLLMServer() as server:
+            settings = ProviderSettings(base_url=server.url, model="mock")
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        reply: Optional[Callable[[str], str]] = None,
+        fail_first: int = 0,
+        fail_status: int = 503,
+        chunk_size: int = 16,
+        chunk_delay: float = 0.0,
+    ):
+        self.latency = latency
+        self.reply = reply or (lambda prompt: f"echo: {prompt}")
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.chunk_size = max(1, chunk_size)
+        self.chunk_delay = chunk_delay
+        self.requests = 0
+        self._peers: Set[Tuple[str, int]] = set()
+        self.url = ""
+        self._runner = None
+
+    async def start(self) -> "MockLLMServer":
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._openai)
+        app.router.add_post("/chat/completions", self._openai)
+        app.router.add_post("/v1/messages", self._anthropic)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    @property
+    def connections(self) -> int:
+        """Conexiones TCP distintas que hicieron al menos una request"""
+        return len(self._peers)
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockLLMServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _prompt(self, request):
+        """Devuelve ``(respuesta, stream)`` o una respuesta de error inyectada"""
+        from aiohttp import web
+
+        self.requests += 1
+        number = self.requests
+        self._peers.add(request.transport.get_extra_info("peername")[:2])
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if number <= self.fail_first:
+            return web.Response(status=self.fail_status, text="mock failure")
+        data = await request.json()
+        messages = data.get("messages") or [{}]
+        return self.reply(str(messages[-1].get("content", ""))), bool(data.get("stream"))
+
+    async def _send_events(self, request, events: Iterable[str]):
+        from aiohttp import web
+
+        resp = web.StreamResponse(headers={"content-type": "text/event-stream"})
+        await resp.prepare(request)
+        for event in events:
+            await resp.write(f"data: {event}\n\n".encode("utf-8"))
+            if self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+        await resp.write_eof()
+        return resp
+
+    def _chunks(self, text: str) -> List[str]:
+        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+
+    async def _openai(self, request):
+        from aiohttp import web
+
+        result = await self._prompt(request)
+        if isinstance(result, web.Response):
+            return result
+        reply, stream = result
+        if stream:
+            events = [json.dumps({"choices": [{"index": 0, "delta": {"content": c}}]}) for c in self._chunks(reply)]
+            return await self._send_events(request, events + ["[DONE]"])
+        return web.json_response({"choices": [{"index": 0, "message": {"role": "assistant", "content": reply}}]})
+
+    async def _anthropic(self, request):
+        from aiohttp import web
+
+        result = await self._prompt(request)
+        if isinstance(result, web.Response):
+            return result
+        reply, stream = result
+        if stream:
+            events = [json.dumps({"type": "message_start"})]
+            events += [
+                json.dumps({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": c}})
+                for c in self._chunks(reply)
+            ]
+            events.append(json.dumps({"type": "message_stop"}))
+            return await self._send_events(request, events)
+        return web.json_response({"type": "message", "content": [{"type": "text", "text": reply}]})
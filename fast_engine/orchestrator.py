@@ -0,0 +1,139 @@
+"""Orquestador async de etapas de generacion con grafo de dependencias"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Sequence
+
+from .tracing import span
+from .utils import retry_async
+
+StageFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass
+class Stage:
+    """Etapa de generacion.
+
+    ``func`` recibe un dict con los resultados de las etapas de las que depende.
+    """
+
+    name: str
+    func: StageFunc
+    depends_on: Sequence[str] = ()
+    max_retries: int = 3
+    retry_delay: float = 1.0
+
+
+@dataclass
+class StageTiming:
+    """Tiempos de una etapa relativos al inicio de la orquestacion"""
+
+    name: str
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class OrchestrationResult:
+    """Resultados y tiempos de una ejecucion del orquestador"""
+
+    results: Dict[str, Any]
+    timings: Dict[str, StageTiming]
+    wall_time: float
+    dependencies: Dict[str, Sequence[str]] = field(default_factory=dict)
+
+    @property
+    def total_stage_time(self) -> float:
+        """Suma de la duracion de todas las etapas (tiempo secuencial equivalente)"""
+        return sum(t.duration for t in self.timings.values())
+
+    def critical_path(self) -> List[str]:
+        """Cadena de etapas que determino el tiempo total"""
+        if not self.timings:
+            return []
+        current = max(self.timings.values(), key=lambda t: t.end).name
+        path = [current]
+        while self.dependencies.get(current):
+            current = max(self.dependencies[current], key=lambda d: self.timings[d].end)
+            path.append(current)
+        return list(reversed(path))
+
+
+class StageOrchestrator:
+    """Ejecuta etapas async en paralelo respetando sus dependencias.
+
+    Cada etapa arranca en cuanto terminan todas sus dependencias y se reintenta
+    con ``retry_async``.
+    """
+
+    def __init__(self, stages: Sequence[Stage]):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Etapa duplicada: {stage.name}")
+            self.stages[stage.name] = stage
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        for stage in self.stages.values():
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"Etapa '{stage.name}' depende de etapa desconocida '{dep}'")
+
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visitando, 2 = resuelta
+
+        def visit(name: str):
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Dependencia circular en etapa '{name}'")
+            state[name] = 1
+            for dep in self.stages[name].depends_on:
+                visit(dep)
+            state[name] = 2
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    async def run(self) -> OrchestrationResult:
+        """Ejecutar todas las etapas y devolver resultados con tiempos"""
+        origin = time.perf_counter()
+        tasks: Dict[str, "asyncio.Task[Any]"] = {}
+        timings: Dict[str, StageTiming] = {}
+
+        async def run_stage(stage: Stage) -> Any:
+            inputs = {dep: await tasks[dep] for dep in stage.depends_on}
+            start = time.perf_counter() - origin
+            with span(f"stage.{stage.name}"):
+                result = await retry_async(stage.func, stage.max_retries, stage.retry_delay, inputs)
+            timings[stage.name] = StageTiming(stage.name, start, time.perf_counter() - origin)
+            return result
+
+        for name in self.order:
+            tasks[name] = asyncio.ensure_future(run_stage(self.stages[name]))
+
+        try:
+            values = await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        return OrchestrationResult(
+            results=dict(zip(tasks.keys(), values)),
+            timings=timings,
+            wall_time=time.perf_counter() - origin,
+            dependencies={name: tuple(s.depends_on) for name, s in self.stages.items()},
+        )
+
+    def run_sync(self) -> OrchestrationResult:
+        """Version sincrona de ``run`` para llamadas desde codigo no async"""
+        return asyncio.run(self.run())
@@ -0,0 +1,182 @@
+"""Plan de escritura: el arbol de salida completo antes de escribir nada.
+
+``plan_write`` calcula todos los directorios que necesita un proyecto, cuales
+faltan y que archivos se crean o se sobrescriben, y detecta de entrada los
+problemas que harian fallar la escritura a mitad de camino:
+
+- dos archivos del template que generan la misma salida (``app.py`` y ``app.py.j2``)
+- una salida que tambien es directorio de otra (``docs`` y ``docs/index.md``)
+- un archivo donde hace falta un directorio, o un directorio donde va un archivo
+- directorios sin permiso de escritura
+
+El disco se lee una vez por directorio existente (``os.scandir``), no por
+archivo, y ``create_directories`` hace un ``mkdir`` por directorio faltante,
+de padres a hijos.
+"""
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+ROOT = "."
+OUTSIDE_ROOT = "ruta fuera del proyecto"
+
+
+@dataclass
+class WritePlan:
+    """Arbol de salida de un proyecto y sus problemas (ruta -> descripcion)"""
+
+    root: Optional[Path]
+    files: List[str] = field(default_factory=list)
+    directories: List[str] = field(default_factory=list)
+    missing: List[Path] = field(default_factory=list)
+    existing: List[str] = field(default_factory=list)
+    issues: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    @property
+    def new_files(self) -> List[str]:
+        existing = set(self.existing)
+        return [rel_path for rel_path in self.files if rel_path not in existing]
+
+    def create_directories(self) -> int:
+        """Crear los directorios que faltan (cada uno una sola vez)"""
+        for directory in self.missing:
+            try:
+                os.mkdir(directory)
+            except FileExistsError:
+                # Otro proceso lo creo entre el plan y la escritura
+                if not directory.is_dir():
+                    raise
+        return len(self.missing)
+
+
+def outside_root(rel_path: str) -> bool:
+    """``rel_path`` no queda dentro de su directorio (absoluta, ``..``, ``.`` o vacia)"""
+    parts = rel_path.replace("\\", "/").split("/")
+    return os.path.isabs(rel_path) or any(part in ("", ".", "..") for part in parts)
+
+
+def check_writable(path: Union[str, Path]) -> Optional[str]:
+    """Problema para escribir en el directorio ``path`` (None si se puede).
+
+    Si ``path`` no existe se revisa el ancestro existente mas cercano, que es
+    donde habra que crearlo.
+    """
+    path = Path(os.path.abspath(path))
+    target = path
+    while not os.path.lexists(target):
+        if target.parent == target:
+            break
+        target = target.parent
+    if not target.is_dir():
+        return f"{target} existe y no es un directorio"
+    if not os.access(target, os.W_OK | os.X_OK):
+        return f"sin permiso de escritura en {target}"
+    return None
+
+
+def plan_write(
+    root: Optional[Union[str, Path]],
+    outputs: Iterable[str],
+    sources: Optional[Mapping[str, Sequence[str]]] = None,
+) -> WritePlan:
+    """Planificar la escritura de ``outputs`` (rutas relativas) bajo ``root``.
+
+    ``sources`` (salida -> archivos del template que la generan, ver
+    ``rendering.output_sources``) permite detectar colisiones entre archivos
+    del template. Con ``root=None`` (un archivo comprimido) no se mira el disco.
+    """
+    plan = WritePlan(root=None if root is None else Path(root))
+    issues = plan.issues
+    for output, origins in (sources or {}).items():
+        if len(origins) > 1:
+            issues[output] = f"la generan varios archivos del template: {', '.join(sorted(origins))}"
+
+    # directorio -> {nombre: es directorio} de lo que se va a escribir
+    tree: Dict[str, Dict[str, bool]] = {"": {}}
+    for rel_path in sorted(set(outputs)):
+        if outside_root(rel_path):
+            issues[rel_path] = OUTSIDE_ROOT
+            continue
+        parts = rel_path.split("/")
+        plan.files.append(rel_path)
+        parent = ""
+        for part in parts[:-1]:
+            tree[parent][part] = True
+            parent = f"{parent}/{part}" if parent else part
+            tree.setdefault(parent, {})
+        tree[parent].setdefault(parts[-1], False)
+    plan.directories = sorted(directory for directory in tree if directory)
+    for rel_path in plan.files:
+        if rel_path in tree:
+            issues[rel_path] = "es un archivo y tambien el directorio de otras salidas"
+
+    if plan.root is not None:
+        _check_disk(plan, tree)
+    return plan
+
+
+def _scan(path: Path) -> Dict[str, bool]:
+    with os.scandir(path) as entries:
+        return {entry.name: entry.is_dir() for entry in entries}
+
+
+def _check_disk(plan: WritePlan, tree: Dict[str, Dict[str, bool]]):
+    root = plan.root
+    issues = plan.issues
+    # directorio -> contenido en disco (None: no existe, se va a crear). Los
+    # directorios con problemas no aparecen y su contenido no se revisa.
+    listings: Dict[str, Optional[Dict[str, bool]]] = {}
+
+    # Los padres se procesan antes que sus hijos porque son prefijos
+    for directory in sorted(tree):
+        path = root / directory if directory else root
+        key = directory or ROOT
+        if directory:
+            parent, _, name = directory.rpartition("/")
+            if parent not in listings:
+                continue
+            parent_listing = listings[parent]
+            kind = None if parent_listing is None else parent_listing.get(name)
+        else:
+            kind = True if os.path.isdir(root) else (False if os.path.lexists(root) else None)
+            if kind is None:
+                problem = check_writable(root)
+                if problem:
+                    issues[key] = problem
+                    continue
+                missing = [root]
+                while not os.path.lexists(missing[-1].parent):
+                    missing.append(missing[-1].parent)
+                plan.missing.extend(reversed(missing))
+                listings[directory] = None
+                continue
+
+        if kind is None:
+            plan.missing.append(path)
+            listings[directory] = None
+        elif kind is False:
+            issues[key] = "existe un archivo donde va un directorio"
+        elif not os.access(path, os.W_OK | os.X_OK):
+            issues[key] = "sin permiso de escritura"
+        else:
+            try:
+                listings[directory] = _scan(path)
+            except OSError as e:
+                issues[key] = f"no se pudo leer ({e.strerror or e})"
+
+    for rel_path in plan.files:
+        parent, _, name = rel_path.rpartition("/")
+        listing = listings.get(parent)
+        if listing is None or rel_path in issues:
+            continue
+        kind = listing.get(name)
+        if kind is True:
+            issues[rel_path] = "existe un directorio con ese nombre"
+        elif kind is False:
+            plan.existing.append(rel_path)
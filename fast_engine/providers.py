@@ -0,0 +1,369 @@
+"""Capa de proveedores LLM con clientes HTTP async compartidos.
+
+Cada proveedor mantiene una unica ``aiohttp.ClientSession`` con pool de
+conexiones keep-alive, un limite de concurrencia y timeouts propios, y
+reintenta con ``retry_async`` (backoff exponencial con jitter). Los
+proveedores sin API key configurada se reemplazan por ``SimulatedProvider``.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from .utils import logger, retry_async
+
+
+class ProviderError(Exception):
+    """Error devuelto por un proveedor LLM"""
+
+    def __init__(self, provider: str, message: str, status: Optional[int] = None):
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        """Rate limits, errores 5xx y fallas de red se reintentan; el resto no"""
+        return self.status is None or self.status == 429 or self.status >= 500
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, ProviderError):
+        return error.retryable
+    return isinstance(error, (OSError, asyncio.TimeoutError)) or type(error).__module__.startswith("aiohttp")
+
+
+@dataclass
+class ProviderSettings:
+    """Configuracion de conexion de un proveedor"""
+
+    base_url: str
+    model: str
+    api_key: Optional[str] = None
+    max_concurrency: int = 8
+    timeout: float = 120.0
+    connect_timeout: float = 10.0
+    keepalive_timeout: float = 60.0
+    max_retries: int = 3
+    retry_delay: float = 1.0
+    retry_jitter: float = 0.5
+    max_tokens: int = 4096
+
+
+class LLMProvider:
+    """Interfaz comun de los proveedores"""
+
+    name = "llm"
+    label = "LLM"
+    model = "default"
+
+    async def complete(self, prompt: str, model: Optional[str] = None) -> str:
+        raise NotImplementedError
+
+    async def stream(self, prompt: str, model: Optional[str] = None) -> AsyncIterator[str]:
+        """Respuesta en fragmentos a medida que llegan (por defecto, uno solo)"""
+        yield await self.complete(prompt, model)
+
+    async def close(self):
+        """Liberar conexiones abiertas"""
+
+
+class HTTPProvider(LLMProvider):
+    """Proveedor sobre HTTP con una sesion compartida por event loop"""
+
+    path = "/"
+
+    def __init__(self, settings: ProviderSettings):
+        self.settings = settings
+        self.model = settings.model
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _get_session(self):
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(
+                limit=self.settings.max_concurrency,
+                keepalive_timeout=self.settings.keepalive_timeout,
+            )
+            timeout = aiohttp.ClientTimeout(total=self.settings.timeout, connect=self.settings.connect_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._semaphore = asyncio.Semaphore(self.settings.max_concurrency)
+            self._loop = loop
+        return self._session
+
+    async def complete(self, prompt: str, model: Optional[str] = None) -> str:
+        session = await self._get_session()
+        async with self._semaphore:
+            return await retry_async(
+                self._request,
+                self.settings.max_retries,
+                self.settings.retry_delay,
+                session,
+                prompt,
+                model or self.settings.model,
+                jitter=self.settings.retry_jitter,
+                retry_if=_is_retryable,
+            )
+
+    async def _request(self, session, prompt: str, model: str) -> str:
+        url = self.settings.base_url.rstrip("/") + self.path
+        async with session.post(url, json=self.build_payload(prompt, model), headers=self.headers()) as resp:
+            if resp.status >= 400:
+                raise ProviderError(self.name, (await resp.text())[:500], resp.status)
+            data = await resp.json(content_type=None)
+        return self.parse_response(data)
+
+    async def stream(self, prompt: str, model: Optional[str] = None) -> AsyncIterator[str]:
+        """Consumir la respuesta como server-sent events.
+
+        Solo se reintenta la apertura del stream: una vez que llego contenido
+        un error se propaga (reintentar duplicaria texto ya entregado).
+        """
+        session = await self._get_session()
+        async with self._semaphore:
+            resp = await retry_async(
+                self._open_stream,
+                self.settings.max_retries,
+                self.settings.retry_delay,
+                session,
+                prompt,
+                model or self.settings.model,
+                jitter=self.settings.retry_jitter,
+                retry_if=_is_retryable,
+            )
+            async with resp:
+                async for line in resp.content:
+                    line = line.strip()
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        break
+                    try:
+                        text = self.parse_stream_event(json.loads(data))
+                    except ValueError:
+                        continue
+                    if text:
+                        yield text
+
+    async def _open_stream(self, session, prompt: str, model: str):
+        url = self.settings.base_url.rstrip("/") + self.path
+        payload = self.build_payload(prompt, model)
+        payload["stream"] = True
+        resp = await session.post(url, json=payload, headers=self.headers())
+        if resp.status >= 400:
+            try:
+                raise ProviderError(self.name, (await resp.text())[:500], resp.status)
+            finally:
+                resp.release()
+        return resp
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def headers(self) -> Dict[str, str]:
+        return {"content-type": "application/json"}
+
+    def build_payload(self, prompt: str, model: str) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def parse_response(self, data: Dict[str, Any]) -> str:
+        raise NotImplementedError
+
+    def parse_stream_event(self, event: Dict[str, Any]) -> Optional[str]:
+        raise NotImplementedError
+
+
+class OpenAIProvider(HTTPProvider):
+    name = "openai"
+    label = "OpenAI"
+    path = "/v1/chat/completions"
+    default_settings = ProviderSettings(base_url="https://api.openai.com", model="gpt-4o-mini")
+
+    def headers(self) -> Dict[str, str]:
+        headers = super().headers()
+        headers["authorization"] = f"Bearer {self.settings.api_key}"
+        return headers
+
+    def build_payload(self, prompt: str, model: str) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "max_tokens": self.settings.max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+    def parse_response(self, data: Dict[str, Any]) -> str:
+        try:
+            return data["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            raise ProviderError(self.name, f"Respuesta inesperada: {json.dumps(data)[:200]}")
+
+    def parse_stream_event(self, event: Dict[str, Any]) -> Optional[str]:
+        choices = event.get("choices") or [{}]
+        return (choices[0].get("delta") or {}).get("content")
+
+
+class DeepSeekProvider(OpenAIProvider):
+    """DeepSeek expone una API compatible con OpenAI"""
+
+    name = "deepseek"
+    label = "DeepSeek"
+    path = "/chat/completions"
+    default_settings = ProviderSettings(base_url="https://api.deepseek.com", model="deepseek-chat")
+
+
+class ClaudeProvider(HTTPProvider):
+    name = "claude"
+    label = "Claude"
+    path = "/v1/messages"
+    api_version = "2023-06-01"
+    default_settings = ProviderSettings(base_url="https://api.anthropic.com", model="claude-3-5-sonnet-latest")
+
+    def headers(self) -> Dict[str, str]:
+        headers = super().headers()
+        headers["x-api-key"] = self.settings.api_key or ""
+        headers["anthropic-version"] = self.api_version
+        return headers
+
+    def build_payload(self, prompt: str, model: str) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "max_tokens": self.settings.max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+    def parse_response(self, data: Dict[str, Any]) -> str:
+        try:
+            return "".join(block.get("text", "") for block in data["content"] if block.get("type") == "text")
+        except (KeyError, TypeError, AttributeError):
+            raise ProviderError(self.name, f"Respuesta inesperada: {json.dumps(data)[:200]}")
+
+    def parse_stream_event(self, event: Dict[str, Any]) -> Optional[str]:
+        if event.get("type") == "error":
+            raise ProviderError(self.name, json.dumps(event.get("error"))[:500])
+        if event.get("type") == "content_block_delta":
+            return (event.get("delta") or {}).get("text")
+        return None
+
+
+class SimulatedProvider(LLMProvider):
+    """Proveedor local sin red: espera ``latency`` y devuelve una respuesta fija.
+
+    ``stream`` entrega la respuesta en fragmentos de ``chunk_size`` caracteres
+    repartiendo la latencia entre ellos, como un proveedor real en streaming.
+    """
+
+    model = "simulated"
+
+    def __init__(
+        self,
+        name: str,
+        response: Callable[[str], str],
+        latency: float = 1.0,
+        label: Optional[str] = None,
+        chunk_size: int = 16,
+    ):
+        self.name = name
+        self.label = f"{label or name} (simulado)"
+        self.response = response
+        self.latency = latency
+        self.chunk_size = max(1, chunk_size)
+        self.calls = 0
+
+    async def complete(self, prompt: str, model: Optional[str] = None) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return self.response(prompt)
+
+    async def stream(self, prompt: str, model: Optional[str] = None) -> AsyncIterator[str]:
+        self.calls += 1
+        text = self.response(prompt)
+        chunks = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)] or [""]
+        delay = self.latency / len(chunks)
+        for chunk in chunks:
+            await asyncio.sleep(delay)
+            yield chunk
+
+
+PROVIDER_CLASSES = {
+    "claude": ClaudeProvider,
+    "openai": OpenAIProvider,
+    "deepseek": DeepSeekProvider,
+}
+
+DEMO_ARCHITECTURE = {
+    "entities": ["User", "Project", "Task"],
+    "features": ["authentication", "project_management", "task_tracking"],
+}
+
+_DEMO_BACKEND = """=== FILE: models.py ===
+# FastAPI backend code generated...
+=== END FILE ===
+=== FILE: routes.py ===
+from fastapi import APIRouter
+
+router = APIRouter()
+=== END FILE ===
+"""
+
+_DEMO_FRONTEND = """=== FILE: pages/index.tsx ===
+// Next.js frontend code generated...
+export default function Home() {
+  return <main>Home</main>;
+}
+=== END FILE ===
+"""
+
+_SIMULATED_RESPONSES: Dict[str, Callable[[str], str]] = {
+    "claude": lambda prompt: json.dumps(DEMO_ARCHITECTURE),
+    "openai": lambda prompt: _DEMO_BACKEND,
+    "deepseek": lambda prompt: _DEMO_FRONTEND,
+}
+
+
+class ProviderPool:
+    """Un cliente compartido por proveedor"""
+
+    def __init__(self, providers: Dict[str, LLMProvider]):
+        self.providers = providers
+
+    @classmethod
+    def from_config(cls, config, simulated_latency: float = 1.0) -> "ProviderPool":
+        """Crear clientes reales para las API keys configuradas y simulados para el resto"""
+        providers: Dict[str, LLMProvider] = {}
+        for name, provider_cls in PROVIDER_CLASSES.items():
+            api_key = getattr(config, f"{name}_api_key", None)
+            if api_key:
+                settings = replace(
+                    provider_cls.default_settings,
+                    api_key=api_key,
+                    max_concurrency=getattr(config, "provider_concurrency", 8),
+                    timeout=getattr(config, "provider_timeout", 120.0),
+                )
+                providers[name] = provider_cls(settings)
+            else:
+                providers[name] = SimulatedProvider(
+                    name, _SIMULATED_RESPONSES[name], simulated_latency, label=provider_cls.label
+                )
+        return cls(providers)
+
+    def get(self, name: str) -> LLMProvider:
+        try:
+            return self.providers[name]
+        except KeyError:
+            raise ProviderError(name, "proveedor no configurado")
+
+    async def close(self):
+        """Cerrar las sesiones HTTP (se recrean solas en el proximo uso)"""
+        for provider in self.providers.values():
+            try:
+                await provider.close()
+            except Exception as e:  # pragma: no cover - best effort
+                logger.warning(f"Error cerrando proveedor {provider.name}: {e}")
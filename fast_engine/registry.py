@@ -0,0 +1,303 @@
+"""Registro de templates con indice cacheado en disco.
+
+El indice guarda nombre, version, autor, descripcion, lista de archivos y
+hashes de cada template. Se construye una vez y se revalida comparando el
+mtime de los directorios: agregar, borrar o renombrar archivos (como hacen la
+mayoria de los editores al guardar) invalida solo el template afectado.
+Escribir sobre un archivo existente no cambia el mtime de su directorio, por
+eso ``get`` ademas compara (mtime, tamano) de cada archivo y rehashea solo
+los que cambiaron: los hashes que devuelve son el contenido actual.
+
+Los bundles (``<nombre>.feb``, ver ``fast_engine.bundle``) del directorio de
+templates tambien se registran; si existe un directorio con el mismo nombre,
+el directorio (la fuente editable) tiene prioridad.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .bundle import BUNDLE_SUFFIX, is_bundle, open_bundle
+from .config import get_home
+
+INDEX_VERSION = 2
+METADATA_FILE = "template.yml"
+
+
+def read_metadata(path: Path) -> Dict[str, Any]:
+    """Parse a ``template.yml`` file into a dict"""
+    # PyYAML solo se importa al (re)construir el indice, no en cada arranque
+    try:
+        import yaml  # type: ignore
+    except Exception:  # pragma: no cover - fallback when PyYAML is missing
+        yaml = None
+    if yaml:
+        with open(path, encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+    else:
+        data = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if ":" in line:
+                    k, v = line.split(":", 1)
+                    data[k.strip()] = v.strip()
+    return data if isinstance(data, dict) else {}
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class TemplateEntry:
+    """Entrada del indice para un template"""
+
+    name: str
+    path: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    files: Dict[str, str] = field(default_factory=dict)
+    dir_mtimes: Dict[str, int] = field(default_factory=dict)
+    metadata_mtime: int = 0
+    # ruta -> [mtime_ns, tamano] de cuando se calculo su hash en ``files``
+    file_stats: Dict[str, List[int]] = field(default_factory=dict)
+
+    @property
+    def version(self) -> str:
+        return str(self.metadata.get("version", "0.0.0"))
+
+    @property
+    def description(self) -> str:
+        return str(self.metadata.get("description", ""))
+
+    @property
+    def author(self) -> str:
+        return str(self.metadata.get("author", "Unknown"))
+
+    @property
+    def is_bundle(self) -> bool:
+        return is_bundle(self.path)
+
+    def is_current(self) -> bool:
+        """Revalidar la entrada usando solo ``stat`` de sus directorios"""
+        root = Path(self.path)
+        try:
+            if self.is_bundle:
+                return root.stat().st_mtime_ns == self.metadata_mtime
+            if (root / METADATA_FILE).stat().st_mtime_ns != self.metadata_mtime:
+                return False
+            for rel, mtime in self.dir_mtimes.items():
+                if (root / rel).stat().st_mtime_ns != mtime:
+                    return False
+        except OSError:
+            return False
+        return True
+
+    def revalidate(self) -> bool:
+        """Rehashear los archivos cuyo (mtime, tamano) cambio; True si hubo alguno.
+
+        ``is_current`` solo ve archivos agregados, borrados o renombrados; un
+        archivo editado en el lugar se detecta aca, con un ``stat`` por archivo.
+        """
+        if self.is_bundle:
+            return False
+        root = Path(self.path)
+        changed = False
+        for rel in self.files:
+            path = root / rel
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            stamp = [st.st_mtime_ns, st.st_size]
+            if self.file_stats.get(rel) != stamp:
+                self.files[rel] = _file_hash(path)
+                self.file_stats[rel] = stamp
+                changed = True
+        return changed
+
+    @classmethod
+    def load(cls, path: Path) -> "TemplateEntry":
+        """Entrada de un directorio de template o de un bundle"""
+        return cls.from_bundle(path) if is_bundle(path) else cls.scan(path)
+
+    @classmethod
+    def from_bundle(cls, path: Path) -> "TemplateEntry":
+        """Construir la entrada desde el header de un bundle (sin leer archivos)"""
+        bundle = open_bundle(path)
+        return cls(
+            name=path.stem,
+            path=str(path),
+            metadata=dict(bundle.metadata),
+            files=dict(bundle.files),
+            metadata_mtime=path.stat().st_mtime_ns,
+        )
+
+    @classmethod
+    def scan(cls, template_dir: Path) -> "TemplateEntry":
+        """Construir la entrada leyendo el directorio del template"""
+        files: Dict[str, str] = {}
+        file_stats: Dict[str, List[int]] = {}
+        dir_mtimes: Dict[str, int] = {}
+        for dirpath, dirnames, filenames in os.walk(template_dir):
+            dirnames.sort()
+            current = Path(dirpath)
+            rel_dir = current.relative_to(template_dir).as_posix()
+            dir_mtimes[rel_dir] = current.stat().st_mtime_ns
+            for filename in sorted(filenames):
+                path = current / filename
+                rel = path.relative_to(template_dir).as_posix()
+                st = path.stat()
+                files[rel] = _file_hash(path)
+                file_stats[rel] = [st.st_mtime_ns, st.st_size]
+        metadata_path = template_dir / METADATA_FILE
+        return cls(
+            name=template_dir.name,
+            path=str(template_dir),
+            metadata=read_metadata(metadata_path),
+            files=files,
+            dir_mtimes=dir_mtimes,
+            metadata_mtime=metadata_path.stat().st_mtime_ns,
+            file_stats=file_stats,
+        )
+
+
+class TemplateRegistry:
+    """Indice de los templates de un directorio.
+
+    Las consultas revalidan el indice con ``stat`` y solo re-escanean los
+    templates cuyo directorio cambio. El indice se persiste en
+    ``FAST_ENGINE_HOME/cache/registry`` para los procesos siguientes.
+    """
+
+    def __init__(self, templates_path: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None):
+        self.templates_path = Path(templates_path)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else get_home() / "cache" / "registry"
+        key = hashlib.sha1(str(self.templates_path.resolve()).encode("utf-8")).hexdigest()[:16]
+        self.index_path = self.cache_dir / f"index-{key}.json"
+        self._entries: Optional[Dict[str, TemplateEntry]] = None
+        # mtime del directorio raiz y de los subdirectorios que aun no tienen
+        # template.yml (pueden convertirse en templates sin tocar la raiz)
+        self._root_mtimes: Dict[str, int] = {}
+        self._paths: Dict[str, Path] = {}
+
+    def _listing_is_current(self) -> bool:
+        try:
+            for rel, mtime in self._root_mtimes.items():
+                if (self.templates_path / rel).stat().st_mtime_ns != mtime:
+                    return False
+        except OSError:
+            return False
+        return bool(self._root_mtimes)
+
+    def entries(self) -> Dict[str, TemplateEntry]:
+        """Entradas vigentes, por nombre de template"""
+        if not self.templates_path.is_dir():
+            return {}
+
+        if self._entries is None:
+            self._load_index()
+        entries = self._entries or {}
+        dirty = False
+
+        if not self._listing_is_current():
+            root_mtimes = {".": self.templates_path.stat().st_mtime_ns}
+            sources: Dict[str, Path] = {}
+            for item in sorted(self.templates_path.iterdir()):
+                if item.is_dir():
+                    if (item / METADATA_FILE).is_file():
+                        sources[item.name] = item
+                    else:
+                        root_mtimes[item.name] = item.stat().st_mtime_ns
+                elif item.suffix == BUNDLE_SUFFIX:
+                    sources.setdefault(item.stem, item)
+            entries = {
+                name: _matching(entries.get(name), path) or TemplateEntry(name=name, path="")
+                for name, path in sources.items()
+            }
+            self._paths = sources
+            self._root_mtimes = root_mtimes
+            dirty = True
+
+        for name, entry in list(entries.items()):
+            if not entry.path or not entry.is_current():
+                try:
+                    entries[name] = TemplateEntry.load(self._source_path(name, entry))
+                except Exception:
+                    del entries[name]
+                dirty = True
+
+        self._entries = entries
+        if dirty:
+            self._save_index()
+        return entries
+
+    def _source_path(self, name: str, entry: TemplateEntry) -> Path:
+        if name in self._paths:
+            return self._paths[name]
+        return Path(entry.path) if entry.path else self.templates_path / name
+
+    def names(self) -> List[str]:
+        return list(self.entries())
+
+    def get(self, name: str) -> Optional[TemplateEntry]:
+        """Entrada de ``name`` con los hashes de sus archivos revalidados"""
+        entry = self.entries().get(name)
+        if entry is not None and entry.revalidate():
+            self._save_index()
+        return entry
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION or data.get("root") != str(self.templates_path.resolve()):
+                raise ValueError("stale index")
+            self._entries = {name: TemplateEntry(**entry) for name, entry in data["templates"].items()}
+            self._root_mtimes = dict(data["root_mtimes"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self._entries = {}
+            self._root_mtimes = {}
+
+    def _save_index(self):
+        data = {
+            "version": INDEX_VERSION,
+            "root": str(self.templates_path.resolve()),
+            "root_mtimes": self._root_mtimes,
+            "templates": {name: asdict(entry) for name, entry in sorted((self._entries or {}).items())},
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Un nombre por hilo: los hilos del daemon guardan el indice a la vez
+            tmp_path = self.index_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, default=str)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            # El indice es solo una cache: si no se puede guardar se reconstruye
+            pass
+
+
+def _matching(entry: Optional[TemplateEntry], path: Path) -> Optional[TemplateEntry]:
+    """La entrada cacheada solo sirve si apunta al mismo origen (dir o bundle)"""
+    if entry is not None and entry.path and Path(entry.path) != path:
+        return None
+    return entry
+
+
+_registries: Dict[str, TemplateRegistry] = {}
+
+
+def get_registry(templates_path: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None) -> TemplateRegistry:
+    """Registro compartido dentro del proceso para un directorio de templates"""
+    key = f"{Path(templates_path).resolve()}|{cache_dir}"
+    if key not in _registries:
+        _registries[key] = TemplateRegistry(templates_path, cache_dir)
+    return _registries[key]
@@ -0,0 +1,405 @@
+"""Renderizado de directorios (o bundles) de templates con entornos Jinja2 cacheados"""
+
+import hashlib
+import marshal
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+try:
+    from jinja2 import BaseLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateNotFound
+    from jinja2.bccache import BytecodeCache, bc_magic
+except Exception:  # pragma: no cover - optional dependency
+    BaseLoader = object  # type: ignore
+    BytecodeCache = object  # type: ignore
+    bc_magic = b""
+    Environment = None  # type: ignore
+    FileSystemBytecodeCache = None  # type: ignore
+    FileSystemLoader = None  # type: ignore
+    TemplateNotFound = LookupError  # type: ignore
+
+from .assets import StaticBlob, StaticFile
+from .bundle import TemplateBundle, clear_bundle_cache, is_bundle, open_bundle
+from .dependencies import DependencyIndex, SourceHasher
+from .registry import METADATA_FILE
+from .tracing import span
+from .writer import FileContent, PendingContent
+
+# Cantidad de entornos (uno por directorio de template) que se mantienen en memoria
+ENVIRONMENT_CACHE_SIZE = 32
+
+# En modo auto (``jobs=None``) se usan procesos solo desde esta cantidad de
+# templates, y cada proceso recibe al menos ``PARALLEL_TEMPLATES_PER_JOB``:
+# con menos, arrancar el pool cuesta mas que el render
+PARALLEL_MIN_TEMPLATES = 64
+PARALLEL_TEMPLATES_PER_JOB = 16
+
+# Archivos ocultos del proyecto generado se guardan sin el punto en el template
+# (``dot-gitignore`` -> ``.gitignore``) para que git y el empaquetado no los
+# traten como propios
+DOTFILE_PREFIX = "dot-"
+
+
+def output_name(rel_name: str) -> str:
+    """Ruta generada para un archivo del template (sin ``.j2`` ni ``dot-``)"""
+    path = PurePosixPath(rel_name)
+    if path.suffix == ".j2":
+        path = path.with_suffix("")
+    if path.name.startswith(DOTFILE_PREFIX):
+        path = path.with_name("." + path.name[len(DOTFILE_PREFIX):])
+    return path.as_posix()
+
+
+def output_sources(files: Iterable[str]) -> Dict[str, List[str]]:
+    """Salida -> archivos del template que la generan (mas de uno es una colision)"""
+    sources: Dict[str, List[str]] = {}
+    for rel_name in files:
+        if rel_name != METADATA_FILE:
+            sources.setdefault(output_name(rel_name), []).append(rel_name)
+    return sources
+
+
+class BundleLoader(BaseLoader):
+    """Loader de Jinja que lee los sources del mmap de un bundle"""
+
+    def __init__(self, bundle: TemplateBundle):
+        self.bundle = bundle
+
+    def get_source(self, environment, template):
+        if template not in self.bundle:
+            raise TemplateNotFound(template)
+        # El bundle no cambia: si el archivo se reescribe se abre otro bundle
+        # y con el otro Environment
+        return self.bundle.text(template), f"{self.bundle.path}/{template}", lambda: True
+
+    def list_templates(self):
+        return sorted(self.bundle.files)
+
+
+class PackedBytecodeCache(BytecodeCache):
+    """Bytecode de todos los templates de un bundle en un solo archivo.
+
+    Con ``FileSystemBytecodeCache`` cargar un bundle seguiria abriendo un
+    archivo por template; aca se lee uno solo y se guarda con ``save`` despues
+    de compilar. Las entradas que no se usaron en la sesion se descartan.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._entries: Dict[str, Tuple[str, bytes]] = {}
+        self._used: set = set()
+        self._dirty = False
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            # bc_magic incluye la version de Python: el bytecode no es portable
+            if data.startswith(bc_magic):
+                self._entries = marshal.loads(data[len(bc_magic):])
+        except (OSError, EOFError, ValueError, TypeError):
+            self._entries = {}
+
+    def load_bytecode(self, bucket):
+        self._used.add(bucket.key)
+        entry = self._entries.get(bucket.key)
+        if entry is None or entry[0] != bucket.checksum:
+            return
+        try:
+            bucket.code = marshal.loads(entry[1])
+        except (EOFError, ValueError, TypeError):
+            bucket.reset()
+
+    def dump_bytecode(self, bucket):
+        self._used.add(bucket.key)
+        self._entries[bucket.key] = (bucket.checksum, marshal.dumps(bucket.code))
+        self._dirty = True
+
+    def clear(self):
+        self._entries = {}
+        self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        entries = {key: value for key, value in self._entries.items() if key in self._used}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(bc_magic + marshal.dumps(entries))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError:
+            # Es solo una cache: el proximo proceso recompila
+            pass
+
+
+def _bundle_for(template_dir: Union[str, Path]) -> Optional[TemplateBundle]:
+    return open_bundle(template_dir) if is_bundle(template_dir) else None
+
+
+@lru_cache(maxsize=ENVIRONMENT_CACHE_SIZE)
+def _cached_environment(
+    template_dir: str, bytecode_dir: Optional[str], bundle: Optional[TemplateBundle] = None
+) -> "Environment":
+    bytecode_cache = None
+    if bytecode_dir is not None and bundle is not None:
+        key = hashlib.sha1(template_dir.encode("utf-8")).hexdigest()[:16]
+        bytecode_cache = PackedBytecodeCache(Path(bytecode_dir) / f"bundle-{key}.bin")
+    elif bytecode_dir is not None:
+        Path(bytecode_dir).mkdir(parents=True, exist_ok=True)
+        # Jinja valida cada entrada contra el checksum del source, asi que un
+        # template modificado se recompila aunque exista bytecode viejo
+        bytecode_cache = FileSystemBytecodeCache(bytecode_dir)
+    return Environment(
+        loader=BundleLoader(bundle) if bundle is not None else FileSystemLoader(template_dir),
+        keep_trailing_newline=True,
+        bytecode_cache=bytecode_cache,
+    )
+
+
+def get_environment(
+    template_dir: Union[str, Path],
+    bytecode_dir: Optional[Union[str, Path]] = None,
+) -> "Environment":
+    """Devolver el Environment de un directorio de templates o de un bundle.
+
+    Los entornos se reutilizan dentro del proceso (LRU por directorio), de modo
+    que los templates ya compilados no se vuelven a parsear. Si se indica
+    ``bytecode_dir`` el bytecode compilado tambien se persiste en disco para
+    los procesos siguientes.
+    """
+    if Environment is None:
+        raise RuntimeError("jinja2 es necesario para renderizar templates")
+    return _cached_environment(
+        str(Path(template_dir).resolve()),
+        str(bytecode_dir) if bytecode_dir is not None else None,
+        _bundle_for(template_dir),
+    )
+
+
+def clear_environment_cache():
+    """Descartar los entornos, templates compilados y bundles cacheados en memoria"""
+    _cached_environment.cache_clear()
+    _compiled_templates.cache_clear()
+    clear_bundle_cache()
+
+
+@lru_cache(maxsize=ENVIRONMENT_CACHE_SIZE)
+def _compiled_templates(
+    template_dir: str,
+    bytecode_dir: Optional[str],
+    fingerprint: str,
+    names: Tuple[str, ...],
+    bundle: Optional[TemplateBundle] = None,
+) -> Dict[str, Any]:
+    env = _cached_environment(template_dir, bytecode_dir, bundle)
+    compiled = {name: env.get_template(name) for name in names}
+    if isinstance(env.bytecode_cache, PackedBytecodeCache):
+        env.bytecode_cache.save()
+    return compiled
+
+
+def compile_directory(
+    template_dir: Union[str, Path],
+    files: Mapping[str, str],
+    bytecode_dir: Optional[Union[str, Path]] = None,
+) -> Dict[str, Any]:
+    """Templates ``.j2`` de un directorio ya compilados, por nombre.
+
+    ``files`` es el mapping ruta -> sha256 del registro de templates: su hash
+    (que incluye ``template.yml`` y por lo tanto la version) identifica la
+    compilacion, asi que mientras el template no cambie renderizar es solo
+    llamar al codigo compilado, sin lookup en el loader de Jinja. Igual se
+    hace el chequeo ``uptodate`` de Jinja (un stat por template): un ``.j2``
+    editado en el lugar se recompila aunque ``files`` traiga el hash viejo.
+    """
+    if Environment is None:
+        raise RuntimeError("jinja2 es necesario para renderizar templates")
+    fingerprint = hashlib.sha256(repr(sorted(files.items())).encode("utf-8")).hexdigest()
+    names = tuple(sorted(name for name in files if name.endswith(".j2")))
+    template_dir = str(Path(template_dir).resolve())
+    bytecode_dir = str(bytecode_dir) if bytecode_dir is not None else None
+    bundle = _bundle_for(template_dir)
+    compiled = _compiled_templates(template_dir, bytecode_dir, fingerprint, names, bundle)
+    stale = [name for name, template in compiled.items() if not template.is_up_to_date]
+    if stale:
+        env = _cached_environment(template_dir, bytecode_dir, bundle)
+        for name in stale:
+            compiled[name] = env.get_template(name)
+    return compiled
+
+
+def render_jobs(templates: int, jobs: Optional[int] = None) -> int:
+    """Procesos para renderizar ``templates`` archivos (``jobs=None``: automatico)"""
+    if jobs is None:
+        if templates < PARALLEL_MIN_TEMPLATES:
+            return 1
+        jobs = min(os.cpu_count() or 1, templates // PARALLEL_TEMPLATES_PER_JOB)
+    return max(1, min(jobs, templates))
+
+
+# Estado por proceso del pool de render: templates compilados y contexto se
+# cargan una vez por worker
+_render_worker: Dict[str, Any] = {}
+
+
+def _init_render_worker(
+    template_dir: str, bytecode_dir: Optional[str], files: Optional[Mapping[str, str]], context: Mapping[str, Any]
+):
+    _render_worker.update(
+        env=get_environment(template_dir, bytecode_dir),
+        compiled=compile_directory(template_dir, files, bytecode_dir) if files else {},
+        context=context,
+    )
+
+
+def _render_chunk(names: Sequence[str]) -> List[Union[str, Exception]]:
+    env, compiled, context = _render_worker["env"], _render_worker["compiled"], _render_worker["context"]
+    rendered: List[Union[str, Exception]] = []
+    for name in names:
+        try:
+            template = compiled.get(name) or env.get_template(name)
+            rendered.append(template.render(**context))
+        except Exception as e:
+            # Las excepciones de Jinja no siempre se pueden picklear
+            rendered.append(RuntimeError(f"{name}: {type(e).__name__}: {e}"))
+    return rendered
+
+
+def _render_parallel(
+    template_dir: Path,
+    bytecode_dir: Optional[Union[str, Path]],
+    files: Optional[Mapping[str, str]],
+    context: Mapping[str, Any],
+    names: Sequence[str],
+    jobs: int,
+) -> Optional[List[PendingContent]]:
+    """Repartir ``names`` en ``jobs`` procesos; None si no se puede crear el pool.
+
+    Los templates se reparten en bloques consecutivos (varios por proceso) y
+    cada archivo queda como un ``PendingContent`` que el writer espera en su
+    propio hilo, asi la escritura empieza con el primer bloque terminado.
+    """
+    initargs = (str(template_dir), str(bytecode_dir) if bytecode_dir is not None else None, files, dict(context))
+    try:
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_render_worker, initargs=initargs)
+    except (OSError, NotImplementedError):
+        return None
+    size = max(1, -(-len(names) // (jobs * 4)))
+    pending: List[PendingContent] = []
+    try:
+        for start in range(0, len(names), size):
+            future = pool.submit(_render_chunk, names[start:start + size])
+            pending.extend(PendingContent(future, index) for index in range(len(names[start:start + size])))
+    finally:
+        # Los bloques ya enviados terminan igual; los workers salen despues
+        pool.shutdown(wait=False)
+    return pending
+
+
+@dataclass
+class RenderResult:
+    """Archivos renderizados de un directorio de templates"""
+
+    files: Dict[str, FileContent] = field(default_factory=dict)
+    reused: List[str] = field(default_factory=list)
+    dependencies: DependencyIndex = field(default_factory=DependencyIndex)
+
+
+def render_directory(
+    template_dir: Union[str, Path],
+    context: Mapping[str, Any],
+    bytecode_dir: Optional[Union[str, Path]] = None,
+    previous: Optional[DependencyIndex] = None,
+    files: Optional[Union[Iterable[str], Mapping[str, str]]] = None,
+    stream: bool = False,
+    track_dependencies: bool = True,
+    jobs: Optional[int] = 1,
+) -> RenderResult:
+    """Renderizar los ``.j2`` de un template y copiar el resto de archivos.
+
+    Con un indice ``previous`` los templates cuyas entradas (sources de
+    template, include/extends/import y claves de contexto leidas) no cambiaron
+    no se renderizan: su salida queda en ``reused``.
+
+    ``files`` (rutas relativas, p.ej. del registro de templates) evita recorrer
+    el directorio; si es un mapping ruta -> sha256 esos hashes se reutilizan
+    para los archivos estaticos, asi que deben ser los del contenido actual
+    (como los de ``TemplateRegistry.get``, revalidados con el stat de cada
+    archivo): el writer incremental no reescribe un estatico cuyo hash no
+    cambio. Los archivos que no son ``.j2`` se devuelven
+    como ``StaticFile`` y se copian byte a byte, sin decodificar. Si
+    ``template_dir`` es un bundle (``.feb``) los estaticos son ``StaticBlob``
+    que se escriben directo desde el mmap.
+
+    Con ``stream=True`` el contenido de cada ``.j2`` es el generador de
+    ``Template.generate()``: el render ocurre mientras el writer escribe, chunk
+    a chunk, y el proyecto nunca esta completo en memoria.
+
+    ``template.yml`` no se copia al proyecto. Sin ``track_dependencies`` no se
+    arma el indice de dependencias (render repetido de un mismo template).
+
+    Con ``jobs`` > 1 (o None, automatico segun la cantidad de templates) los
+    ``.j2`` se renderizan en un pool de procesos y su contenido es un
+    ``PendingContent``. El resultado es identico al render en serie.
+    """
+    template_dir = Path(template_dir)
+    bundle = _bundle_for(template_dir)
+    env = get_environment(template_dir, bytecode_dir)
+    hasher = SourceHasher(env)
+    result = RenderResult()
+
+    if files is None:
+        if bundle is not None:
+            files = bundle.files
+        else:
+            files = (p.relative_to(template_dir).as_posix() for p in template_dir.rglob("*") if p.is_file())
+    digests = files if isinstance(files, Mapping) else {}
+    with span("render.compile"):
+        compiled = compile_directory(template_dir, files, bytecode_dir) if digests else {}
+
+    names = sorted(files)
+    jobs = render_jobs(sum(1 for name in names if name.endswith(".j2")), jobs)
+    parallel: List[Tuple[str, str]] = []
+
+    for rel_name in names:
+        if rel_name == METADATA_FILE:
+            continue
+        output = output_name(rel_name)
+        if not rel_name.endswith(".j2"):
+            if bundle is not None:
+                result.files[output] = StaticBlob(bundle.read(rel_name), digests.get(rel_name))
+            else:
+                result.files[output] = StaticFile(template_dir / rel_name, digests.get(rel_name))
+            continue
+
+        if previous is not None and previous.is_fresh(output, hasher, context):
+            result.dependencies.records[output] = previous.records[output]
+            result.reused.append(output)
+            continue
+        if jobs > 1:
+            # Se reserva el lugar para conservar el orden de ``files``
+            result.files[output] = None
+            parallel.append((output, rel_name))
+        else:
+            template = compiled.get(rel_name) or env.get_template(rel_name)
+            result.files[output] = template.generate(**context) if stream else template.render(**context)
+        if track_dependencies:
+            result.dependencies.record_template(output, rel_name, hasher, context)
+
+    if parallel:
+        pending = None
+        if len(parallel) > 1:
+            names = [rel_name for _, rel_name in parallel]
+            pending = _render_parallel(template_dir, bytecode_dir, digests or None, context, names, min(jobs, len(names)))
+        for index, (output, rel_name) in enumerate(parallel):
+            if pending is not None:
+                result.files[output] = pending[index]
+            else:
+                template = compiled.get(rel_name) or env.get_template(rel_name)
+                result.files[output] = template.generate(**context) if stream else template.render(**context)
+
+    return result
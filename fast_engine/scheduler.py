@@ -0,0 +1,256 @@
+"""Scheduler de requests LLM: rate limits, concurrencia y presupuesto de tokens.
+
+Cada proveedor tiene dos token buckets (requests y tokens por minuto) y un
+tope de requests simultaneas; las requests que no entran esperan en cola en
+vez de chocar contra el 429 del proveedor y caer en reintentos. El
+presupuesto de tokens es por proyecto: una vez agotado las requests nuevas
+fallan con ``BudgetExceeded``. ``stats`` expone profundidad de cola y tiempos
+de espera por proveedor.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
+
+from .providers import LLMProvider
+from .tracing import span
+
+
+def estimate_tokens(text: str) -> int:
+    """Aproximacion de tokens (~4 caracteres por token)"""
+    return (len(text) + 3) // 4
+
+
+class BudgetExceeded(Exception):
+    """El proyecto agoto su presupuesto de tokens"""
+
+
+class TokenBucket:
+    """Token bucket que se rellena a ``rate`` tokens por segundo hasta ``capacity``.
+
+    ``consume`` descuenta sin esperar (puede dejar el balance negativo), para
+    cobrar los tokens de salida que se conocen recien al terminar la request.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate debe ser positivo")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def per_minute(cls, amount: float) -> "TokenBucket":
+        return cls(amount / 60.0, amount)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+    async def acquire(self, amount: float = 1.0):
+        """Esperar hasta poder tomar ``amount`` tokens (en orden de llegada)"""
+        amount = min(amount, self.capacity)
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock, self._loop = asyncio.Lock(), loop
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+@dataclass
+class ProviderLimits:
+    """Limites de un proveedor (None = sin limite)"""
+
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    max_concurrency: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, float]) -> "ProviderLimits":
+        return cls(
+            requests_per_minute=data.get("requests_per_minute"),
+            tokens_per_minute=data.get("tokens_per_minute"),
+            max_concurrency=int(data["max_concurrency"]) if data.get("max_concurrency") else None,
+        )
+
+
+@dataclass
+class SchedulerStats:
+    """Metricas de cola de un proveedor.
+
+    ``queued`` cuenta las requests en admision (esperando semaforo o bucket),
+    incluida la que se esta admitiendo; ``max_queue_depth`` es su maximo.
+    """
+
+    requests: int = 0
+    tokens: int = 0
+    queued: int = 0
+    max_queue_depth: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
+class TokenBudget:
+    """Presupuesto de tokens de un proyecto"""
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.used = 0
+
+    @property
+    def remaining(self) -> Optional[int]:
+        return None if self.limit is None else max(0, self.limit - self.used)
+
+    def check(self, estimated: int):
+        if self.limit is not None and self.used + estimated > self.limit:
+            raise BudgetExceeded(
+                f"Presupuesto de tokens agotado: usados {self.used} de {self.limit}, "
+                f"la request necesita ~{estimated}"
+            )
+
+    def charge(self, tokens: int):
+        self.used += tokens
+
+
+class _ProviderState:
+    def __init__(self, limits: ProviderLimits):
+        self.limits = limits
+        self.requests = TokenBucket.per_minute(limits.requests_per_minute) if limits.requests_per_minute else None
+        self.tokens = TokenBucket.per_minute(limits.tokens_per_minute) if limits.tokens_per_minute else None
+        self.stats = SchedulerStats()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def semaphore(self) -> Optional[asyncio.Semaphore]:
+        if not self.limits.max_concurrency:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore, self._loop = asyncio.Semaphore(self.limits.max_concurrency), loop
+        return self._semaphore
+
+
+class RequestScheduler:
+    """Admision de requests por proveedor, compartida por todas las generaciones.
+
+    Solo encola: una request espera a su proveedor aunque otro tenga
+    capacidad libre. No hay ruteo a otro proveedor a proposito, porque cada
+    etapa elige su modelo y cambiarlo cambiaria el proyecto generado.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, ProviderLimits]] = None):
+        self.limits = dict(limits or {})
+        self._states: Dict[str, _ProviderState] = {}
+
+    @classmethod
+    def from_config(cls, config) -> "RequestScheduler":
+        rate_limits = getattr(config, "rate_limits", None) or {}
+        return cls({name: ProviderLimits.from_dict(data) for name, data in rate_limits.items()})
+
+    def _state(self, provider: str) -> _ProviderState:
+        if provider not in self._states:
+            self._states[provider] = _ProviderState(self.limits.get(provider, ProviderLimits()))
+        return self._states[provider]
+
+    @property
+    def stats(self) -> Dict[str, SchedulerStats]:
+        return {name: state.stats for name, state in self._states.items()}
+
+    async def acquire(self, provider: str, estimated_tokens: int, budget: Optional[TokenBudget] = None):
+        """Esperar turno para una request; devuelve el semaforo tomado (o None)"""
+        if budget is not None:
+            budget.check(estimated_tokens)
+        state = self._state(provider)
+        stats = state.stats
+        stats.queued += 1
+        stats.max_queue_depth = max(stats.max_queue_depth, stats.queued)
+        start = time.monotonic()
+        semaphore = state.semaphore()
+        try:
+            if semaphore is not None:
+                await semaphore.acquire()
+            try:
+                if state.requests is not None:
+                    await state.requests.acquire(1)
+                if state.tokens is not None:
+                    await state.tokens.acquire(estimated_tokens)
+            except BaseException:
+                if semaphore is not None:
+                    semaphore.release()
+                raise
+        finally:
+            stats.queued -= 1
+        wait = time.monotonic() - start
+        stats.requests += 1
+        stats.total_wait += wait
+        stats.max_wait = max(stats.max_wait, wait)
+        return semaphore
+
+    def release(self, provider: str, semaphore, tokens: int, estimated_tokens: int, budget: Optional[TokenBudget] = None):
+        """Cobrar los tokens reales (la diferencia con lo estimado) y liberar el turno"""
+        state = self._state(provider)
+        state.stats.tokens += tokens
+        if state.tokens is not None and tokens > estimated_tokens:
+            state.tokens.consume(tokens - estimated_tokens)
+        if budget is not None:
+            budget.charge(tokens)
+        if semaphore is not None:
+            semaphore.release()
+
+
+class ScheduledProvider(LLMProvider):
+    """Proveedor que pasa por el scheduler antes de cada request"""
+
+    def __init__(self, provider: LLMProvider, scheduler: RequestScheduler, budget: Optional[TokenBudget] = None):
+        self.provider = provider
+        self.scheduler = scheduler
+        self.budget = budget
+        self.name = provider.name
+        self.label = provider.label
+        self.model = provider.model
+
+    async def complete(self, prompt: str, model: Optional[str] = None) -> str:
+        estimated = estimate_tokens(prompt)
+        with span("llm.queue", provider=self.name):
+            semaphore = await self.scheduler.acquire(self.name, estimated, self.budget)
+        response = ""
+        try:
+            with span("llm.call", provider=self.name):
+                response = await self.provider.complete(prompt, model)
+            return response
+        finally:
+            self.scheduler.release(self.name, semaphore, estimated + estimate_tokens(response), estimated, self.budget)
+
+    async def stream(self, prompt: str, model: Optional[str] = None) -> AsyncIterator[str]:
+        estimated = estimate_tokens(prompt)
+        with span("llm.queue", provider=self.name):
+            semaphore = await self.scheduler.acquire(self.name, estimated, self.budget)
+        size = 0
+        try:
+            async for chunk in self.provider.stream(prompt, model):
+                size += len(chunk)
+                yield chunk
+        finally:
+            output = (size + 3) // 4
+            self.scheduler.release(self.name, semaphore, estimated + output, estimated, self.budget)
+
+    async def close(self):
+        await self.provider.close()
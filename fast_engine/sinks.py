@@ -0,0 +1,226 @@
+"""Destinos de salida de un proyecto generado.
+
+Un sink tiene la misma interfaz que ``ProjectWriter`` (el sink de
+filesystem): ``write_all(files)`` consume los archivos, incluso en streaming,
+y devuelve un ``WriteReport``. Ademas de escribir a disco se puede generar
+un archivo tar, tar.gz o zip directo a un file-like (stdout, un socket, un
+``BytesIO``) o juntar el proyecto en memoria, sin arbol temporal en disco.
+"""
+
+import contextlib
+import os
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Mapping, Optional, Union
+
+from .assets import StaticBlob, StaticFile
+from .writer import FileContent, FileItems, PendingContent, WriteReport
+
+ARCHIVE_FORMATS = ("tar", "tar.gz", "zip")
+CONTENT_TYPES = {"tar": "application/x-tar", "tar.gz": "application/gzip", "zip": "application/zip"}
+_TAR_MODES = {"tar": "w|", "tar.gz": "w|gz"}
+_SUFFIXES = {".tar": "tar", ".tgz": "tar.gz", ".tar.gz": "tar.gz", ".zip": "zip"}
+
+# Los archivos renderizados en streaming se juntan en memoria hasta este
+# tamano antes de pasar a un temporal (tar necesita el tamano antes del contenido)
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+_CHUNK_SIZE = 1 << 20
+
+
+def archive_format(path: Union[str, Path]) -> Optional[str]:
+    """Formato de archivo segun la extension de ``path`` (None si no es un archivo comprimido)"""
+    name = str(path).lower()
+    for suffix in sorted(_SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix):
+            return _SUFFIXES[suffix]
+    return None
+
+
+def iter_bytes(content: FileContent) -> Iterator[Union[bytes, memoryview]]:
+    """Contenido de un archivo como chunks binarios"""
+    if isinstance(content, PendingContent):
+        content = content.result()
+    if isinstance(content, StaticFile):
+        with open(content.path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                yield chunk
+    elif isinstance(content, StaticBlob):
+        yield content.data
+    elif isinstance(content, (bytes, memoryview)):
+        yield content
+    elif isinstance(content, str):
+        yield content.encode("utf-8")
+    else:
+        for chunk in content:
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+
+class _BufferReader:
+    """``read`` secuencial sobre un buffer, sin copiarlo entero"""
+
+    def __init__(self, data: Union[bytes, memoryview]):
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._pos + size)
+        chunk = bytes(self._view[self._pos:end])
+        self._pos = end
+        return chunk
+
+
+class OutputSink:
+    """Base de los sinks que no escriben a disco.
+
+    No son incrementales: ``keep`` y ``dependencies`` se ignoran y todos los
+    archivos se emiten siempre.
+    """
+
+    incremental = False
+
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix.strip("/")
+        self.root = Path(self.prefix or ".")
+
+    def write_all(
+        self,
+        files: FileItems,
+        keep: Iterable[str] = (),
+        dependencies: Optional[Dict[str, Any]] = None,
+    ) -> WriteReport:
+        start = time.perf_counter()
+        report = WriteReport(root=self.root)
+        items = files.items() if isinstance(files, Mapping) else files
+        with self._session():
+            for rel_path, content in items:
+                try:
+                    self._add(rel_path, content)
+                except Exception as e:
+                    report.failed[rel_path] = str(e)
+                else:
+                    report.written.append(rel_path)
+                    report.added.append(rel_path)
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _name(self, rel_path: str) -> str:
+        path = PurePosixPath(self.prefix, rel_path) if self.prefix else PurePosixPath(rel_path)
+        if path.is_absolute() or ".." in path.parts:
+            raise ValueError(f"Ruta fuera del proyecto: {rel_path}")
+        return path.as_posix()
+
+    @contextlib.contextmanager
+    def _session(self) -> Iterator[None]:
+        yield
+
+    def _add(self, rel_path: str, content: FileContent):
+        raise NotImplementedError
+
+
+class MemorySink(OutputSink):
+    """Junta el proyecto en ``files`` (ruta -> bytes)"""
+
+    def __init__(self, prefix: str = ""):
+        super().__init__(prefix)
+        self.files: Dict[str, bytes] = {}
+
+    def _add(self, rel_path: str, content: FileContent):
+        self.files[self._name(rel_path)] = b"".join(bytes(chunk) for chunk in iter_bytes(content))
+
+
+class ArchiveSink(OutputSink):
+    """Escribe el proyecto como tar, tar.gz o zip en ``fileobj``.
+
+    El archivo se arma en modo stream (``fileobj`` no necesita ``seek``, puede
+    ser ``sys.stdout.buffer``) y se cierra al final de ``write_all``; ``fileobj``
+    queda abierto. ``prefix`` es el directorio raiz dentro del archivo.
+    """
+
+    def __init__(self, fileobj: BinaryIO, format: str = "tar.gz", prefix: str = "", mtime: Optional[float] = None):
+        if format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Formato invalido: {format} (opciones: {', '.join(ARCHIVE_FORMATS)})")
+        super().__init__(prefix)
+        self.fileobj = fileobj
+        self.format = format
+        self.mtime = time.time() if mtime is None else mtime
+        self._archive: Any = None
+
+    @contextlib.contextmanager
+    def _session(self) -> Iterator[None]:
+        if self.format == "zip":
+            self._archive = zipfile.ZipFile(self.fileobj, "w", compression=zipfile.ZIP_DEFLATED)
+        else:
+            self._archive = tarfile.open(fileobj=self.fileobj, mode=_TAR_MODES[self.format])
+        try:
+            yield
+        finally:
+            self._archive.close()
+            self._archive = None
+
+    def _add(self, rel_path: str, content: FileContent):
+        name = self._name(rel_path)
+        if isinstance(content, PendingContent):
+            content = content.result()
+        mode = os.stat(content.path).st_mode & 0o777 if isinstance(content, StaticFile) else 0o644
+        if self.format == "zip":
+            info = zipfile.ZipInfo(name, date_time=time.localtime(max(self.mtime, 315532800))[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = (0o100000 | mode) << 16
+            with self._archive.open(info, "w", force_zip64=True) as dest:
+                for chunk in iter_bytes(content):
+                    dest.write(chunk)
+            return
+
+        info = tarfile.TarInfo(name)
+        info.mtime = int(self.mtime)
+        info.mode = mode
+        if isinstance(content, StaticFile):
+            info.size = os.stat(content.path).st_size
+            with open(content.path, "rb") as f:
+                self._archive.addfile(info, f)
+        elif isinstance(content, (str, bytes, memoryview, StaticBlob)):
+            data = content.data if isinstance(content, StaticBlob) else content
+            data = data.encode("utf-8") if isinstance(data, str) else data
+            info.size = len(memoryview(data).cast("B"))
+            self._archive.addfile(info, _BufferReader(data))
+        else:
+            # tar necesita el tamano antes del contenido: el archivo renderizado
+            # se junta aparte (en memoria salvo que sea grande)
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+                for chunk in iter_bytes(content):
+                    spool.write(chunk)
+                info.size = spool.tell()
+                spool.seek(0)
+                self._archive.addfile(info, spool)
+
+
+@contextlib.contextmanager
+def open_archive(output: Union[str, Path], format: Optional[str] = None, prefix: str = "") -> Iterator[ArchiveSink]:
+    """``ArchiveSink`` hacia ``output``: ``"-"`` es stdout, si no un archivo.
+
+    El formato sale de la extension si no se indica. El archivo se escribe a
+    un temporal y se renombra al terminar, asi nunca queda uno a medio escribir.
+    """
+    if str(output) == "-":
+        sink = ArchiveSink(sys.stdout.buffer, format or "tar.gz", prefix)
+        yield sink
+        sink.fileobj.flush()
+        return
+    path = Path(output)
+    format = format or archive_format(path)
+    if format is None:
+        raise ValueError(f"No se puede deducir el formato de {path} (use .tar, .tar.gz, .tgz o .zip)")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            yield ArchiveSink(f, format, prefix)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
@@ -0,0 +1,176 @@
+"""Consumo en streaming de respuestas LLM que contienen varios archivos.
+
+El modelo devuelve los archivos delimitados asi::
+
+    === FILE: app/models.py ===
+    ...contenido...
+    === END FILE ===
+
+``FileStreamParser`` detecta los limites a medida que llegan los fragmentos y
+entrega cada archivo apenas se cierra; ``FileChannel`` los pasa a un
+``ProjectWriter`` que escribe en otro hilo mientras la generacion sigue.
+"""
+
+import asyncio
+import contextvars
+import queue
+import threading
+from pathlib import PurePosixPath
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .sinks import OutputSink
+from .utils import logger
+from .writer import FileContent, ProjectWriter, WriteReport
+
+# Directorio de los archivos de un LLM que chocan con otra salida del proyecto
+GENERATED_DIR = "generated"
+
+FILE_START = "=== FILE:"
+FILE_END = "=== END FILE ==="
+
+FILE_FORMAT_INSTRUCTIONS = (
+    "Devuelve cada archivo completo delimitado por una linea "
+    f"'{FILE_START} <ruta relativa> ===' y una linea '{FILE_END}', sin texto adicional."
+)
+
+
+def _safe_path(path: str) -> Optional[str]:
+    """Ruta relativa normalizada, o None si sale del proyecto"""
+    parts = [p for p in PurePosixPath(path.strip().replace("\\", "/")).parts if p not in ("", ".")]
+    if not parts or parts[0] == "/" or ".." in parts:
+        return None
+    return "/".join(parts)
+
+
+class FileStreamParser:
+    """Separa en archivos un texto que llega en fragmentos arbitrarios"""
+
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+        self._buffer = ""
+        self._path: Optional[str] = None
+        self._lines: List[str] = []
+
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        """Agregar texto y devolver los archivos que quedaron completos"""
+        self._buffer += text
+        done: List[Tuple[str, str]] = []
+        while True:
+            newline = self._buffer.find("\n")
+            if newline < 0:
+                break
+            line, self._buffer = self._buffer[: newline + 1], self._buffer[newline + 1:]
+            self._line(line, done)
+        return done
+
+    def close(self) -> List[Tuple[str, str]]:
+        """Procesar el resto del texto; un archivo sin cierre se entrega igual"""
+        done: List[Tuple[str, str]] = []
+        if self._buffer:
+            line, self._buffer = self._buffer, ""
+            self._line(line, done)
+        if self._path is not None:
+            logger.warning(f"Archivo sin '{FILE_END}': {self._path}")
+            self._emit(done)
+        return done
+
+    def _line(self, line: str, done: List[Tuple[str, str]]):
+        stripped = line.strip()
+        if stripped.startswith(FILE_START) and stripped.endswith("==="):
+            if self._path is not None:
+                self._emit(done)
+            path = _safe_path(stripped[len(FILE_START):-3])
+            if path is None:
+                logger.warning(f"Ruta de archivo invalida en la respuesta: {stripped}")
+            self._path = path
+            self._lines = []
+        elif stripped == FILE_END:
+            if self._path is not None:
+                self._emit(done)
+            self._path = None
+        elif self._path is not None:
+            self._lines.append(line)
+
+    def _emit(self, done: List[Tuple[str, str]]):
+        done.append((self.prefix + self._path, "".join(self._lines)))
+        self._path = None
+        self._lines = []
+
+
+async def stream_files(chunks: AsyncIterable[str], prefix: str = "") -> AsyncIterator[Tuple[str, str]]:
+    """Archivos completos de una respuesta en streaming, en orden de llegada"""
+    parser = FileStreamParser(prefix)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
+
+
+_CLOSED = object()
+
+
+class FileChannel:
+    """Cola de archivos entre productores async y un ``ProjectWriter``.
+
+    ``put`` no bloquea el event loop y se puede llamar desde otros hilos; el
+    writer consume el canal como un iterable comun desde un hilo y termina
+    cuando se llama a ``close``.
+
+    Cada ruta se emite una sola vez. Las salidas del template se apartan con
+    ``reserve`` antes de que empiecen los LLM, asi ``put_generated`` manda un
+    archivo que choca bajo ``GENERATED_DIR`` sin importar quien termina antes.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._names: Set[str] = set()
+        self._reserved: Set[str] = set()
+        self.count = 0
+
+    def reserve(self, paths: Iterable[str]):
+        """Apartar rutas que solo se emiten con ``put`` (las salidas del template)"""
+        with self._lock:
+            self._reserved.update(paths)
+
+    def put(self, rel_path: str, content: FileContent):
+        with self._lock:
+            self._claim(rel_path)
+        self._queue.put((rel_path, content))
+
+    def put_generated(self, rel_path: str, content: FileContent) -> str:
+        """Emitir un archivo de un LLM; devuelve la ruta con la que se escribe"""
+        with self._lock:
+            if rel_path in self._reserved or rel_path in self._names:
+                logger.warning(f"{rel_path} ya es una salida del proyecto, se escribe en {GENERATED_DIR}/{rel_path}")
+                rel_path = f"{GENERATED_DIR}/{rel_path}"
+                if rel_path in self._reserved:
+                    raise ValueError(f"Archivo generado en conflicto con el template: {rel_path}")
+            self._claim(rel_path)
+        self._queue.put((rel_path, content))
+        return rel_path
+
+    def _claim(self, rel_path: str):
+        if rel_path in self._names:
+            raise ValueError(f"Archivo emitido dos veces: {rel_path}")
+        self._names.add(rel_path)
+        self.count += 1
+
+    def close(self):
+        self._queue.put(_CLOSED)
+
+    def __iter__(self) -> Iterator[Tuple[str, FileContent]]:
+        while True:
+            item = self._queue.get()
+            if item is _CLOSED:
+                return
+            yield item
+
+
+async def write_channel(writer: Union[ProjectWriter, OutputSink], channel: FileChannel) -> WriteReport:
+    """Escribir en un hilo todo lo que llegue al canal hasta que se cierre"""
+    loop = asyncio.get_running_loop()
+    # El hilo hereda el contexto (spans de tracing, salida capturada por el daemon)
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(None, context.run, writer.write_all, channel)
@@ -0,0 +1,193 @@
+"""Spans y timers livianos para ver en que se va el tiempo de una generacion.
+
+``span("render")`` mide un bloque solo si hay un ``Tracer`` activo; si no,
+devuelve un context manager vacio compartido y el costo es una lectura de
+variable global. Los spans anidados (tambien entre tareas asyncio, via
+contextvars) quedan con su profundidad para el resumen por fase, y se pueden
+exportar en formato Chrome trace (``chrome://tracing`` / Perfetto).
+"""
+
+import contextlib
+import contextvars
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+_NOOP = contextlib.nullcontext()
+_active: Optional["Tracer"] = None
+_depth: contextvars.ContextVar = contextvars.ContextVar("fast_engine_span_depth", default=0)
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    start: float
+    end: float
+    depth: int
+    lane: int
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def _lane() -> int:
+    """Carril del span: la tarea asyncio actual o el hilo"""
+    try:
+        import asyncio
+
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+class Tracer:
+    """Acumula los spans de una sesion"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.end: Optional[float] = None
+        self.spans: List[SpanRecord] = []
+
+    @contextlib.contextmanager
+    def span(self, name: str, attrs: Dict[str, Any]) -> Iterator[None]:
+        depth = _depth.get()
+        token = _depth.set(depth + 1)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            _depth.reset(token)
+            self.spans.append(SpanRecord(name, start - self.origin, end - self.origin, depth, _lane(), attrs))
+
+    @property
+    def wall_time(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return end - self.origin
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Tiempo total y cantidad por fase, en orden de aparicion"""
+        phases: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        for record in sorted(self.spans, key=lambda r: r.start):
+            key = (record.depth, record.name)
+            phase = phases.setdefault(key, {"name": record.name, "depth": record.depth, "count": 0, "total": 0.0})
+            phase["count"] += 1
+            phase["total"] += record.duration
+        return list(phases.values())
+
+    def format_summary(self) -> str:
+        wall = self.wall_time or 1e-9
+        lines = [f"{'Fase':<36} {'n':>5} {'total':>10} {'%':>6}"]
+        for phase in self.summary():
+            label = "  " * phase["depth"] + phase["name"]
+            lines.append(
+                f"{label:<36} {phase['count']:>5} {phase['total'] * 1000:>8.1f}ms {phase['total'] / wall:>6.1%}"
+            )
+        lines.append(f"{'total':<36} {'':>5} {wall * 1000:>8.1f}ms")
+        return "\n".join(lines)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        lanes: Dict[int, int] = {}
+        events = []
+        for record in self.spans:
+            tid = lanes.setdefault(record.lane, len(lanes) + 1)
+            events.append({
+                "name": record.name,
+                "ph": "X",
+                "ts": record.start * 1e6,
+                "dur": record.duration * 1e6,
+                "pid": 1,
+                "tid": tid,
+                "args": {k: str(v) for k, v in record.attrs.items()},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Union[str, Path]):
+        Path(path).write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+
+
+def span(name: str, **attrs: Any):
+    """Medir un bloque: ``with span("write", files=n): ...``"""
+    tracer = _active
+    if tracer is None:
+        return _NOOP
+    return tracer.span(name, attrs)
+
+
+def traced(name: str) -> Callable:
+    """Decorador equivalente a envolver la funcion en ``span(name)``"""
+
+    def decorator(func: Callable) -> Callable:
+        import functools
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with _active.span(name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def active_tracer() -> Optional[Tracer]:
+    return _active
+
+
+@contextlib.contextmanager
+def tracing(enabled: bool = True) -> Iterator[Optional[Tracer]]:
+    """Activar un ``Tracer`` durante el bloque (``enabled=False`` no hace nada)"""
+    global _active
+    if not enabled:
+        yield None
+        return
+    previous, tracer = _active, Tracer()
+    _active = tracer
+    try:
+        yield tracer
+    finally:
+        tracer.end = time.perf_counter()
+        _active = previous
+
+
+@contextlib.contextmanager
+def profile_session(
+    enabled: bool,
+    output: Optional[Union[str, Path]] = None,
+    echo: Callable[[str], None] = print,
+) -> Iterator[Optional[Tracer]]:
+    """Sesion de ``--profile``: resumen por fase al terminar y, si se indica
+    ``output``, un Chrome trace (``.json``) o estadisticas de cProfile (otra
+    extension, legibles con ``pstats``)."""
+    if not enabled:
+        yield None
+        return
+    profiler = None
+    if output is not None and Path(output).suffix != ".json":
+        import cProfile
+
+        profiler = cProfile.Profile()
+    with tracing() as tracer:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield tracer
+        finally:
+            if profiler is not None:
+                profiler.disable()
+    echo(tracer.format_summary())
+    if output is not None:
+        if profiler is not None:
+            profiler.dump_stats(str(output))
+        else:
+            tracer.write_chrome_trace(output)
+        echo(f"Perfil guardado en {output}")
@@ -1,9 +1,9 @@
 import asyncio
 import logging
-from typing import Any, Callable, TypeVar
+import random
+from typing import Any, Callable, Optional, TypeVar
 from pathlib import Path
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
@@ -13,20 +13,33 @@ async def retry_async(
     max_retries: int = 3, 
     delay: float = 1.0,
     *args, 
+    jitter: float = 0.0,
+    retry_if: Optional[Callable[[Exception], bool]] = None,
     **kwargs
 ) -> T:
-    """Retry funcion async con delay exponencial"""
+    """Retry funcion async con delay exponencial.
+
+    ``jitter`` (0 a 1) reduce aleatoriamente cada espera hasta esa fraccion,
+    para que muchos clientes fallando a la vez no reintenten sincronizados.
+    ``retry_if`` decide si un error es reintentable (por defecto, todos).
+    """
     for attempt in range(max_retries):
         try:
             return await func(*args, **kwargs)
         except Exception as e:
-            if attempt == max_retries - 1:
+            if attempt == max_retries - 1 or (retry_if is not None and not retry_if(e)):
                 raise e
             
             wait_time = delay * (2 ** attempt)
-            logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s...")
+            if jitter:
+                wait_time *= 1 - random.uniform(0, min(jitter, 1.0))
+            logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {wait_time:.2f}s...")
             await asyncio.sleep(wait_time)
 
+def configure_logging(level: int = logging.INFO):
+    """Configurar logging para la CLI (no se hace al importar el paquete)"""
+    logging.basicConfig(level=level)
+
 def ensure_directory(path: Path):
     """Crear directorio si no existe"""
     path.mkdir(parents=True, exist_ok=True)
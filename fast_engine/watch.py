@@ -0,0 +1,309 @@
+"""Modo watch: mantener un proyecto generado al dia mientras se edita su template.
+
+``LiveProject`` genera el proyecto una vez y despues, por cada conjunto de
+archivos del template que cambio, re-renderiza solo las salidas afectadas
+(el archivo mismo y los que lo incluyen/extienden segun el indice de
+dependencias) y reescribe solo esas. El entorno Jinja queda caliente entre
+cambios: solo se recompilan los templates modificados.
+
+Los cambios se detectan con inotify (Linux, via ``ctypes``) y si no esta
+disponible comparando mtimes cada ``poll_interval`` segundos.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Set, Tuple, Union
+
+from .assets import StaticFile
+from .dependencies import DependencyIndex, SourceHasher
+from .generator import generate_project
+from .registry import METADATA_FILE
+from .rendering import get_environment, output_name
+from .writer import FileContent, ProjectWriter, WriteReport
+
+# Tiempo que se siguen juntando eventos despues del primero (un editor que
+# guarda escribe, renombra y cambia permisos en rafaga)
+DEBOUNCE_SECONDS = 0.02
+POLL_INTERVAL = 0.25
+
+# Archivos temporales de editores que no son parte del template
+_IGNORED_SUFFIXES = ("~", ".swp", ".swx", ".tmp")
+_IGNORED_PREFIXES = (".#",)
+
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+_EVENT = struct.Struct("iIII")
+
+
+def _ignored(name: str) -> bool:
+    return name.endswith(_IGNORED_SUFFIXES) or name.startswith(_IGNORED_PREFIXES)
+
+
+class PollingWatcher:
+    """Detecta cambios comparando (mtime, tamano) de todos los archivos"""
+
+    def __init__(self, root: Union[str, Path], poll_interval: float = POLL_INTERVAL):
+        self.root = Path(root)
+        self.poll_interval = poll_interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot: Dict[str, Tuple[int, int]] = {}
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if _ignored(filename):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[Path(path).relative_to(self.root).as_posix()] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        """Rutas relativas que cambiaron (vacio si vencio ``timeout``)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {
+                rel for rel in set(snapshot) | set(self._snapshot) if snapshot.get(rel) != self._snapshot.get(rel)
+            }
+            self._snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            delay = self.poll_interval if deadline is None else min(self.poll_interval, deadline - time.monotonic())
+            time.sleep(max(0.0, delay))
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Detecta cambios con inotify, un watch por directorio del template.
+
+    ``wait`` devuelve None si el kernel descarto eventos (cola llena): hay que
+    revisar todo el template.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc no encontrada")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify no disponible")
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 fallo")
+        self._dirs: Dict[int, str] = {}
+        try:
+            self._add_tree(self.root)
+        except BaseException:
+            self.close()
+            raise
+
+    def _add_tree(self, directory: Path) -> Set[str]:
+        """Agregar watches a ``directory`` y sus subdirectorios; devuelve los archivos que contiene"""
+        files: Set[str] = set()
+        for dirpath, _, filenames in os.walk(directory):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), _WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch fallo para {dirpath}")
+            rel_dir = Path(dirpath).relative_to(self.root).as_posix()
+            self._dirs[wd] = "" if rel_dir == "." else rel_dir
+            files.update(
+                Path(dirpath, name).relative_to(self.root).as_posix() for name in filenames if not _ignored(name)
+            )
+        return files
+
+    def _read(self, changed: Set[str]) -> bool:
+        """Procesar los eventos pendientes; False si hace falta revisar todo"""
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return True
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size: offset + _EVENT.size + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += _EVENT.size + length
+            if mask & _IN_Q_OVERFLOW:
+                return False
+            if mask & _IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            parent = self._dirs.get(wd)
+            if parent is None or not name or _ignored(name):
+                continue
+            rel = f"{parent}/{name}" if parent else name
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    changed.update(self._add_tree(self.root / rel))
+                else:
+                    # Directorio borrado o movido: sus archivos ya no estan
+                    return False
+            else:
+                changed.add(rel)
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        """Rutas relativas que cambiaron (vacio si vencio ``timeout``, None si hay que revisar todo)"""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: Set[str] = set()
+        complete = self._read(changed)
+        deadline = time.monotonic() + 10 * DEBOUNCE_SECONDS
+        while time.monotonic() < deadline and select.select([self._fd], [], [], DEBOUNCE_SECONDS)[0]:
+            complete = self._read(changed) and complete
+        if complete:
+            return changed
+        # Pudieron perderse eventos de directorios nuevos: volver a registrarlos
+        self._add_tree(self.root)
+        return None
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(root: Union[str, Path], polling: bool = False, poll_interval: float = POLL_INTERVAL):
+    """Watcher con inotify si se puede, si no por polling"""
+    if not polling:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, poll_interval)
+
+
+class LiveProject:
+    """Proyecto generado que se mantiene al dia con los cambios de su template"""
+
+    def __init__(
+        self,
+        template_dir: Union[str, Path],
+        project_dir: Union[str, Path],
+        context: Mapping[str, Any],
+        bytecode_dir: Optional[Union[str, Path]] = None,
+    ):
+        self.template_dir = Path(template_dir)
+        self.project_dir = Path(project_dir)
+        self.context = context
+        self.bytecode_dir = bytecode_dir
+        self.index = DependencyIndex()
+        # salida -> archivo del template que la genera
+        self.outputs: Dict[str, str] = {}
+
+    def build(self) -> WriteReport:
+        """Generar el proyecto completo (incremental respecto a lo que ya hay en disco).
+
+        Los temporales de editores que el watcher ignora tampoco se generan.
+        """
+        files = [
+            Path(dirpath, filename).relative_to(self.template_dir).as_posix()
+            for dirpath, _, filenames in os.walk(self.template_dir)
+            for filename in filenames
+            if not _ignored(filename)
+        ]
+        result = generate_project(
+            self.template_dir, self.project_dir, self.context, files=files, bytecode_dir=self.bytecode_dir
+        )
+        self.index = result.render.dependencies
+        self.outputs = {output_name(rel): rel for rel in files if rel != METADATA_FILE}
+        return result.report
+
+    def affected(self, changed: Iterable[str]) -> Set[str]:
+        """Salidas a regenerar cuando cambian los archivos ``changed`` del template"""
+        changed = set(changed)
+        outputs = {output_name(rel) for rel in changed if rel != METADATA_FILE}
+        templates = {rel for rel in changed if rel.endswith(".j2")}
+        if templates:
+            for output, record in self.index.records.items():
+                if record.dynamic or templates & set(record.sources):
+                    outputs.add(output)
+        return outputs
+
+    def update(self, changed: Optional[Iterable[str]]) -> WriteReport:
+        """Aplicar los cambios del template (None: revisar todo)"""
+        changed = None if changed is None else set(changed)
+        if changed is None or METADATA_FILE in changed:
+            return self.build()
+
+        env = get_environment(self.template_dir, self.bytecode_dir)
+        hasher = SourceHasher(env)
+        files: Dict[str, FileContent] = {}
+        failed: Dict[str, str] = {}
+        for output in sorted(self.affected(changed)):
+            rel = self.outputs.get(output)
+            for candidate in changed:
+                if output_name(candidate) == output:
+                    rel = candidate
+            if rel is None or not (self.template_dir / rel).is_file():
+                # El archivo se borro del template
+                self.outputs.pop(output, None)
+                self.index.records.pop(output, None)
+                continue
+            self.outputs[output] = rel
+            if not rel.endswith(".j2"):
+                files[output] = StaticFile(self.template_dir / rel)
+                continue
+            try:
+                files[output] = env.get_template(rel).render(**self.context)
+                self.index.record_template(output, rel, hasher, self.context)
+            except Exception as e:
+                # Un template a medio editar no corta el watch: se informa y se
+                # conserva la salida anterior
+                failed[output] = f"{type(e).__name__}: {e}"
+
+        keep = [output for output in self.outputs if output not in files]
+        writer = ProjectWriter(self.project_dir, incremental=True, prune=True)
+        report = writer.write_all(files, keep=keep, dependencies=self.index.to_dict())
+        report.failed.update(failed)
+        return report
+
+
+def watch(
+    live: LiveProject,
+    on_update: Callable[[WriteReport, float], None],
+    polling: bool = False,
+    should_stop: Callable[[], bool] = lambda: False,
+    poll_interval: float = POLL_INTERVAL,
+):
+    """Aplicar los cambios del template de ``live`` a medida que ocurren.
+
+    ``on_update(report, segundos)`` se llama despues de cada actualizacion.
+    Corre hasta que ``should_stop()`` sea verdadero (o un ``KeyboardInterrupt``).
+    """
+    watcher = create_watcher(live.template_dir, polling, poll_interval)
+    try:
+        while not should_stop():
+            changed = watcher.wait(timeout=0.5)
+            if changed is not None and not changed:
+                continue
+            start = time.perf_counter()
+            report = live.update(changed)
+            on_update(report, time.perf_counter() - start)
+    finally:
+        watcher.close()
@@ -0,0 +1,365 @@
+"""Escritura de proyectos en lote: directorios en una pasada, hilos y escritura atomica"""
+
+import hashlib
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
+
+from .assets import StaticBlob, StaticFile, clone_file
+from .manifest import Manifest, content_hash
+from .plan import WritePlan, plan_write
+from .tracing import span
+
+
+class PendingContent:
+    """Contenido que se produce en otro proceso (render en paralelo).
+
+    ``future`` devuelve una lista de resultados y este archivo es el de la
+    posicion ``index``; ``result()`` espera a que este listo.
+    """
+
+    __slots__ = ("future", "index")
+
+    def __init__(self, future: Future, index: int = 0):
+        self.future = future
+        self.index = index
+
+    def result(self) -> Union[str, bytes]:
+        value = self.future.result()[self.index]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+# Contenido de un archivo: completo en memoria, como iterador de chunks
+# (p.ej. ``Template.generate()`` de Jinja) que se escribe a medida que llega,
+# un ``StaticFile``/``StaticBlob`` que se copia byte a byte sin decodificar o
+# un ``PendingContent`` que se espera en el hilo que lo escribe
+FileContent = Union[str, bytes, Iterable[Union[str, bytes]], StaticFile, StaticBlob, PendingContent]
+FileItems = Union[Mapping[str, FileContent], Iterable[Tuple[str, FileContent]]]
+ProgressCallback = Callable[[int, int], None]
+
+# Tamano del buffer de escritura para contenido en streaming
+STREAM_BUFFER_SIZE = 1 << 20
+
+
+def _default_file_mode() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+@dataclass
+class WriteReport:
+    """Resultado de una escritura de proyecto"""
+
+    root: Path
+    written: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return len(self.written) + len(self.unchanged) + len(self.failed)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def _bounded_map(pool: Executor, fn: Callable, items: Iterable, limit: int) -> Iterator:
+    """Como ``pool.map`` pero con a lo sumo ``limit`` tareas pendientes.
+
+    ``Executor.map`` consume todo el iterable de entrada de inmediato; aqui se
+    consume a medida que avanzan los resultados para acotar la memoria.
+    """
+    pending: deque = deque()
+    for item in items:
+        pending.append((item, pool.submit(fn, *item)))
+        if len(pending) >= limit:
+            head, future = pending.popleft()
+            yield head, future.result()
+    while pending:
+        head, future = pending.popleft()
+        yield head, future.result()
+
+
+def print_progress(done: int, total: int):
+    """Callback de progreso por defecto para la consola"""
+    print(f"[FLOPPY] Escritos {done}/{total} archivos")
+
+
+class ProjectWriter:
+    """Escribe los archivos de un proyecto bajo ``root``.
+
+    Antes de escribir se arma un plan (ver ``fast_engine.plan``): si hay
+    conflictos o falta permiso no se escribe nada; si no, los directorios se
+    crean en una sola pasada. Los archivos se escriben en binario desde un
+    pool de hilos y el progreso se reporta agregado (como mucho
+    ``progress_steps`` veces por escritura). Con ``atomic=True`` cada archivo
+    se escribe a un temporal y se renombra.
+
+    Con ``incremental=True`` se compara el hash de cada archivo contra el
+    manifiesto guardado en el proyecto y solo se escriben los que cambiaron;
+    los que ya no se generan se reportan como eliminados (y se borran si
+    ``prune=True``). Los ``StaticFile`` se copian con ``clone_file`` segun
+    ``copy_mode`` (ver ``fast_engine.assets``). Las rutas en ``keep`` no se
+    reescriben ni se consideran eliminadas: conservan el hash del manifiesto
+    anterior.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        jobs: Optional[int] = None,
+        atomic: bool = False,
+        progress: Optional[ProgressCallback] = None,
+        progress_steps: int = 10,
+        incremental: bool = False,
+        prune: bool = False,
+        copy_mode: str = "auto",
+        copy_fallback: bool = True,
+    ):
+        self.root = Path(root)
+        self.jobs = jobs if jobs is not None else min(32, (os.cpu_count() or 1) + 4)
+        self.atomic = atomic
+        self.progress = progress
+        self.progress_steps = max(1, progress_steps)
+        self._file_mode = _default_file_mode()
+        self.incremental = incremental
+        self.prune = prune
+        self.copy_mode = copy_mode
+        self.copy_fallback = copy_fallback
+        self._previous = Manifest()
+        self._created_dirs: Set[Path] = set()
+
+    def write_all(
+        self,
+        files: FileItems,
+        keep: Iterable[str] = (),
+        dependencies: Optional[Dict[str, Any]] = None,
+        plan: Optional[WritePlan] = None,
+    ) -> WriteReport:
+        """Escribir todos los archivos y devolver un reporte.
+
+        ``files`` puede ser un mapping ruta -> contenido o un iterable de pares
+        que se consume de a poco (por ejemplo un render en streaming), en cuyo
+        caso los directorios se crean a medida que aparecen y no hay plan.
+        ``plan`` reutiliza uno ya calculado para estas rutas (p.ej. por la CLI);
+        si tiene problemas se reportan como fallidos y no se escribe nada.
+        """
+        start = time.perf_counter()
+        report = WriteReport(root=self.root)
+        self._created_dirs = set()
+        if isinstance(files, Mapping):
+            if plan is None:
+                with span("write.plan"):
+                    plan = plan_write(self.root, files.keys())
+            if not plan.ok:
+                report.failed.update(plan.issues)
+                report.elapsed = time.perf_counter() - start
+                return report
+            with span("write.mkdir"):
+                self.create_directories(files.keys(), plan)
+            items: Iterable[Tuple[str, FileContent]] = files.items()
+            total = len(files)
+        else:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(self.root)
+            items = files
+            total = 0
+        if self.incremental:
+            with span("write.manifest_load"):
+                self._previous = Manifest.load(self.root)
+
+        step = total // self.progress_steps or max(total, 1) if total else 100
+        hashes: Dict[str, str] = {}
+        seen: Set[str] = set()
+
+        def record(rel_path: str, outcome: Tuple[str, Optional[str], Optional[Exception]]):
+            status, digest, error = outcome
+            seen.add(rel_path)
+            if error is not None:
+                report.failed[rel_path] = str(error)
+            else:
+                if digest is not None:
+                    hashes[rel_path] = digest
+                if status == "unchanged":
+                    report.unchanged.append(rel_path)
+                else:
+                    report.written.append(rel_path)
+                    if status == "added":
+                        report.added.append(rel_path)
+                    elif status == "changed":
+                        report.changed.append(rel_path)
+            done = report.total
+            if self.progress and (done % step == 0 or done == total):
+                self.progress(done, total)
+
+        with span("write.files"):
+            if self.jobs <= 1 or (total and total <= 1):
+                for rel_path, content in items:
+                    record(rel_path, self._process(rel_path, content))
+            else:
+                with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                    for (rel_path, _), outcome in _bounded_map(pool, self._process, items, self.jobs * 2):
+                        record(rel_path, outcome)
+        if self.progress and not total and report.total % step:
+            self.progress(report.total, report.total)
+
+        if self.incremental:
+            for rel_path in keep:
+                if rel_path in self._previous.files and rel_path not in seen:
+                    hashes[rel_path] = self._previous.files[rel_path]
+                    report.unchanged.append(rel_path)
+            with span("write.manifest_save"):
+                self._finish_incremental(hashes, report, dependencies or {})
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _finish_incremental(self, hashes: Dict[str, str], report: WriteReport, dependencies: Dict[str, Any]):
+        report.deleted = sorted(set(self._previous.files) - set(hashes) - set(report.failed))
+        if self.prune:
+            for rel_path in report.deleted:
+                try:
+                    (self.root / rel_path).unlink()
+                except OSError:
+                    pass
+        manifest = Manifest(files=hashes, dependencies=dependencies)
+        # Los archivos eliminados que no se borraron siguen en disco pero ya no
+        # pertenecen a la generacion actual, asi que salen del manifiesto
+        manifest.save(self.root)
+
+    def create_directories(self, rel_paths: Iterable[str], plan: Optional[WritePlan] = None) -> List[Path]:
+        """Crear de una vez los directorios que faltan y devolverlos.
+
+        Cada directorio faltante recibe un unico ``mkdir`` (sin ``parents=True``
+        ni reintentos sobre los que ya existen).
+        """
+        if plan is None:
+            plan = plan_write(self.root, rel_paths)
+        plan.create_directories()
+        self._created_dirs.add(self.root)
+        self._created_dirs.update(self.root / directory for directory in plan.directories)
+        return plan.missing
+
+    def write_file(self, rel_path: str, content: FileContent):
+        """Escribir un unico archivo"""
+        if isinstance(content, PendingContent):
+            content = content.result()
+        self._write(self.root / rel_path, content, keep_temp=False)
+
+    def _ensure_parent(self, dest: Path):
+        parent = dest.parent
+        if parent not in self._created_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(parent)
+
+    def _write(self, dest: Path, content: FileContent, keep_temp: bool) -> Tuple[Optional[str], Optional[str]]:
+        """Escribir ``content`` en ``dest`` (calculando su hash en modo incremental).
+
+        Devuelve ``(hash, temporal)``. Con ``keep_temp=True`` el contenido queda
+        en un temporal sin renombrar para que el llamador decida si lo usa.
+        """
+        self._ensure_parent(dest)
+        if isinstance(content, StaticFile):
+            return self._copy_static(dest, content, keep_temp)
+        if isinstance(content, StaticBlob):
+            content = (content.data,)
+        digest = hashlib.sha256() if self.incremental else None
+        use_temp = self.atomic or keep_temp
+        if use_temp:
+            fd, tmp_name = tempfile.mkstemp(dir=str(dest.parent), prefix=f".{dest.name}.", suffix=".tmp")
+            f = os.fdopen(fd, "wb", buffering=STREAM_BUFFER_SIZE)
+        else:
+            tmp_name = None
+            f = open(dest, "wb", buffering=STREAM_BUFFER_SIZE)
+        try:
+            with f:
+                chunks = [content] if isinstance(content, (str, bytes)) else content
+                for chunk in chunks:
+                    data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+                    if digest is not None:
+                        digest.update(data)
+                    f.write(data)
+            if tmp_name is not None:
+                os.chmod(tmp_name, self._file_mode)
+                if not keep_temp:
+                    os.replace(tmp_name, dest)
+                    tmp_name = None
+        except BaseException:
+            if tmp_name is not None:
+                _unlink_quietly(tmp_name)
+            raise
+        return (digest.hexdigest() if digest is not None else None), tmp_name
+
+    def _copy_static(self, dest: Path, asset: StaticFile, keep_temp: bool) -> Tuple[Optional[str], Optional[str]]:
+        digest = asset.hash() if self.incremental else None
+        if not (self.atomic or keep_temp):
+            clone_file(asset.path, dest, self.copy_mode, self.copy_fallback)
+            return digest, None
+
+        tmp_name = str(dest.with_name(f".{dest.name}.{os.getpid()}.{id(asset)}.tmp"))
+        try:
+            clone_file(asset.path, tmp_name, self.copy_mode, self.copy_fallback)
+            if not keep_temp:
+                os.replace(tmp_name, dest)
+                tmp_name = None
+        except BaseException:
+            _unlink_quietly(tmp_name)
+            raise
+        return digest, tmp_name
+
+    def _process(self, rel_path: str, content: FileContent) -> Tuple[str, Optional[str], Optional[Exception]]:
+        """Escribir un archivo si hace falta: devuelve (estado, hash, error)"""
+        dest = self.root / rel_path
+        digest = None
+        status = "written"
+        try:
+            if isinstance(content, PendingContent):
+                content = content.result()
+            if not self.incremental:
+                self._write(dest, content, keep_temp=False)
+                return status, None, None
+
+            previous = self._previous.files.get(rel_path)
+            status = "added" if previous is None else "changed"
+            if isinstance(content, (StaticFile, StaticBlob)):
+                digest = content.hash()
+                if previous == digest and dest.is_file():
+                    return "unchanged", digest, None
+                self._write(dest, content, keep_temp=False)
+            elif isinstance(content, (str, bytes)):
+                digest = content_hash(content)
+                if previous == digest and dest.is_file():
+                    return "unchanged", digest, None
+                self._write(dest, content, keep_temp=False)
+            else:
+                # En streaming el hash se conoce recien al final: se escribe a un
+                # temporal y solo se reemplaza el archivo si el contenido cambio
+                digest, tmp_name = self._write(dest, content, keep_temp=True)
+                if previous == digest and dest.is_file():
+                    _unlink_quietly(tmp_name)
+                    return "unchanged", digest, None
+                os.replace(tmp_name, dest)
+        except Exception as e:
+            return status, digest, e
+        return status, digest, None
+
+
+def _unlink_quietly(path: Optional[str]):
+    if path is None:
+        return
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
@@ -31,6 +31,12 @@ class Exit(Exception):
     def __init__(self, code=0):
         self.code = code
 
+def echo(message=None, *args, **kwargs):
+    print(message if message is not None else "")
+
+def secho(message=None, *args, **kwargs):
+    echo(message)
+
 class DummyCliRunner:
     def invoke(self, app, args=None):
         out = io.StringIO()
@@ -41,6 +47,13 @@ class DummyCliRunner:
         except Exit as e:
             return types.SimpleNamespace(exit_code=e.code, stdout=out.getvalue())
 
+@pytest.fixture(autouse=True)
+def fast_engine_home(tmp_path_factory, monkeypatch):
+    """Keep caches and indexes written during tests out of the real home."""
+    home = tmp_path_factory.mktemp("fast-engine-home")
+    monkeypatch.setenv("FAST_ENGINE_HOME", str(home))
+    return home
+
 @pytest.fixture
 def cli_runner(monkeypatch):
     typer_mod = types.ModuleType('typer')
@@ -49,6 +62,8 @@ def cli_runner(monkeypatch):
     typer_mod.Argument = Argument
     typer_mod.Option = Option
     typer_mod.Exit = Exit
+    typer_mod.echo = echo
+    typer_mod.secho = secho
     testing_mod.CliRunner = DummyCliRunner
     typer_mod.testing = testing_mod
 
@@ -0,0 +1,215 @@
+import asyncio
+import io
+import json
+import tarfile
+import threading
+from pathlib import Path
+
+from fast_engine.app import create_app
+from fast_engine.config import Config
+from fast_engine.core import FastEngine
+
+
+async def call(app, method, path, body=None, tenant=None):
+    """Request ASGI directo; devuelve (status, headers, json)"""
+    headers = [(b"x-tenant", tenant.encode())] if tenant else []
+    scope = {"type": "http", "method": method, "path": path, "headers": headers}
+    payload = json.dumps(body).encode() if body is not None else b""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    start, data = sent
+    return start["status"], dict(start["headers"]), json.loads(data["body"])
+
+
+class SlowEngine:
+    """Engine falso: cada generacion espera a que el test la libere"""
+
+    def __init__(self):
+        self.config = Config(output_path=".")
+        self.release = asyncio.Event()
+        self.started = []
+        self.output_dirs = []
+
+    async def generate(self, name, template, description, use_cache, output_dir):
+        self.started.append(name)
+        self.output_dirs.append(output_dir)
+        await self.release.wait()
+        return f"ok {name}"
+
+    async def close(self):
+        pass
+
+
+async def wait_for(app, job_id, status):
+    for _ in range(200):
+        code, _, job = await call(app, "GET", f"/jobs/{job_id}")
+        if job["status"] == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(job)
+
+
+def test_jobs_queue_backpressure_and_health():
+    async def scenario():
+        engine = SlowEngine()
+        config = Config(output_path=".", api_workers=1, api_queue_size=1)
+        app = create_app(engine, config)
+
+        status, headers, first = await call(app, "POST", "/jobs", {"name": "one"})
+        assert status == 202 and headers[b"location"] == f"/jobs/{first['id']}".encode()
+        await wait_for(app, first["id"], "running")
+        assert (await call(app, "POST", "/jobs", {"name": "two"}))[0] == 202
+        status, headers, body = await call(app, "POST", "/jobs", {"name": "three"})
+        assert status == 429 and b"retry-after" in headers
+
+        # Con el worker ocupado /health responde igual
+        status, _, health = await call(app, "GET", "/health")
+        assert (status, health["running"], health["queued"]) == (200, 1, 1)
+        assert (await call(app, "GET", f"/jobs/{first['id']}/result"))[0] == 409
+
+        engine.release.set()
+        await wait_for(app, first["id"], "done")
+        status, _, result = await call(app, "GET", f"/jobs/{first['id']}/result")
+        assert status == 200 and result["result"]["message"] == "ok one"
+        await app.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_tenants_are_served_round_robin():
+    async def scenario():
+        engine = SlowEngine()
+        engine.release.set()
+        app = create_app(engine, Config(output_path=".", api_workers=1, api_tenant_concurrency=None))
+        app.queue.start()
+        # Sin ceder el loop los cuatro quedan en cola antes de que el worker tome uno
+        ids = [
+            (await call(app, "POST", "/jobs", {"name": name}, tenant=tenant))[2]["id"]
+            for name, tenant in (("a1", "a"), ("a2", "a"), ("a3", "a"), ("b1", "b"))
+        ]
+        await wait_for(app, ids[-1], "done")
+        await wait_for(app, ids[2], "done")
+        assert engine.started == ["a1", "b1", "a2", "a3"]
+        await app.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_tenants_write_to_separate_directories():
+    async def scenario():
+        engine = SlowEngine()
+        app = create_app(engine, Config(output_path="out"))
+        first = (await call(app, "POST", "/jobs", {"name": "svc"}, tenant="a"))[2]
+        # El mismo nombre en otro tenant es otro directorio: no hay conflicto
+        status, _, second = await call(app, "POST", "/jobs", {"name": "svc"}, tenant="b")
+        assert status == 202
+        status, _, body = await call(app, "POST", "/jobs", {"name": "svc"}, tenant="a")
+        assert status == 409 and first["id"] in body["error"]
+
+        engine.release.set()
+        await wait_for(app, first["id"], "done")
+        await wait_for(app, second["id"], "done")
+        assert sorted(engine.output_dirs) == [Path("out") / "a", Path("out") / "b"]
+        await app.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_invalid_requests_are_rejected():
+    async def scenario():
+        app = create_app(SlowEngine(), Config(output_path="."))
+        assert (await call(app, "POST", "/jobs", {"name": "../etc"}))[0] == 400
+        assert (await call(app, "POST", "/jobs", {}))[0] == 400
+        assert (await call(app, "POST", "/jobs", {"name": "ok", "archive": "rar"}))[0] == 400
+        assert (await call(app, "POST", "/jobs", {"name": "ok"}, tenant="../a"))[0] == 400
+        assert (await call(app, "GET", "/jobs/" + "0" * 32))[0] == 404
+        assert (await call(app, "DELETE", "/health"))[0] == 405
+        await app.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_generation_job_writes_project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = FastEngine()
+    engine.simulated_latency = 0
+    engine.config.output_path = str(tmp_path / "out")
+
+    async def scenario():
+        app = engine.create_app()
+        job = (await call(app, "POST", "/jobs", {"name": "svc", "use_cache": False}))[2]
+        job = await wait_for(app, job["id"], "done")
+        await app.shutdown()
+        return job
+
+    job = asyncio.run(scenario())
+    project = tmp_path / "out" / "default" / "svc"
+    assert job["result"]["project_dir"] == str(project)
+    assert (project / "backend" / "models.py").is_file()
+    assert (project / "main.py").is_file()
+
+
+def test_archive_job_is_served_from_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = FastEngine()
+    engine.simulated_latency = 0
+    engine.config.output_path = str(tmp_path / "out")
+
+    async def scenario():
+        app = engine.create_app()
+        job = (await call(app, "POST", "/jobs", {"name": "svc", "use_cache": False, "archive": "tar.gz"}))[2]
+        job = await wait_for(app, job["id"], "done")
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": job["result"]["archive"], "headers": []}
+        await app(scope, None, send)
+        await app.shutdown()
+        return sent
+
+    start, body = asyncio.run(scenario())
+    assert start["status"] == 200 and dict(start["headers"])[b"content-type"] == b"application/gzip"
+    with tarfile.open(fileobj=io.BytesIO(body["body"]), mode="r:gz") as tar:
+        assert {"svc/main.py", "svc/backend/models.py"} <= set(tar.getnames())
+    assert not (tmp_path / "out" / "default" / "svc").exists()
+
+
+def test_render_stage_does_not_block_the_event_loop(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = FastEngine()
+    engine.simulated_latency = 0
+    engine.config.output_path = str(tmp_path / "out")
+    rendering, release, rendered = threading.Event(), threading.Event(), threading.Event()
+
+    def slow_render(template, context):
+        # Template grande: el render tarda y no cede el event loop
+        rendering.set()
+        release.wait(2)
+        rendered.set()
+        yield "main.py", "print('svc')\n"
+
+    monkeypatch.setattr(engine.template_engine, "iter_render_project", slow_render)
+
+    async def scenario():
+        app = engine.create_app()
+        job = (await call(app, "POST", "/jobs", {"name": "svc", "use_cache": False}))[2]
+        while not rendering.is_set():
+            await asyncio.sleep(0.01)
+        status, _, health = await asyncio.wait_for(call(app, "GET", "/health"), 1)
+        assert (status, health["running"]) == (200, 1) and not rendered.is_set()
+        release.set()
+        job = await wait_for(app, job["id"], "done")
+        await app.shutdown()
+        return job
+
+    assert asyncio.run(scenario())["status"] == "done"
+    assert (tmp_path / "out" / "default" / "svc" / "main.py").read_text() == "print('svc')\n"
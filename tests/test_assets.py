@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from fast_engine import assets
+from fast_engine.assets import StaticFile, clone_file
+from fast_engine.rendering import render_directory
+from fast_engine.writer import ProjectWriter
+
+BINARY = bytes(range(256)) * 64
+
+
+def test_clone_file_copies_bytes_exactly(tmp_path):
+    src = tmp_path / "logo.png"
+    src.write_bytes(BINARY)
+    method = clone_file(src, tmp_path / "copy.png")
+    assert method in ("reflink", "kernel", "copy")
+    assert (tmp_path / "copy.png").read_bytes() == BINARY
+
+
+def test_unsupported_method_falls_back(tmp_path, monkeypatch):
+    src = tmp_path / "font.woff2"
+    src.write_bytes(BINARY)
+
+    def no_links(a, b):
+        raise OSError(assets.errno.EXDEV, "cross-device link")
+
+    monkeypatch.setattr(assets, "_METHODS", dict(assets._METHODS, hardlink=no_links))
+    monkeypatch.setattr(assets, "_unsupported", set())
+    assert clone_file(src, tmp_path / "a.woff2", mode="hardlink") != "hardlink"
+    with pytest.raises(OSError):
+        clone_file(src, tmp_path / "b.woff2", mode="hardlink", fallback=False)
+
+
+def test_hardlink_mode_shares_inode(tmp_path):
+    src = tmp_path / "bundle.js"
+    src.write_bytes(b"console.log(1)")
+    dest = tmp_path / "out.js"
+    dest.write_text("old")
+    assert clone_file(src, dest, mode="hardlink", fallback=False) == "hardlink"
+    assert os.stat(dest).st_ino == os.stat(src).st_ino
+
+
+def test_binary_template_files_pass_through(tmp_path):
+    template_dir = tmp_path / "tpl"
+    (template_dir / "static").mkdir(parents=True)
+    (template_dir / "static" / "logo.png").write_bytes(BINARY)
+    result = render_directory(template_dir, {})
+    assert isinstance(result.files["static/logo.png"], StaticFile)
+
+    report = ProjectWriter(tmp_path / "out", incremental=True, atomic=True).write_all(result.files)
+    assert report.added == ["static/logo.png"]
+    assert (tmp_path / "out" / "static" / "logo.png").read_bytes() == BINARY
+    again = ProjectWriter(tmp_path / "out", incremental=True).write_all(result.files)
+    assert again.unchanged == ["static/logo.png"]
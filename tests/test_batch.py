@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from fast_engine.batch import ProjectSpec, load_manifest, run_batch
+
+
+def _templates(tmp_path):
+    tpl = tmp_path / "templates" / "svc"
+    tpl.mkdir(parents=True)
+    (tpl / "template.yml").write_text("name: svc\ndescription: Service\n")
+    (tpl / "main.py.j2").write_text("print('{{ project_name }} on {{ port }}')\n")
+    return tmp_path / "templates"
+
+
+def test_load_manifest_merges_defaults(tmp_path):
+    manifest = tmp_path / "batch.yml"
+    manifest.write_text(
+        "defaults:\n  template: svc\n  context: {port: 80}\n"
+        "projects:\n  - name: a\n  - name: b\n    context: {port: 81}\n"
+    )
+    specs = load_manifest(manifest)
+    assert [(s.name, s.template, s.context["port"]) for s in specs] == [("a", "svc", 80), ("b", "svc", 81)]
+
+    manifest.write_text("projects:\n  - name: a\n")
+    with pytest.raises(ValueError):
+        load_manifest(manifest)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_batch_generates_every_project(tmp_path, jobs):
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(json.dumps({"projects": [
+        {"name": "a", "template": "svc", "context": {"port": 1}},
+        {"name": "b", "template": "svc", "context": {"port": 2}},
+        {"name": "c", "template": "missing"},
+    ]}))
+
+    summary = run_batch(load_manifest(manifest), _templates(tmp_path), tmp_path / "out", tmp_path / "cache", jobs=jobs)
+
+    assert [r.ok for r in summary.results] == [True, True, False]
+    assert (tmp_path / "out" / "b" / "main.py").read_text() == "print('b on 2')\n"
+    # main.py; template.yml es metadata del template y no se copia
+    assert summary.results[0].written == 1 and summary.results[0].elapsed > 0
+    assert not (tmp_path / "out" / "a" / "template.yml").exists()
+
+
+@pytest.mark.parametrize("name", ["../x", "/tmp/x", "a/../../x", "."])
+def test_project_names_cannot_escape_the_output_root(tmp_path, name):
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(json.dumps({"projects": [{"name": name, "template": "svc"}]}))
+    with pytest.raises(ValueError, match="ruta fuera del proyecto"):
+        load_manifest(manifest)
+
+    summary = run_batch([ProjectSpec(name, "svc")], _templates(tmp_path), tmp_path / "out", tmp_path / "cache", jobs=1)
+    assert summary.results[0].error == "ruta fuera del proyecto"
+    assert not (tmp_path / "x").exists()
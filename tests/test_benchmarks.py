@@ -0,0 +1,18 @@
+from benchmarks.run import CASES, check, run
+
+
+def test_benchmark_suite_reports_every_case():
+    report = run(sizes=(10,), repeat=1, cases=CASES)
+    names = [r["name"] for r in report["results"]]
+    assert names == [f"{case}[10]" for case in CASES]
+    assert all(r["seconds"] > 0 for r in report["results"])
+
+
+def test_check_flags_thresholds_and_regressions():
+    results = [{"name": "render_project[10]", "seconds": 0.3}]
+    assert check(results, {"max_seconds": {"render_project[10]": 1.0}}, None) == []
+    assert check(results, {"max_seconds": {"render_project[10]": 0.1}}, None)
+
+    baseline = {"results": [{"name": "render_project[10]", "seconds": 0.1}]}
+    assert check(results, {"tolerance": 0.5}, baseline)
+    assert check(results, {"tolerance": 3.0}, baseline) == []
@@ -0,0 +1,88 @@
+import importlib
+
+import pytest
+
+from fast_engine.assets import StaticBlob
+from fast_engine.bundle import BundleError, TemplateBundle, open_bundle, pack_template
+from fast_engine.generator import generate_project
+from fast_engine.registry import TemplateRegistry
+from fast_engine.rendering import render_directory
+
+LOGO = bytes(range(256)) * 8
+
+
+def _make_template(base):
+    tpl = base / "svc"
+    (tpl / "src").mkdir(parents=True)
+    (tpl / "template.yml").write_text("name: svc\ndescription: A service\nversion: 1.2.0\n")
+    (tpl / "src" / "main.py.j2").write_text("{% include 'src/header.j2' %}print('{{ project_name }}')\n")
+    (tpl / "src" / "header.j2").write_text("# {{ project_name }}\n")
+    (tpl / "logo.png").write_bytes(LOGO)
+    return tpl
+
+
+def test_pack_roundtrip_reads_from_mmap(tmp_path):
+    tpl = _make_template(tmp_path / "src-templates")
+    bundle = TemplateBundle(pack_template(tpl, tmp_path / "svc.feb"))
+    assert bundle.name == "svc" and bundle.metadata["version"] == "1.2.0"
+    assert set(bundle.files) == {"template.yml", "src/main.py.j2", "src/header.j2", "logo.png"}
+    assert isinstance(bundle.read("logo.png"), memoryview)
+    assert bytes(bundle.read("logo.png")) == LOGO
+    assert bundle.text("src/header.j2") == "# {{ project_name }}\n"
+
+
+def test_invalid_bundle_is_rejected(tmp_path):
+    path = tmp_path / "broken.feb"
+    path.write_bytes(b"not a bundle at all")
+    with pytest.raises(BundleError):
+        TemplateBundle(path)
+
+
+def test_render_and_write_from_bundle(tmp_path):
+    tpl = _make_template(tmp_path / "src-templates")
+    bundle_path = pack_template(tpl, tmp_path / "svc.feb")
+
+    result = render_directory(bundle_path, {"project_name": "demo"})
+    assert result.files["src/main.py"] == "# demo\nprint('demo')\n"
+    assert isinstance(result.files["logo.png"], StaticBlob)
+
+    out = tmp_path / "out"
+    report = generate_project(bundle_path, out, {"project_name": "demo"}, files=open_bundle(bundle_path).files).report
+    assert report.ok
+    assert (out / "logo.png").read_bytes() == LOGO
+    assert (out / "src" / "main.py").read_text() == "# demo\nprint('demo')\n"
+    assert not (out / "template.yml").exists()
+
+    again = generate_project(bundle_path, out, {"project_name": "demo"}).report
+    assert again.written == [] and "logo.png" in again.unchanged
+
+
+def test_registry_lists_bundles_and_prefers_directories(tmp_path):
+    templates = tmp_path / "templates"
+    tpl = _make_template(tmp_path / "src-templates")
+    pack_template(tpl, templates / "packed.feb")
+    reg = TemplateRegistry(templates, tmp_path / "cache")
+
+    entry = reg.get("packed")
+    assert entry.is_bundle and entry.version == "1.2.0"
+    assert "logo.png" in entry.files
+
+    (templates / "packed").mkdir()
+    (templates / "packed" / "template.yml").write_text("name: packed\ndescription: Loose\nversion: 9.0.0\n")
+    assert reg.get("packed").version == "9.0.0"
+    assert not reg.get("packed").is_bundle
+
+
+def test_cli_pack_and_init_from_bundle(cli_runner, tmp_path, monkeypatch):
+    import fast_engine.cli as cli
+    importlib.reload(cli)
+    monkeypatch.setattr(cli, "FAST_ENGINE_HOME", tmp_path)
+    bundle_path = tmp_path / "saas-basic.feb"
+    cli.pack("saas-basic", output=bundle_path)
+    assert bundle_path.is_file()
+
+    cli.init(name="svc", template=str(bundle_path), incremental=True, copy_mode="auto",
+             profile=False, profile_output=None)
+    assert (tmp_path / "svc" / "backend" / "app.py").read_text().startswith('print("svc backend")')
+    # El bytecode del bundle se guarda en un unico archivo
+    assert [p.name.startswith("bundle-") for p in (tmp_path / "cache" / "jinja").iterdir()] == [True]
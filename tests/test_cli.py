@@ -1,4 +1,8 @@
 import importlib
+import os
+
+from fast_engine import registry
+from fast_engine.rendering import clear_environment_cache
 
 
 def test_cli_version(cli_runner):
@@ -7,3 +11,59 @@ def test_cli_version(cli_runner):
     result = cli_runner.invoke(cli.app, ["version"])
     assert result.exit_code == 0
     assert "Fast-Engine" in result.stdout
+
+
+def test_cli_init_renders_template(cli_runner, tmp_path, monkeypatch):
+    import fast_engine.cli as cli
+    importlib.reload(cli)
+    monkeypatch.setattr(cli, "FAST_ENGINE_HOME", tmp_path)
+    cli.init(name="svc", template="saas-basic")
+    project = tmp_path / "svc"
+    assert (project / "backend" / "app.py").read_text().startswith('print("svc backend")')
+    assert list((tmp_path / "cache" / "jinja").iterdir())
+
+
+def _edit_in_place(path, text):
+    """Reescribir ``path`` sin cambiar el mtime de su directorio (como ``>`` en el shell)"""
+    parent = path.parent.stat().st_mtime_ns
+    path.write_text(text)
+    os.utime(path.parent, ns=(parent, parent))
+
+
+def test_init_picks_up_static_file_edited_in_place(cli_runner, tmp_path, monkeypatch):
+    import fast_engine.cli as cli
+    importlib.reload(cli)
+    monkeypatch.setattr(cli, "FAST_ENGINE_HOME", tmp_path / "home")
+    templates = tmp_path / "templates"
+    (templates / "tpl").mkdir(parents=True)
+    (templates / "tpl" / "template.yml").write_text("name: tpl\n")
+    (templates / "tpl" / "static.txt").write_text("static: v1\n")
+    monkeypatch.setattr(cli, "get_templates_dir", lambda: templates)
+
+    cli.init(name="svc", template="tpl")
+    _edit_in_place(templates / "tpl" / "static.txt", "static: v2\n")
+    # Proceso nuevo: registro y entornos se reconstruyen desde el indice en disco
+    registry._registries.clear()
+    clear_environment_cache()
+    cli.init(name="svc", template="tpl")
+    assert (tmp_path / "home" / "svc" / "static.txt").read_text() == "static: v2\n"
+
+
+def test_warm_init_renders_template_edited_in_place(cli_runner, tmp_path, monkeypatch):
+    import fast_engine.cli as cli
+    importlib.reload(cli)
+    monkeypatch.setattr(cli, "FAST_ENGINE_HOME", tmp_path / "home")
+    templates = tmp_path / "templates"
+    (templates / "tpl").mkdir(parents=True)
+    (templates / "tpl" / "template.yml").write_text("name: tpl\n")
+    source = templates / "tpl" / "main.py.j2"
+    source.write_text("v1 {{ project_name }}\n")
+    monkeypatch.setattr(cli, "get_templates_dir", lambda: templates)
+
+    # Mismo proceso, como el daemon: registro y templates compilados calientes
+    cli._init_project("svc", "tpl", True, "auto")
+    _edit_in_place(source, "v2 {{ project_name }}\n")
+    mtime = source.stat().st_mtime_ns + 1_000_000_000
+    os.utime(source, ns=(mtime, mtime))
+    cli._init_project("svc", "tpl", True, "auto")
+    assert (tmp_path / "home" / "svc" / "main.py").read_text() == "v2 svc\n"
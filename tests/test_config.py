@@ -0,0 +1,73 @@
+import json
+import os
+
+import pytest
+
+from fast_engine import config as config_mod
+from fast_engine.config import Config, ConfigError, get_home
+
+
+@pytest.fixture
+def layers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in list(os.environ):
+        if (name.startswith("FAST_ENGINE_") and name != "FAST_ENGINE_HOME") or name.endswith("_API_KEY"):
+            monkeypatch.delenv(name)
+    get_home().mkdir(parents=True, exist_ok=True)
+    config_mod.clear_config_cache()
+    return get_home() / "config.json", tmp_path / "fast-engine.json"
+
+
+def test_layers_are_merged_in_order(layers, monkeypatch):
+    user, project = layers
+    user.write_text(json.dumps({"jobs": 2, "writer_threads": 3, "provider_concurrency": 4, "output_path": "u"}))
+    project.write_text(json.dumps({"writer_threads": 5, "provider_concurrency": 6, "token_budget": None}))
+    monkeypatch.setenv("FAST_ENGINE_PROVIDER_CONCURRENCY", "7")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-env")
+
+    config = Config.load(overrides={"jobs": None, "llm_cache_max_mb": 16})
+    assert (config.jobs, config.writer_threads, config.provider_concurrency) == (2, 5, 7)
+    assert (config.output_path, config.openai_api_key, config.llm_cache_max_mb) == ("u", "sk-env", 16)
+    assert config.api_workers == 4 and config.templates_path
+
+
+def test_load_is_memoized_until_a_file_changes(layers, monkeypatch):
+    _, project = layers
+    project.write_text(json.dumps({"jobs": 2}))
+    reads = []
+    real_read = config_mod._read_file
+    monkeypatch.setattr(config_mod, "_read_file", lambda path: reads.append(path) or real_read(path))
+
+    first = Config.load()
+    first.jobs = 99
+    assert Config.load().jobs == 2 and len(reads) == 2
+
+    project.write_text(json.dumps({"jobs": 12}))
+    assert Config.load().jobs == 12 and len(reads) == 4
+    monkeypatch.setenv("FAST_ENGINE_JOBS", "3")
+    assert Config.load().jobs == 3 and len(reads) == 6
+
+
+@pytest.mark.parametrize("data, message", [
+    ({"jobs": 0}, "'jobs'"),
+    ({"provider_concurrency": "many"}, "'provider_concurrency'"),
+    ({"rate_limits": {"openai": 5}}, "'rate_limits'"),
+    ({"rate_limits": {"openai": {"requests_per_minute": 0}}}, "openai.requests_per_minute: debe ser mayor a 0"),
+    ({"rate_limits": {"claude": {"tokens_per_minute": "fast"}}}, "claude.tokens_per_minute"),
+    ({"rate_limits": {"deepseek": {"max_concurrency": 2.5}}}, "deepseek.max_concurrency: debe ser un entero"),
+    ({"rate_limits": {"openai": {"max_concurent": 2}}}, "openai.max_concurent: limite desconocido"),
+    ({"api_workers": 1.5}, "'api_workers'"),
+])
+def test_invalid_values_are_rejected_at_load(layers, data, message):
+    _, project = layers
+    project.write_text(json.dumps(data))
+    with pytest.raises(ConfigError, match=message) as info:
+        Config.load()
+    assert str(project) in str(info.value)
+
+
+def test_save_round_trips(layers):
+    _, project = layers
+    Config(jobs=4, rate_limits={"openai": {"max_concurrency": 2}}).save(str(project))
+    loaded = Config.load()
+    assert loaded.jobs == 4 and loaded.rate_limits == {"openai": {"max_concurrency": 2}}
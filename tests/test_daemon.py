@@ -0,0 +1,106 @@
+import asyncio
+import importlib
+import io
+import threading
+
+import pytest
+
+from fast_engine.client import forward, parse_command
+from fast_engine.config import ConfigError
+from fast_engine.core import FastEngine
+from fast_engine.daemon import GenerationDaemon, _run_init
+
+
+def test_parse_command_only_forwards_known_options():
+    assert parse_command(["init", "svc", "-t", "saas-basic", "--force"]) == {
+        "command": "init",
+        "args": {"name": "svc", "template": "saas-basic", "incremental": False, "copy_mode": "auto"},
+    }
+    assert parse_command(["generate", "app", "--description=Demo", "--no-cache"])["args"] == {
+        "name": "app", "template": "saas-basic", "description": "Demo", "use_cache": False,
+    }
+    assert parse_command(["init", "svc"]) is None  # prompt interactivo
+    assert parse_command(["init", "svc", "-t", "saas-basic", "--profile"]) is None
+    assert parse_command(["generate", "--help"]) is None
+    assert parse_command(["list-templates"]) is None
+
+
+def test_forward_without_daemon_runs_locally(tmp_path):
+    assert forward({"command": "ping", "args": {}}, tmp_path / "missing.sock") is None
+    stale = tmp_path / "stale.sock"
+    stale.write_text("")
+    assert forward({"command": "ping", "args": {}}, stale) is None
+
+
+def test_daemon_serves_forwarded_commands(cli_runner, tmp_path, monkeypatch):
+    import fast_engine.cli as cli
+    importlib.reload(cli)
+    monkeypatch.setattr(cli, "FAST_ENGINE_HOME", tmp_path / "home")
+    monkeypatch.chdir(tmp_path)
+    engine = FastEngine()
+    engine.simulated_latency = 0
+    path = tmp_path / "daemon.sock"
+    daemon = GenerationDaemon(path, engine=engine, workers=2)
+    ready = threading.Event()
+    thread = threading.Thread(target=asyncio.run, args=(daemon.serve(ready=ready.set),))
+    thread.start()
+    try:
+        assert ready.wait(10)
+        out = io.StringIO()
+        request = parse_command(["init", "svc", "-t", "saas-basic"])
+        assert forward(request, path, out) == 0
+        assert "Proyecto creado" in out.getvalue()
+        assert (tmp_path / "home" / "svc" / "backend" / "app.py").is_file()
+
+        out = io.StringIO()
+        assert forward(parse_command(["generate", "demo", "--no-cache"]), path, out) == 0
+        assert "creado exitosamente" in out.getvalue()
+        assert (tmp_path / "demo" / "backend" / "models.py").is_file()
+
+        assert forward(parse_command(["init", "x", "-t", "missing"]), path, io.StringIO()) == 1
+        assert forward({"command": "ping", "args": {}}, path, io.StringIO()) == 0
+    finally:
+        assert forward({"command": "shutdown", "args": {}}, path, io.StringIO()) == 0
+        thread.join(10)
+    assert not thread.is_alive()
+    assert not path.exists()
+
+
+def test_daemon_init_reads_the_client_project_config(cli_runner, tmp_path, monkeypatch, capsys):
+    import fast_engine.cli as cli
+    importlib.reload(cli)
+    monkeypatch.setattr(cli, "FAST_ENGINE_HOME", tmp_path / "home")
+    monkeypatch.chdir(tmp_path)
+    client = tmp_path / "client"
+    client.mkdir()
+    (client / "fast-engine.json").write_text('{"jobs": 0}')
+
+    args = {"name": "svc", "template": "saas-basic", "incremental": True, "copy_mode": "auto"}
+    # El daemon corre en otro directorio: la configuracion es la del cliente
+    assert _run_init(args, str(client)) == 1
+    assert str(client / "fast-engine.json") in capsys.readouterr().out
+    assert _run_init(args, str(tmp_path)) == 0
+
+
+def test_daemon_generate_reads_the_client_project_config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = FastEngine()
+    daemon = GenerationDaemon(tmp_path / "daemon.sock", engine=engine)
+    client = tmp_path / "client"
+    client.mkdir()
+    received = {}
+
+    async def generate(name, template, description, use_cache, output_dir, config=None):
+        received.update(output_dir=output_dir, config=config)
+        return "ok"
+
+    monkeypatch.setattr(engine, "generate", generate)
+    args = {"name": "demo", "template": "saas-basic"}
+    (client / "fast-engine.json").write_text('{"token_budget": 500}')
+    assert asyncio.run(daemon._run("generate", args, str(client))) == 0
+    assert received["output_dir"] == client
+    assert received["config"].token_budget == 500
+
+    (client / "fast-engine.json").write_text('{"token_budget": 0}')
+    with pytest.raises(ConfigError, match="client"):
+        asyncio.run(daemon._run("generate", args, str(client)))
@@ -0,0 +1,38 @@
+from fast_engine.dependencies import DependencyIndex
+from fast_engine.rendering import render_directory
+from fast_engine.writer import ProjectWriter
+
+
+def _generate(template_dir, project_dir, context):
+    previous = DependencyIndex.load(project_dir)
+    result = render_directory(template_dir, context, previous=previous)
+    ProjectWriter(project_dir, incremental=True).write_all(
+        result.files, keep=result.reused, dependencies=result.dependencies.to_dict()
+    )
+    return result
+
+
+def test_only_affected_templates_rerender(tmp_path):
+    template_dir = tmp_path / "tpl"
+    template_dir.mkdir()
+    (template_dir / "partials").mkdir()
+    (template_dir / "partials" / "header.j2").write_text("== {{ title }} ==")
+    (template_dir / "a.txt.j2").write_text("{% include 'partials/header.j2' %}\n{{ project_name }}\n")
+    (template_dir / "b.txt.j2").write_text("{{ owner }}\n")
+    project_dir = tmp_path / "out"
+    context = {"project_name": "demo", "title": "T", "owner": "me"}
+
+    first = _generate(template_dir, project_dir, context)
+    assert first.reused == []
+    assert first.dependencies.records["a.txt"].context_keys == ["project_name", "title"]
+    assert set(first.dependencies.records["a.txt"].sources) == {"a.txt.j2", "partials/header.j2"}
+
+    assert sorted(_generate(template_dir, project_dir, context).reused) == ["a.txt", "b.txt", "partials/header"]
+
+    (template_dir / "partials" / "header.j2").write_text("** {{ title }} **")
+    third = _generate(template_dir, project_dir, context)
+    assert sorted(third.files) == ["a.txt", "partials/header"]
+    assert (project_dir / "a.txt").read_text() == "** T **\ndemo\n"
+
+    fourth = _generate(template_dir, project_dir, dict(context, owner="you"))
+    assert list(fourth.files) == ["b.txt"]
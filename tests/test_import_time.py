@@ -0,0 +1,42 @@
+"""Import-time guards: ``fast-engine version`` and ``list-templates`` must start fast."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modulos pesados que no deben cargarse al importar el paquete o la CLI
+HEAVY_MODULES = ("jinja2", "rich", "yaml", "aiohttp", "asyncio", "fast_engine.core")
+
+# Costo maximo (ms) de los modulos de fast_engine por encima de typer
+IMPORT_BUDGET_MS = float(os.environ.get("FAST_ENGINE_IMPORT_BUDGET_MS", "50"))
+
+
+def _importtime(statement):
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total) / 1000.0
+    return cumulative
+
+
+def test_package_import_is_lazy():
+    modules = _importtime("import fast_engine")
+    assert not [m for m in HEAVY_MODULES + ("typer",) if m in modules]
+
+
+def test_cli_import_stays_within_budget():
+    # typer va primero para no cobrarle a fast_engine los modulos stdlib que comparten
+    modules = _importtime("import typer; import fast_engine.cli")
+    assert not [m for m in HEAVY_MODULES if m in modules]
+    own_cost = modules["fast_engine.cli"]
+    assert own_cost < IMPORT_BUDGET_MS, f"fast_engine.cli import costs {own_cost:.1f}ms"
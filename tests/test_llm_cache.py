@@ -0,0 +1,59 @@
+import asyncio
+import os
+
+from fast_engine.core import FastEngine
+from fast_engine.llm_cache import CachedProvider, ResponseCache, cache_key
+from fast_engine.providers import SimulatedProvider
+
+
+def test_cached_provider_skips_repeated_calls(tmp_path):
+    cache = ResponseCache(tmp_path)
+    inner = SimulatedProvider("openai", lambda prompt: prompt.upper(), latency=0)
+
+    async def scenario():
+        first = await CachedProvider(inner, cache, "1.0.0").complete("hola")
+        second = await CachedProvider(inner, cache, "1.0.0").complete("hola")
+        other_version = await CachedProvider(inner, cache, "2.0.0").complete("hola")
+        return first, second, other_version
+
+    assert asyncio.run(scenario()) == ("HOLA", "HOLA", "HOLA")
+    assert inner.calls == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ResponseCache(tmp_path, ttl=0)
+    cache.put("a" * 64, "old")
+    assert cache.usage() > 0
+    assert cache.get("a" * 64) is None
+    assert not list(tmp_path.rglob("*.json"))
+    # La entrada vencida ya no cuenta para el limite de tamano
+    assert cache.usage() == 0
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=10_000)
+    keys = [cache_key("p", "m", str(i)) for i in range(3)]
+    for idx, key in enumerate(keys):
+        cache.put(key, "x" * 3000)
+        path = cache._path(key)
+        os.utime(path, (idx, idx))
+    cache.get(keys[0])  # ahora es la mas reciente
+
+    cache.put(cache_key("p", "m", "new"), "x" * 3000)
+
+    assert cache.usage() <= 10_000
+    assert cache.get(keys[0]) == "x" * 3000
+    assert cache.get(keys[1]) is None
+
+
+def test_repeat_generation_hits_cache(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    engine = FastEngine(str(tmp_path / "missing.json"))
+    engine.simulated_latency = 0
+    engine.init_project_demo("demo")
+    engine.init_project_demo("demo")
+    assert "Respuestas desde cache: 3, llamadas: 0" in capsys.readouterr().out
+
+    engine.init_project_demo("demo", use_cache=False)
+    assert "[CACHE]" not in capsys.readouterr().out
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from fast_engine.orchestrator import Stage, StageOrchestrator
+
+
+def _sleeper(value, delay=0.05):
+    async def func(deps):
+        await asyncio.sleep(delay)
+        return value
+    return func
+
+
+def test_independent_stages_run_concurrently():
+    stages = [
+        Stage("architecture", _sleeper("arch")),
+        Stage("backend", _sleeper("be"), depends_on=("architecture",)),
+        Stage("frontend", _sleeper("fe"), depends_on=("architecture",)),
+    ]
+    result = StageOrchestrator(stages).run_sync()
+
+    assert result.results == {"architecture": "arch", "backend": "be", "frontend": "fe"}
+    assert result.wall_time < result.total_stage_time
+    assert result.timings["backend"].start >= result.timings["architecture"].end
+    assert result.critical_path()[0] == "architecture"
+
+
+def test_stage_receives_dependency_results_and_retries():
+    calls = []
+
+    async def flaky(deps):
+        calls.append(deps)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return deps["architecture"] + "!"
+
+    stages = [
+        Stage("architecture", _sleeper("arch", 0)),
+        Stage("backend", flaky, depends_on=("architecture",), retry_delay=0),
+    ]
+    result = StageOrchestrator(stages).run_sync()
+    assert result.results["backend"] == "arch!"
+    assert len(calls) == 2
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError):
+        StageOrchestrator([Stage("a", _sleeper(1), depends_on=("missing",))])
+    with pytest.raises(ValueError):
+        StageOrchestrator([
+            Stage("a", _sleeper(1), depends_on=("b",)),
+            Stage("b", _sleeper(2), depends_on=("a",)),
+        ])
@@ -0,0 +1,64 @@
+import io
+import tarfile
+
+from fast_engine.generator import generate_project
+from fast_engine.rendering import PARALLEL_MIN_TEMPLATES, render_jobs
+from fast_engine.sinks import ArchiveSink
+
+
+def _make_template(root, count=12):
+    root.mkdir(parents=True)
+    (root / "template.yml").write_text("name: par\nversion: 1.0.0\n")
+    for i in range(count):
+        (root / f"mod{i:02d}.py.j2").write_text("{% for n in range(" + str(i) + ") %}{{ project_name }}{{ n }}\n{% endfor %}")
+    (root / "static.txt").write_text("static\n")
+    return root
+
+
+def test_render_jobs_auto_stays_serial_for_small_templates():
+    assert render_jobs(PARALLEL_MIN_TEMPLATES - 1) == 1
+    assert render_jobs(10, jobs=4) == 4
+    assert render_jobs(2, jobs=8) == 2
+
+
+def test_parallel_render_matches_serial(tmp_path):
+    tpl = _make_template(tmp_path / "tpl")
+    context = {"project_name": "demo"}
+    serial = generate_project(tpl, tmp_path / "serial", context, jobs=1)
+    parallel = generate_project(tpl, tmp_path / "parallel", context, jobs=3)
+    assert parallel.report.ok and sorted(parallel.report.written) == sorted(serial.report.written)
+    for rel in serial.report.written:
+        assert (tmp_path / "parallel" / rel).read_bytes() == (tmp_path / "serial" / rel).read_bytes()
+    # Segunda corrida incremental: nada cambio
+    again = generate_project(tpl, tmp_path / "parallel", context, jobs=3)
+    assert again.report.written == [] and len(again.report.unchanged) == 13
+
+    # Los archivos comprimidos son identicos byte a byte
+    archives = []
+    for jobs in (1, 3):
+        out = io.BytesIO()
+        generate_project(tpl, "demo", context, sink=ArchiveSink(out, "tar", "demo", mtime=0), jobs=jobs)
+        archives.append(out.getvalue())
+    assert archives[0] == archives[1]
+    with tarfile.open(fileobj=io.BytesIO(archives[0])) as tar:
+        assert tar.getnames() == sorted(tar.getnames())
+
+
+def test_parallel_render_error_fails_only_that_file(tmp_path):
+    tpl = _make_template(tmp_path / "tpl", count=4)
+    (tpl / "broken.txt.j2").write_text("{{ missing.attr }}")
+    report = generate_project(tpl, tmp_path / "out", {"project_name": "demo"}, jobs=2).report
+    assert list(report.failed) == ["broken.txt"]
+    assert "UndefinedError" in report.failed["broken.txt"]
+    assert (tmp_path / "out" / "mod03.py").read_text() == "demo0\ndemo1\ndemo2\n"
+
+
+def test_parallel_render_defers_templates_to_workers(tmp_path):
+    from fast_engine.rendering import render_directory
+    from fast_engine.writer import PendingContent
+
+    tpl = _make_template(tmp_path / "tpl", count=4)
+    result = render_directory(tpl, {"project_name": "demo"}, jobs=2)
+    assert list(result.files) == ["mod00.py", "mod01.py", "mod02.py", "mod03.py", "static.txt"]
+    assert all(isinstance(result.files[f"mod{i:02d}.py"], PendingContent) for i in range(4))
+    assert result.files["mod02.py"].result() == "demo0\ndemo1\n"
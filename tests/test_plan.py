@@ -0,0 +1,73 @@
+import importlib
+import os
+
+import pytest
+
+from fast_engine.plan import check_writable, plan_write
+from fast_engine.rendering import output_sources
+from fast_engine.writer import ProjectWriter
+
+
+def test_plan_lists_each_missing_directory_once(tmp_path):
+    (tmp_path / "out" / "a").mkdir(parents=True)
+    (tmp_path / "out" / "a" / "old.txt").write_text("old")
+    plan = plan_write(tmp_path / "out", ["a/old.txt", "a/b/c/x.txt", "a/b/y.txt", "top.txt"])
+
+    assert plan.ok
+    assert plan.missing == [tmp_path / "out" / "a" / "b", tmp_path / "out" / "a" / "b" / "c"]
+    assert plan.existing == ["a/old.txt"]
+    assert plan.new_files == ["a/b/c/x.txt", "a/b/y.txt", "top.txt"]
+    assert plan.create_directories() == 2
+    assert (tmp_path / "out" / "a" / "b" / "c").is_dir()
+
+
+def test_plan_creates_missing_root_and_ancestors(tmp_path):
+    plan = plan_write(tmp_path / "home" / "svc", ["src/main.py"])
+    assert plan.missing == [tmp_path / "home", tmp_path / "home" / "svc", tmp_path / "home" / "svc" / "src"]
+
+
+def test_plan_reports_conflicts_before_writing(tmp_path):
+    (tmp_path / "docs").write_text("a file")
+    (tmp_path / "build").mkdir()
+    sources = output_sources(["app.py", "app.py.j2", "dot-env", "template.yml", "build.j2", "docs/index.md"])
+    plan = plan_write(tmp_path, sources, sources)
+
+    assert "app.py.j2" in plan.issues["app.py"] and ".env" not in plan.issues
+    assert plan.issues["docs"] == "existe un archivo donde va un directorio"
+    assert plan.issues["build"] == "existe un directorio con ese nombre"
+    assert "template.yml" not in plan.files
+    assert plan_write(tmp_path, ["../escape.txt"]).issues == {"../escape.txt": "ruta fuera del proyecto"}
+
+    report = ProjectWriter(tmp_path).write_all({"ok.txt": "x", "docs/index.md": "y"})
+    assert list(report.failed) == ["docs"] and not (tmp_path / "ok.txt").exists()
+
+
+@pytest.mark.skipif(os.name != "posix" or os.geteuid() == 0, reason="root ignora los permisos")
+def test_plan_checks_permissions(tmp_path):
+    locked = tmp_path / "locked"
+    locked.mkdir()
+    locked.chmod(0o500)
+    try:
+        assert plan_write(locked / "svc", ["a.txt"]).issues == {".": f"sin permiso de escritura en {locked}"}
+        assert check_writable(locked / "svc") is not None
+        assert check_writable(tmp_path / "new" / "dir") is None
+    finally:
+        locked.chmod(0o700)
+
+
+def test_cli_dry_run_writes_nothing(cli_runner, tmp_path, monkeypatch, capsys):
+    import fast_engine.cli as cli
+    importlib.reload(cli)
+    monkeypatch.setattr(cli, "FAST_ENGINE_HOME", tmp_path / "home")
+
+    cli.init(name="svc", template="saas-basic", dry_run=True)
+    out = capsys.readouterr().out
+    assert "+ backend/app.py" in out and "0 problemas" in out
+    assert not (tmp_path / "home" / "svc").exists()
+
+    (tmp_path / "home" / "svc").mkdir(parents=True)
+    (tmp_path / "home" / "svc" / "backend").write_text("blocker")
+    with pytest.raises(cli.typer.Exit):
+        cli.init(name="svc", template="saas-basic")
+    assert "backend: existe un archivo donde va un directorio" in capsys.readouterr().out
+    assert os.listdir(tmp_path / "home" / "svc") == ["backend"]
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from fast_engine.config import Config
+from fast_engine.mock_server import MockLLMServer
+from fast_engine.providers import (
+    ClaudeProvider,
+    OpenAIProvider,
+    ProviderError,
+    ProviderPool,
+    ProviderSettings,
+    SimulatedProvider,
+)
+
+
+def _settings(server, **kwargs):
+    kwargs.setdefault("retry_delay", 0)
+    return ProviderSettings(base_url=server.url, model="mock", api_key="test", **kwargs)
+
+
+def test_concurrent_calls_reuse_pooled_connections():
+    async def scenario():
+        async with MockLLMServer(latency=0.01) as server:
+            provider = OpenAIProvider(_settings(server, max_concurrency=4))
+            try:
+                replies = await asyncio.gather(*(provider.complete(f"p{i}") for i in range(20)))
+            finally:
+                await provider.close()
+            return server, replies
+
+    server, replies = asyncio.run(scenario())
+    assert replies == [f"echo: p{i}" for i in range(20)]
+    assert server.requests == 20
+    assert server.connections <= 4
+
+
+def test_claude_provider_retries_server_errors():
+    async def scenario():
+        async with MockLLMServer(fail_first=2) as server:
+            provider = ClaudeProvider(_settings(server))
+            try:
+                return server, await provider.complete("hola")
+            finally:
+                await provider.close()
+
+    server, reply = asyncio.run(scenario())
+    assert reply == "echo: hola"
+    assert server.requests == 3
+
+
+def test_client_errors_are_not_retried():
+    async def scenario():
+        async with MockLLMServer(fail_first=5, fail_status=401) as server:
+            provider = OpenAIProvider(_settings(server))
+            try:
+                with pytest.raises(ProviderError) as excinfo:
+                    await provider.complete("hola")
+            finally:
+                await provider.close()
+            return server, excinfo.value
+
+    server, error = asyncio.run(scenario())
+    assert error.status == 401
+    assert server.requests == 1
+
+
+def test_pool_uses_simulated_providers_without_api_keys():
+    pool = ProviderPool.from_config(Config(templates_path=".", claude_api_key="key"), simulated_latency=0)
+
+    assert isinstance(pool.get("claude"), ClaudeProvider)
+    assert isinstance(pool.get("openai"), SimulatedProvider)
+    assert asyncio.run(pool.get("deepseek").complete("x")).startswith("=== FILE:")
+    with pytest.raises(ProviderError):
+        pool.get("unknown")
@@ -0,0 +1,84 @@
+import os
+import threading
+
+
+from fast_engine import registry as registry_mod
+from fast_engine.registry import TemplateRegistry
+
+
+def _make_templates(base):
+    tpl = base / "svc"
+    (tpl / "src").mkdir(parents=True)
+    (tpl / "template.yml").write_text("name: svc\ndescription: A service\nversion: 2.1.0\n")
+    (tpl / "src" / "main.py.j2").write_text("print('{{ project_name }}')\n")
+    (base / "not-a-template").mkdir()
+    return tpl
+
+
+def test_registry_indexes_metadata_and_files(tmp_path):
+    _make_templates(tmp_path / "templates")
+    reg = TemplateRegistry(tmp_path / "templates", tmp_path / "cache")
+
+    assert reg.names() == ["svc"]
+    entry = reg.get("svc")
+    assert entry.version == "2.1.0" and entry.description == "A service"
+    assert set(entry.files) == {"template.yml", "src/main.py.j2"}
+    assert reg.index_path.exists()
+
+
+def test_index_is_reused_and_revalidated(tmp_path, monkeypatch):
+    tpl = _make_templates(tmp_path / "templates")
+    TemplateRegistry(tmp_path / "templates", tmp_path / "cache").names()
+
+    def fail(path):
+        raise AssertionError("template.yml should not be parsed again")
+
+    monkeypatch.setattr(registry_mod, "read_metadata", fail)
+    fresh = TemplateRegistry(tmp_path / "templates", tmp_path / "cache")
+    assert fresh.get("svc").version == "2.1.0"
+
+    monkeypatch.undo()
+    (tpl / "src" / "extra.txt").write_text("new")
+    assert "src/extra.txt" in fresh.get("svc").files
+
+    other = tmp_path / "templates" / "not-a-template"
+    (other / "template.yml").write_text("name: other\ndescription: Other\n")
+    assert fresh.names() == ["not-a-template", "svc"]
+
+
+def test_in_place_edit_is_rehashed(tmp_path):
+    tpl = _make_templates(tmp_path / "templates")
+    reg = TemplateRegistry(tmp_path / "templates", tmp_path / "cache")
+    before = reg.get("svc").files["src/main.py.j2"]
+
+    # Reescribir el archivo no cambia el mtime del directorio
+    src_mtime = (tpl / "src").stat().st_mtime_ns
+    (tpl / "src" / "main.py.j2").write_text("print('edited {{ project_name }}')\n")
+    os.utime(tpl / "src", ns=(src_mtime, src_mtime))
+
+    assert reg.get("svc").files["src/main.py.j2"] != before
+    fresh = TemplateRegistry(tmp_path / "templates", tmp_path / "cache")
+    assert fresh.get("svc").files == reg.get("svc").files
+
+
+def test_index_tmp_file_is_per_thread(tmp_path, monkeypatch):
+    _make_templates(tmp_path / "templates")
+    reg = TemplateRegistry(tmp_path / "templates", tmp_path / "cache")
+    reg.names()
+    tmp_names = []
+    replace = os.replace
+    # Los dos hilos estan vivos a la vez (un ident no se reusa entre ellos)
+    both_saving = threading.Barrier(2, timeout=5)
+
+    def record(src, dst):
+        tmp_names.append(str(src))
+        both_saving.wait()
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", record)
+    threads = [threading.Thread(target=reg._save_index) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(tmp_names)) == 2
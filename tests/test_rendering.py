@@ -0,0 +1,60 @@
+import os
+
+from fast_engine.rendering import clear_environment_cache, compile_directory, get_environment
+
+
+def _make_template(tmp_path):
+    template_dir = tmp_path / "tpl"
+    template_dir.mkdir()
+    (template_dir / "hello.txt.j2").write_text("Hello {{ project_name }}\n")
+    return template_dir
+
+
+def test_environment_is_reused_per_directory(tmp_path):
+    clear_environment_cache()
+    template_dir = _make_template(tmp_path)
+    env = get_environment(template_dir)
+    assert get_environment(template_dir) is env
+    assert env.get_template("hello.txt.j2") is env.get_template("hello.txt.j2")
+
+
+def test_bytecode_is_persisted(tmp_path):
+    clear_environment_cache()
+    template_dir = _make_template(tmp_path)
+    cache_dir = tmp_path / "cache"
+    env = get_environment(template_dir, cache_dir)
+    assert env.get_template("hello.txt.j2").render(project_name="x") == "Hello x\n"
+    assert list(cache_dir.iterdir())
+
+    # Un proceso nuevo (simulado vaciando el LRU) carga desde el bytecode en disco
+    clear_environment_cache()
+    env = get_environment(template_dir, cache_dir)
+    assert env.get_template("hello.txt.j2").render(project_name="y") == "Hello y\n"
+
+
+def test_streaming_render_writes_large_outputs(tmp_path):
+    from fast_engine.generator import generate_project
+
+    template_dir = tmp_path / "tpl"
+    template_dir.mkdir()
+    (template_dir / "seed.sql.j2").write_text(
+        "{% for i in range(rows) %}INSERT INTO t VALUES ({{ i }});\n{% endfor %}"
+    )
+    result = generate_project(template_dir, tmp_path / "out", {"rows": 5000})
+    assert result.report.ok
+    lines = (tmp_path / "out" / "seed.sql").read_text().splitlines()
+    assert len(lines) == 5000 and lines[-1] == "INSERT INTO t VALUES (4999);"
+
+
+def test_compiled_templates_notice_in_place_edits(tmp_path):
+    clear_environment_cache()
+    template_dir = _make_template(tmp_path)
+    files = {"hello.txt.j2": "stale-digest"}
+    assert compile_directory(template_dir, files)["hello.txt.j2"].render(project_name="x") == "Hello x\n"
+
+    # Mismo mapping (hash viejo del registro), source editado en el lugar
+    source = template_dir / "hello.txt.j2"
+    source.write_text("Bye {{ project_name }}\n")
+    mtime = source.stat().st_mtime_ns + 1_000_000_000
+    os.utime(source, ns=(mtime, mtime))
+    assert compile_directory(template_dir, files)["hello.txt.j2"].render(project_name="x") == "Bye x\n"
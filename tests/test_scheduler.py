@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import pytest
+
+from fast_engine.providers import SimulatedProvider
+from fast_engine.scheduler import (
+    BudgetExceeded,
+    ProviderLimits,
+    RequestScheduler,
+    ScheduledProvider,
+    TokenBucket,
+    TokenBudget,
+)
+
+
+def test_token_bucket_paces_requests():
+    bucket = TokenBucket(rate=20, capacity=2)
+
+    async def scenario():
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # 2 de rafaga y 2 mas a 20/s: ~0.1s
+    assert 0.08 <= asyncio.run(scenario()) < 0.5
+
+
+def test_concurrency_cap_queues_requests_and_reports_stats():
+    scheduler = RequestScheduler({"openai": ProviderLimits(max_concurrency=2)})
+    inner = SimulatedProvider("openai", lambda prompt: "ok", latency=0.05)
+    provider = ScheduledProvider(inner, scheduler)
+
+    async def scenario():
+        return await asyncio.gather(*(provider.complete(f"prompt {i}") for i in range(6)))
+
+    start = time.monotonic()
+    assert asyncio.run(scenario()) == ["ok"] * 6
+    elapsed = time.monotonic() - start
+
+    stats = scheduler.stats["openai"]
+    assert elapsed >= 0.14  # 3 tandas de 2
+    assert stats.requests == 6
+    assert stats.max_queue_depth == 4  # 2 entran directo, 4 esperan
+    assert stats.queued == 0
+    assert stats.max_wait >= 0.09
+    assert stats.tokens > 0
+
+
+def test_budget_stops_new_requests():
+    scheduler = RequestScheduler()
+    budget = TokenBudget(limit=10)
+    provider = ScheduledProvider(SimulatedProvider("claude", lambda p: "x" * 20, latency=0), scheduler, budget)
+
+    assert asyncio.run(provider.complete("hola")) == "x" * 20
+    assert budget.used == 1 + 5
+    with pytest.raises(BudgetExceeded):
+        asyncio.run(provider.complete("y" * 40))
@@ -0,0 +1,111 @@
+import importlib
+import io
+import sys
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import fast_engine
+from fast_engine.assets import StaticBlob, StaticFile
+from fast_engine.generator import generate_project
+from fast_engine.sinks import ArchiveSink, MemorySink, archive_format
+from fast_engine.templates import build_context
+
+SAAS_BASIC = Path(fast_engine.__file__).parent / "templates" / "saas-basic"
+
+
+class Unseekable(io.RawIOBase):
+    """Stream de solo escritura, como un pipe o stdout"""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.data += b
+        return len(b)
+
+
+def sample_files(tmp_path):
+    static = tmp_path / "logo.bin"
+    static.write_bytes(b"\x00\x01binary")
+    return [
+        ("README.md", "# hola\n"),
+        ("bin/data.bin", b"\xff\xfe"),
+        ("app/main.py", (chunk for chunk in ("print(", "'stream'", ")\n"))),
+        ("static/logo.bin", StaticFile(static)),
+        ("static/blob.txt", StaticBlob(memoryview(b"from bundle"), "x")),
+    ]
+
+
+def expected():
+    return {
+        "demo/README.md": b"# hola\n",
+        "demo/bin/data.bin": b"\xff\xfe",
+        "demo/app/main.py": b"print('stream')\n",
+        "demo/static/logo.bin": b"\x00\x01binary",
+        "demo/static/blob.txt": b"from bundle",
+    }
+
+
+@pytest.mark.parametrize("fmt", ["tar", "tar.gz"])
+def test_tar_sink_streams_to_unseekable_output(tmp_path, fmt):
+    out = Unseekable()
+    report = ArchiveSink(out, fmt, prefix="demo").write_all(sample_files(tmp_path))
+    assert report.ok and len(report.written) == 5
+
+    with tarfile.open(fileobj=io.BytesIO(bytes(out.data)), mode="r:*") as tar:
+        assert {m.name: tar.extractfile(m).read() for m in tar.getmembers()} == expected()
+
+
+def test_zip_sink_streams_to_unseekable_output(tmp_path):
+    out = Unseekable()
+    assert ArchiveSink(out, "zip", prefix="demo").write_all(sample_files(tmp_path)).ok
+
+    with zipfile.ZipFile(io.BytesIO(bytes(out.data))) as zf:
+        assert {name: zf.read(name) for name in zf.namelist()} == expected()
+
+
+def test_memory_sink_rejects_paths_outside_project(tmp_path):
+    sink = MemorySink(prefix="demo")
+    report = sink.write_all(sample_files(tmp_path) + [("../evil", "x")])
+    assert sink.files == expected()
+    assert list(report.failed) == ["../evil"]
+
+
+def test_archive_format_from_suffix():
+    assert [archive_format(p) for p in ("a.tgz", "a.TAR.GZ", "a.tar", "a.zip", "a")] == [
+        "tar.gz", "tar.gz", "tar", "zip", None
+    ]
+
+
+def test_generate_project_to_sink_writes_nothing_to_disk(tmp_path):
+    sink = MemorySink(prefix="svc")
+    result = generate_project(SAAS_BASIC, tmp_path / "svc", build_context("svc"), sink=sink)
+    assert result.report.ok
+    assert sink.files["svc/backend/app.py"].startswith(b'print("svc backend")')
+    assert not (tmp_path / "svc").exists()
+
+
+def test_cli_init_to_archive(cli_runner, tmp_path, monkeypatch):
+    import fast_engine.cli as cli
+    importlib.reload(cli)
+    monkeypatch.setattr(cli, "FAST_ENGINE_HOME", tmp_path / "home")
+
+    archive = tmp_path / "out" / "svc.zip"
+    cli.init(name="svc", template="saas-basic", output=str(archive))
+    with zipfile.ZipFile(archive) as zf:
+        assert "svc/backend/app.py" in zf.namelist()
+    assert not (tmp_path / "home" / "svc").exists()
+
+    # Con "-" el archivo sale por stdout y los mensajes por stderr
+    stdout = io.TextIOWrapper(io.BytesIO())
+    monkeypatch.setattr(sys, "stdout", stdout)
+    cli.init(name="svc", template="saas-basic", output="-")
+    stdout.flush()
+    with tarfile.open(fileobj=io.BytesIO(stdout.buffer.getvalue()), mode="r:gz") as tar:
+        assert "svc/backend/app.py" in tar.getnames()
@@ -0,0 +1,106 @@
+import asyncio
+import json
+
+import pytest
+
+from fast_engine.core import FastEngine
+from fast_engine.mock_server import MockLLMServer
+from fast_engine.providers import (
+    DEMO_ARCHITECTURE, ClaudeProvider, OpenAIProvider, ProviderPool, ProviderSettings, SimulatedProvider,
+)
+from fast_engine.streaming import FileChannel, FileStreamParser, stream_files, write_channel
+from fast_engine.writer import ProjectWriter
+
+RESPONSE = """Aqui estan los archivos:
+=== FILE: app/main.py ===
+print("hola")
+=== END FILE ===
+=== FILE: ../etc/passwd ===
+nope
+=== END FILE ===
+=== FILE: README.md ===
+# demo
+"""
+
+
+def test_parser_handles_arbitrary_chunk_boundaries():
+    for size in (1, 3, 7, len(RESPONSE)):
+        parser = FileStreamParser(prefix="backend/")
+        files = []
+        for i in range(0, len(RESPONSE), size):
+            files.extend(parser.feed(RESPONSE[i:i + size]))
+        assert files == [("backend/app/main.py", 'print("hola")\n')]
+        # El ultimo archivo no tiene cierre: se entrega al terminar el stream
+        assert parser.close() == [("backend/README.md", "# demo\n")]
+
+
+def test_http_providers_stream_server_sent_events():
+    async def scenario():
+        async with MockLLMServer(reply=lambda prompt: RESPONSE, chunk_size=5) as server:
+            results = []
+            for cls in (OpenAIProvider, ClaudeProvider):
+                provider = cls(ProviderSettings(base_url=server.url, model="mock", api_key="k", retry_delay=0))
+                try:
+                    chunks = [chunk async for chunk in provider.stream("x")]
+                finally:
+                    await provider.close()
+                results.append(chunks)
+            return results
+
+    for chunks in asyncio.run(scenario()):
+        assert len(chunks) > 1
+        assert "".join(chunks) == RESPONSE
+
+
+def test_files_reach_disk_before_stream_ends(tmp_path):
+    provider = SimulatedProvider("openai", lambda prompt: RESPONSE, latency=0.5, chunk_size=4)
+    seen_early = []
+
+    async def scenario():
+        channel = FileChannel()
+        writing = asyncio.ensure_future(write_channel(ProjectWriter(tmp_path, jobs=1), channel))
+        async for rel_path, content in stream_files(provider.stream("x")):
+            channel.put(rel_path, content)
+            await asyncio.sleep(0.05)
+            seen_early.append((tmp_path / rel_path).exists())
+        channel.close()
+        return await writing
+
+    report = asyncio.run(scenario())
+    assert sorted(report.written) == ["README.md", "app/main.py"]
+    assert seen_early[0] is True
+
+
+def test_generated_files_do_not_overwrite_reserved_paths():
+    channel = FileChannel()
+    channel.reserve(["backend/app.py"])
+    assert channel.put_generated("backend/app.py", "llm") == "generated/backend/app.py"
+    assert channel.put_generated("backend/models.py", "a") == "backend/models.py"
+    assert channel.put_generated("backend/models.py", "b") == "generated/backend/models.py"
+    channel.put("backend/app.py", "template")
+    with pytest.raises(ValueError):
+        channel.put("backend/app.py", "again")
+    channel.close()
+    assert list(channel) == [
+        ("generated/backend/app.py", "llm"),
+        ("backend/models.py", "a"),
+        ("generated/backend/models.py", "b"),
+        ("backend/app.py", "template"),
+    ]
+
+
+def test_llm_file_colliding_with_template_output_is_namespaced(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = FastEngine()
+    backend = "=== FILE: app.py ===\n# del LLM\n=== END FILE ===\n"
+    engine._providers = ProviderPool({
+        "claude": SimulatedProvider("claude", lambda prompt: json.dumps(DEMO_ARCHITECTURE), latency=0),
+        # Backend y render terminan en cualquier orden: el template gana igual
+        "openai": SimulatedProvider("openai", lambda prompt: backend, latency=0),
+        "deepseek": SimulatedProvider("deepseek", lambda prompt: "", latency=0),
+    })
+
+    asyncio.run(engine.generate("svc", "saas-basic", use_cache=False, output_dir=tmp_path))
+    project = tmp_path / "svc"
+    assert "# del LLM" not in (project / "backend" / "app.py").read_text()
+    assert (project / "generated" / "backend" / "app.py").read_text() == "# del LLM\n"
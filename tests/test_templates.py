@@ -1,5 +1,4 @@
-from pathlib import Path
-from fast_engine.templates import TemplateEngine
+from fast_engine.templates import TemplateEngine, build_context
 
 def test_list_templates(tmp_path):
     base = tmp_path / "templates"
@@ -19,3 +18,29 @@ def test_list_templates(tmp_path):
     engine = TemplateEngine(str(base))
     names = engine.list_templates()
     assert set(names) == {"t1", "t2"}
+
+
+def test_iter_render_project_yields_files_lazily():
+    from fast_engine import TEMPLATES_PATH
+
+    engine = TemplateEngine(TEMPLATES_PATH)
+    files = engine.iter_render_project("saas-basic", {"app_name": "demo", "project_name": "demo"})
+    first_path, _ = next(files)
+    rest = dict(files)
+    assert set(rest) | {first_path} == set(engine.render_project("saas-basic", build_context("demo")))
+    # Los .j2 llegan como chunks, no como el archivo entero
+    readme = rest["README.md"]
+    assert not isinstance(readme, str)
+    assert "".join(readme).startswith("# demo")
+    assert ".gitignore" in rest and "template.yml" not in rest
+
+
+def test_saas_basic_renders_from_j2_files():
+    from fast_engine import TEMPLATES_PATH
+
+    engine = TemplateEngine(TEMPLATES_PATH)
+    files = engine.render_project("saas-basic", build_context("My-App", "Demo app"))
+    assert 'title="My-App"' in files["main.py"]
+    assert 'description="Demo app"' in files["main.py"]
+    assert "my_app_db" in files[".env.example"]
+    assert files["backend/app.py"] == 'print("My-App backend")\n'
@@ -0,0 +1,70 @@
+import asyncio
+import importlib
+import json
+import pstats
+
+from fast_engine import tracing
+from fast_engine.tracing import profile_session, span, tracing as tracing_session
+
+
+def test_span_is_noop_without_tracer():
+    assert tracing.active_tracer() is None
+    assert span("render") is span("write", files=3)
+
+
+def test_nested_spans_are_summarized_by_depth():
+    with tracing_session() as tracer:
+        with span("render"):
+            with span("render.compile"):
+                pass
+            with span("render.compile"):
+                pass
+        with span("write", files=2):
+            pass
+    assert tracing.active_tracer() is None
+    phases = [(p["name"], p["depth"], p["count"]) for p in tracer.summary()]
+    assert phases == [("render", 0, 1), ("render.compile", 1, 2), ("write", 0, 1)]
+    assert "render.compile" in tracer.format_summary()
+
+
+def test_chrome_trace_separates_async_tasks():
+    async def stage(name):
+        with span(name):
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(stage("backend"), stage("frontend"))
+
+    with tracing_session() as tracer:
+        asyncio.run(main())
+    events = tracer.to_chrome_trace()["traceEvents"]
+    assert {e["name"] for e in events} == {"backend", "frontend"}
+    assert all(e["ph"] == "X" and e["dur"] > 0 for e in events)
+    assert len({e["tid"] for e in events}) == 2
+
+
+def test_profile_session_writes_chrome_trace_and_cprofile(tmp_path):
+    lines = []
+    trace = tmp_path / "trace.json"
+    with profile_session(True, trace, echo=lines.append):
+        with span("write"):
+            pass
+    assert json.loads(trace.read_text())["traceEvents"][0]["name"] == "write"
+    assert lines[0].startswith("Fase")
+
+    stats = tmp_path / "profile.prof"
+    with profile_session(True, stats, echo=lines.append):
+        sum(range(1000))
+    assert pstats.Stats(str(stats)).total_calls > 0
+
+
+def test_cli_init_profile_prints_phases(cli_runner, tmp_path, monkeypatch, capsys):
+    import fast_engine.cli as cli
+    importlib.reload(cli)
+    monkeypatch.setattr(cli, "FAST_ENGINE_HOME", tmp_path)
+    cli.init(name="svc", template="saas-basic", profile=True, profile_output=tmp_path / "trace.json")
+    output = capsys.readouterr().out
+    for phase in ("template.load", "context.build", "render", "write.files"):
+        assert phase in output
+    names = {e["name"] for e in json.loads((tmp_path / "trace.json").read_text())["traceEvents"]}
+    assert {"render.compile", "write"} <= names
@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+
+import pytest
+
+from fast_engine.watch import InotifyWatcher, LiveProject, PollingWatcher, create_watcher, watch
+
+
+def _make_template(root):
+    (root / "pages").mkdir(parents=True)
+    (root / "template.yml").write_text("name: live\nversion: 1.0.0\n")
+    (root / "base.j2").write_text("<{{ project_name }}>{% block body %}{% endblock %}\n")
+    (root / "pages" / "home.html.j2").write_text('{% extends "base.j2" %}{% block body %}home{% endblock %}')
+    (root / "pages" / "about.html.j2").write_text("about {{ project_name }}\n")
+    (root / "logo.txt").write_text("logo v1\n")
+    return root
+
+
+def _touch(path, text):
+    path.write_text(text)
+    # Garantizar un mtime distinto aunque el filesystem tenga poca resolucion
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_update_rerenders_only_affected_outputs(tmp_path):
+    tpl = _make_template(tmp_path / "tpl")
+    # Temporales de un editor abierto: el watcher los ignora y el build tambien
+    for name in ("pages/.home.html.j2.swp", "logo.txt~", ".#base.j2"):
+        (tpl / name).write_text("{% if %}")
+    live = LiveProject(tpl, tmp_path / "out", {"project_name": "demo"})
+    assert len(live.build().written) == 4
+    assert sorted(p.name for p in (tmp_path / "out").rglob("*") if p.is_file() and "manifest" not in p.name) == [
+        "about.html", "base", "home.html", "logo.txt",
+    ]
+
+    _touch(tpl / "base.j2", "[{{ project_name }}]{% block body %}{% endblock %}\n")
+    report = live.update({"base.j2"})
+    assert sorted(report.written) == ["base", "pages/home.html"]
+    assert (tmp_path / "out" / "pages" / "home.html").read_text() == "[demo]home\n"
+
+    _touch(tpl / "logo.txt", "logo v2\n")
+    (tpl / "pages" / "new.txt.j2").write_text("new\n")
+    (tpl / "pages" / "about.html.j2").unlink()
+    report = live.update({"logo.txt", "pages/new.txt.j2", "pages/about.html.j2"})
+    assert sorted(report.written) == ["logo.txt", "pages/new.txt"]
+    assert report.deleted == ["pages/about.html"]
+    assert not (tmp_path / "out" / "pages" / "about.html").exists()
+
+    # Un template roto no corta el watch ni pisa la salida anterior
+    _touch(tpl / "pages" / "new.txt.j2", "{% if %}")
+    report = live.update({"pages/new.txt.j2"})
+    assert list(report.failed) == ["pages/new.txt"]
+    assert (tmp_path / "out" / "pages" / "new.txt").read_text() == "new\n"
+
+
+@pytest.mark.parametrize("polling", [True, False])
+def test_watchers_report_changed_files(tmp_path, polling):
+    tpl = _make_template(tmp_path / "tpl")
+    if polling:
+        watcher = PollingWatcher(tpl, poll_interval=0.01)
+    else:
+        try:
+            watcher = InotifyWatcher(tpl)
+        except OSError:
+            pytest.skip("inotify no disponible")
+    try:
+        assert watcher.wait(timeout=0.05) == set()
+        _touch(tpl / "pages" / "about.html.j2", "changed\n")
+        (tpl / "pages" / ".#about.html.j2").write_text("editor lock")
+        (tpl / "partials").mkdir()
+        (tpl / "partials" / "nav.j2").write_text("nav")
+        changed = set()
+        for _ in range(20):
+            changed |= watcher.wait(timeout=0.2) or set()
+            if {"pages/about.html.j2", "partials/nav.j2"} <= changed:
+                break
+        assert changed == {"pages/about.html.j2", "partials/nav.j2"}
+    finally:
+        watcher.close()
+
+
+def test_watch_loop_applies_edits(tmp_path):
+    tpl = _make_template(tmp_path / "tpl")
+    live = LiveProject(tpl, tmp_path / "out", {"project_name": "demo"})
+    live.build()
+    updates = []
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=watch, args=(live, lambda report, elapsed: updates.append(report)), kwargs={"should_stop": stop.is_set}
+    )
+    thread.start()
+    try:
+        time.sleep(0.1)
+        _touch(tpl / "pages" / "about.html.j2", "about v2 {{ project_name }}\n")
+        for _ in range(100):
+            if updates:
+                break
+            time.sleep(0.02)
+    finally:
+        stop.set()
+        thread.join()
+    assert updates and updates[0].written == ["pages/about.html"]
+    assert (tmp_path / "out" / "pages" / "about.html").read_text() == "about v2 demo\n"
+    assert isinstance(create_watcher(tpl, polling=True), PollingWatcher)
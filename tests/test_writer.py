@@ -0,0 +1,79 @@
+from fast_engine.writer import ProjectWriter
+
+
+def test_write_all_creates_tree_in_parallel(tmp_path):
+    files = {f"pkg{i % 5}/sub/file{i}.txt": f"content {i}" for i in range(50)}
+    files["bin.dat"] = b"\x00\x01"
+    calls = []
+
+    report = ProjectWriter(tmp_path / "out", jobs=4, progress=lambda d, t: calls.append((d, t))).write_all(files)
+
+    assert report.ok and report.total == 51
+    assert (tmp_path / "out" / "pkg3" / "sub" / "file8.txt").read_text() == "content 8"
+    assert (tmp_path / "out" / "bin.dat").read_bytes() == b"\x00\x01"
+    assert calls[-1] == (51, 51)
+    assert len(calls) <= 11
+
+
+def test_atomic_write_leaves_no_temporaries(tmp_path):
+    writer = ProjectWriter(tmp_path, atomic=True)
+    (tmp_path / "a.txt").write_text("old")
+    report = writer.write_all({"a.txt": "new", "b/c.txt": "c"})
+    assert report.ok
+    assert (tmp_path / "a.txt").read_text() == "new"
+    assert sorted(p.name for p in tmp_path.rglob("*")) == ["a.txt", "b", "c.txt"]
+
+
+def test_failures_are_reported(tmp_path):
+    (tmp_path / "blocker").write_text("i am a file")
+    writer = ProjectWriter(tmp_path, jobs=1)
+    # En streaming no hay plan previo: el conflicto aparece al escribir
+    report = writer.write_all(iter([("ok.txt", "x"), ("blocker/child.txt", "y")]))
+    assert report.written == ["ok.txt"]
+    assert "blocker/child.txt" in report.failed
+
+    # Con un mapping el plan lo detecta antes y no se escribe nada
+    report = ProjectWriter(tmp_path / "fresh", jobs=1).write_all({"ok.txt": "x", "ok.txt/child.txt": "y"})
+    assert report.written == [] and list(report.failed) == ["ok.txt"]
+    assert not (tmp_path / "fresh").exists()
+
+
+def test_incremental_write_skips_unchanged_files(tmp_path):
+    first = ProjectWriter(tmp_path, incremental=True).write_all({"a.txt": "a", "b.txt": "b", "c.txt": "c"})
+    assert sorted(first.added) == ["a.txt", "b.txt", "c.txt"]
+    mtime = (tmp_path / "a.txt").stat().st_mtime_ns
+
+    second = ProjectWriter(tmp_path, incremental=True, prune=True).write_all({"a.txt": "a", "b.txt": "B"})
+    assert second.unchanged == ["a.txt"]
+    assert second.changed == ["b.txt"]
+    assert second.deleted == ["c.txt"]
+    assert not (tmp_path / "c.txt").exists()
+    assert (tmp_path / "a.txt").stat().st_mtime_ns == mtime
+
+    third = ProjectWriter(tmp_path, incremental=True).write_all({"a.txt": "a", "b.txt": "B"})
+    assert third.written == [] and sorted(third.unchanged) == ["a.txt", "b.txt"]
+
+
+def test_streamed_content_is_written_chunk_by_chunk(tmp_path):
+    consumed = []
+
+    def chunks():
+        for i in range(3):
+            consumed.append(i)
+            yield f"chunk {i}\n"
+
+    def files():
+        yield "big.txt", chunks()
+        yield "nested/small.txt", "small"
+
+    writer = ProjectWriter(tmp_path, jobs=2, incremental=True)
+    report = writer.write_all(files())
+    assert sorted(report.added) == ["big.txt", "nested/small.txt"]
+    assert (tmp_path / "big.txt").read_text() == "chunk 0\nchunk 1\nchunk 2\n"
+    assert consumed == [0, 1, 2]
+
+    mtime = (tmp_path / "big.txt").stat().st_mtime_ns
+    again = ProjectWriter(tmp_path, incremental=True).write_all(files())
+    assert sorted(again.unchanged) == ["big.txt", "nested/small.txt"]
+    assert (tmp_path / "big.txt").stat().st_mtime_ns == mtime
+    assert not list(tmp_path.glob(".*.tmp"))